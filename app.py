@@ -1,20 +1,176 @@
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from deliverables_dashboard.services.video_schedule import fetch_video_schedule
-from deliverables_dashboard.services.manifest import fetch_manifest_text
-from deliverables_dashboard.supabase_client import supabase
-import markdown
+from flask import Flask, render_template, request, jsonify, redirect, url_for, make_response, stream_template, g
+from deliverables_dashboard.services.video_schedule import (
+    fetch_video_schedule_page, fetch_video_schedule, retry_failed_videos, retry_video, DEFAULT_PAGE_SIZE
+)
+from deliverables_dashboard.services.supabase_service import (
+    fetch_user_files, get_signed_urls, approve_file, reject_file
+)
+from deliverables_dashboard.services.manifest import (
+    fetch_manifest_text, stream_manifest_text, render_manifest_html, prefetch_manifests, DEFAULT_MAX_BYTES
+)
+from deliverables_dashboard.services.page_cache import TranscriptPageCache, FragmentCache
+from deliverables_dashboard.services.publishing_summary import publishing_summary
+from deliverables_dashboard.services.live_status import live_status, TooManyWatchersError
+from deliverables_dashboard.services.export import (
+    EXPORT_FORMATS, FILE_EXPORT_COLUMNS, SCHEDULE_EXPORT_COLUMNS, export_chunks,
+    iter_schedule_export_pages, iter_user_file_export_pages
+)
+from deliverables_dashboard.utils import timing
+from deliverables_dashboard.utils.metrics import REGISTRY, HTTP_REQUESTS, HTTP_LATENCY
+from deliverables_dashboard.utils.resilience import supabase_calls
+from markupsafe import Markup
+from werkzeug.utils import secure_filename
+import asyncio
+import itertools
+import json
 import os
+import time
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Debug: Print environment variables
-print("SUPABASE_URL:", os.getenv("SUPABASE_URL"))
-print("SUPABASE_ANON_KEY:", os.getenv("SUPABASE_ANON_KEY"))
-
 app = Flask(__name__)
 
+# Seconds a rendered transcript page is served from memory (0 disables caching)
+app.config["TRANSCRIPT_CACHE_TTL"] = float(os.getenv("TRANSCRIPT_CACHE_TTL", "30"))
+page_cache = TranscriptPageCache(
+    ttl_seconds=app.config["TRANSCRIPT_CACHE_TTL"],
+    max_entries=int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "1024"))
+)
+
+# Pages with more records than this are streamed; smaller ones are buffered so the
+# first response already carries an ETag
+app.config["TRANSCRIPT_STREAM_MIN_RECORDS"] = int(os.getenv("TRANSCRIPT_STREAM_MIN_RECORDS", "200"))
+
+# Rendered record cards kept for reuse across pages (0 disables caching)
+fragment_cache = FragmentCache(max_entries=int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "4096")))
+
+# Largest page of schedule records a client may request
+MAX_PAGE_SIZE = 500
+
+# Byte cap and read timeout (seconds) for manifest downloads
+app.config["MANIFEST_MAX_BYTES"] = int(os.getenv("MANIFEST_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+app.config["MANIFEST_READ_TIMEOUT"] = float(os.getenv("MANIFEST_READ_TIMEOUT", "10"))
+
+# Seconds between keep-alive comments on an idle live status stream
+app.config["LIVE_STATUS_HEARTBEAT"] = float(os.getenv("LIVE_STATUS_HEARTBEAT", "15"))
+
+# Cached pages of a transcript are stale once its live status poller sees a change
+live_status.on_change = page_cache.invalidate
+
+@app.before_request
+def _start_timing():
+    g.request_started = time.perf_counter()
+    timing.start_request()
+
+@app.after_request
+def _add_server_timing(response):
+    """
+    Report the stages timed during this request in a Server-Timing header.
+    """
+    spans = timing.end_request()
+    total = time.perf_counter() - g.request_started
+    response.headers["Server-Timing"] = timing.server_timing_header(spans, total)
+
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    HTTP_LATENCY.labels(route).observe(total)
+    HTTP_REQUESTS.labels(route, request.method, response.status_code).inc()
+    return response
+
+def _render_fragment(template, **context):
+    return app.jinja_env.get_template(template).render(**context)
+
+@app.template_global()
+def record_card(record, transcript_id):
+    """
+    Render one dashboard record card, reusing the cached HTML while the record's fields are unchanged.
+    """
+    return Markup(fragment_cache.render("record_card.html", _render_fragment, record=record, transcript_id=transcript_id))
+
+def _timed_render(chunks):
+    """
+    Time a streamed template render, which finishes after the headers have been sent.
+    """
+    started = time.perf_counter()
+    yield from chunks
+    timing.record("render", time.perf_counter() - started)
+
+def _page_response(page):
+    """
+    Build a response for a cached page, answering 304 when the browser's copy is current.
+    """
+    if page.etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = make_response(page.html)
+    response.set_etag(page.etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def _stream_and_cache(chunks, transcript_id, variant, records, generation):
+    """
+    Pass rendered page chunks through, caching the full page once it has been sent.
+
+    A streamed response goes out without an ETag: the ETag is a digest of the whole
+    page, which is only known after the last chunk, when the headers are long gone.
+    Only later cache hits carry it, so the first conditional request after an
+    invalidation re-downloads a streamed page. Pages up to
+    TRANSCRIPT_STREAM_MIN_RECORDS records are buffered instead and get one at once.
+    """
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    page_cache.set(transcript_id, records, "".join(parts), variant, generation)
+
+def _guarded_chunks(chunks, url):
+    """
+    Pass manifest chunks through, ending the stream with a notice if the download fails part way.
+    """
+    try:
+        yield from chunks
+    except Exception as e:
+        app.logger.error(f"Manifest stream from {url} stopped early: {str(e)}")
+        yield f"\n\n[Manifest truncated: {str(e)}]"
+
+async def _no_files():
+    return []
+
+def _export_response(chunks, export_format, filename):
+    """
+    Stream an export as a download. The first page is fetched before the headers go
+    out, so a failing or invalid query still gets an error status.
+    """
+    first = next(chunks, "")
+    response = app.response_class(
+        _logged_export(itertools.chain([first], chunks), filename),
+        mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="{secure_filename(filename)}"'
+    return response
+
+def _logged_export(chunks, filename):
+    """
+    Pass export chunks through, logging a failure part way before the stream is cut off.
+    """
+    try:
+        yield from chunks
+    except Exception as e:
+        app.logger.error(f"Export {filename} stopped early: {str(e)}")
+        raise
+
+def _page_args():
+    """Read the dashboard's platform, status, cursor and limit query arguments."""
+    platform = request.args.get("platform") or None
+    status = request.args.get("status") or None
+    cursor = request.args.get("cursor") or None
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    return platform, status, cursor, limit
+
 @app.route("/transcript/<transcript_id>")
 def view_publish_summary(transcript_id):
     """
@@ -27,15 +183,145 @@ def view_publish_summary(transcript_id):
             error_msg = "Invalid transcript ID provided"
             app.logger.error(error_msg)
             return render_template("error.html", error=error_msg), 400
-            
-        video_records = fetch_video_schedule(transcript_id)
+
+        platform, status, cursor, limit = _page_args()
+        variant = f"{platform}|{status}|{cursor}|{limit}"
+
+        page = page_cache.get(transcript_id, variant)
+        if page is not None:
+            app.logger.info(f"Serving cached publishing records for transcript: {transcript_id}")
+            return _page_response(page)
+
+        generation = page_cache.generation
+        try:
+            video_records, next_cursor = fetch_video_schedule_page(
+                transcript_id, platform=platform, status=status, cursor=cursor, limit=limit
+            )
+        except ValueError as e:
+            error_msg = str(e)
+            app.logger.error(error_msg)
+            return render_template("error.html", error=error_msg), 400
         app.logger.info(f"Successfully fetched {len(video_records)} records for transcript: {transcript_id}")
-        return render_template("dashboard.html", transcript_id=transcript_id, video_records=video_records)
+
+        # Warm the manifest cache so "View Manifest" clicks are served from memory
+        prefetch_manifests(
+            (record.get("manifest_url") for record in video_records),
+            max_bytes=app.config["MANIFEST_MAX_BYTES"],
+            read_timeout=app.config["MANIFEST_READ_TIMEOUT"]
+        )
+
+        context = {
+            "transcript_id": transcript_id,
+            "video_records": video_records,
+            "next_cursor": next_cursor,
+            "filters": {"platform": platform, "status": status, "limit": limit}
+        }
+        if len(video_records) <= app.config["TRANSCRIPT_STREAM_MIN_RECORDS"]:
+            started = time.perf_counter()
+            html = render_template("dashboard.html", **context)
+            timing.record("render", time.perf_counter() - started)
+            return _page_response(page_cache.set(transcript_id, video_records, html, variant, generation))
+
+        chunks = _timed_render(stream_template("dashboard.html", **context))
+        response = make_response(_stream_and_cache(chunks, transcript_id, variant, video_records, generation))
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
     except Exception as e:
         error_msg = f"Error loading data for transcript {transcript_id}: {str(e)}"
         app.logger.error(error_msg)
         return render_template("error.html", error=error_msg), 500
 
+def _publishing_overview():
+    """
+    Return the cross-transcript summary's current snapshot, starting a background
+    refresh if one is due. Until the first build finishes the snapshot is ``building``.
+    """
+    publishing_summary.start_refresh()
+    return publishing_summary.snapshot()
+
+@app.route("/overview")
+def view_overview():
+    """
+    Display published, scheduled and failed counts per platform across all transcripts.
+    """
+    try:
+        summary = _publishing_overview()
+    except Exception as e:
+        error_msg = f"Error loading publishing overview: {str(e)}"
+        app.logger.error(error_msg)
+        return render_template("error.html", error=error_msg), 500
+    return render_template("overview.html", summary=summary, statuses=("published", "scheduled", "failed"))
+
+@app.route("/api/overview")
+def overview_api():
+    """
+    Return the cross-transcript publishing summary as JSON.
+    """
+    try:
+        return jsonify(_publishing_overview())
+    except Exception as e:
+        error_msg = f"Error loading publishing overview: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+def _status_events(subscription, heartbeat):
+    """
+    Format live status events as Server-Sent Events, sending keep-alive comments while idle.
+    The subscription is closed when the stream ends or the client goes away.
+    """
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            if event is None:
+                if subscription.closed:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            name, payload = event
+            yield f"event: {name}\ndata: {json.dumps(payload, default=str)}\n\n"
+    finally:
+        subscription.close()
+
+@app.route("/transcript/<transcript_id>/events")
+def transcript_events(transcript_id):
+    """
+    Stream the publishing status of one dashboard page as Server-Sent Events: a ``snapshot``
+    of its records, then ``changes`` as uploads progress. The page is chosen by the same
+    query arguments as the dashboard, and only its records are polled; everyone watching
+    the same page shares one backend poller. Each open stream holds a server thread.
+    """
+    platform, status, cursor, limit = _page_args()
+    page = page_cache.get(transcript_id, f"{platform}|{status}|{cursor}|{limit}")
+    try:
+        if page is not None:
+            records = page.records
+        else:
+            records, _ = fetch_video_schedule_page(
+                transcript_id, platform=platform, status=status, cursor=cursor, limit=limit
+            )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        error_msg = f"Error loading live status for transcript {transcript_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+    if not records:
+        # Tells EventSource there is nothing to watch, so it does not reconnect
+        return "", 204
+
+    try:
+        subscription = live_status.subscribe(transcript_id, [record.get("id") for record in records])
+    except TooManyWatchersError as e:
+        app.logger.error(f"Refusing live status for transcript {transcript_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 503
+    response = app.response_class(
+        _status_events(subscription, app.config["LIVE_STATUS_HEARTBEAT"]), mimetype="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 @app.route("/manifest")
 def view_manifest():
     """
@@ -50,15 +336,25 @@ def view_manifest():
         app.logger.error(error_msg)
         return render_template("error.html", error=error_msg), 400
         
+    limits = {
+        "max_bytes": app.config["MANIFEST_MAX_BYTES"],
+        "read_timeout": app.config["MANIFEST_READ_TIMEOUT"]
+    }
     try:
-        content = fetch_manifest_text(url)
-        app.logger.info(f"Successfully fetched manifest content from: {url}")
-        
         # Convert markdown to HTML if it looks like markdown
         if url.lower().endswith('.md'):
-            html_content = markdown.markdown(content)
-            return render_template("manifest.html", content=html_content)
-        return render_template("manifest.html", content=content, is_plain_text=True)
+            content = fetch_manifest_text(url, **limits)
+            app.logger.info(f"Successfully fetched manifest content from: {url}")
+            html_content = render_manifest_html(content)
+            with timing.span("render"):
+                return render_template("manifest.html", content=html_content)
+
+        # Plain text is streamed into the page as it downloads
+        chunks = stream_manifest_text(url, **limits)
+        app.logger.info(f"Streaming manifest content from: {url}")
+        return _timed_render(
+            stream_template("manifest.html", content_chunks=_guarded_chunks(chunks, url), is_plain_text=True)
+        )
         
     except Exception as e:
         error_msg = f"Failed to load manifest from {url}: {str(e)}"
@@ -72,6 +368,7 @@ def retry_upload():
     Clears the error and published status so App 7 will retry the upload.
     """
     video_id = request.form.get("video_id")
+    transcript_id = request.form.get("transcript_id")
     app.logger.info(f"Attempting to retry upload for video: {video_id}")
     
     if not video_id:
@@ -80,19 +377,13 @@ def retry_upload():
         return render_template("error.html", error=error_msg), 400
 
     try:
-        response = supabase.table("video_schedule") \
-            .update({
-                "published": False,
-                "publish_error": None
-            }) \
-            .eq("id", video_id) \
-            .execute()
-        
-        if response.get("error"):
-            error_msg = f"Supabase update failed: {response['error']}"
-            app.logger.error(error_msg)
-            return render_template("error.html", error=error_msg), 500
+        retry_video(video_id)
         
+        if transcript_id:
+            page_cache.invalidate(transcript_id)
+        else:
+            page_cache.invalidate_video(video_id)
+
         app.logger.info(f"Successfully reset video {video_id} for retry")
         return redirect(request.referrer or url_for("view_publish_summary", transcript_id="unknown"))
     
@@ -101,5 +392,178 @@ def retry_upload():
         app.logger.error(error_msg)
         return render_template("error.html", error=error_msg), 500
 
+def _check_video_ids(video_ids):
+    """
+    Reject explicit video IDs that are not a list of non-empty strings, or more than
+    MAX_PAGE_SIZE of them.
+    """
+    if not isinstance(video_ids, list) or not all(isinstance(video_id, str) and video_id for video_id in video_ids):
+        raise ValueError("video_ids must be a list of non-empty strings")
+    if len(video_ids) > MAX_PAGE_SIZE:
+        raise ValueError(f"At most {MAX_PAGE_SIZE} video_ids can be retried at once")
+
+@app.route("/retry/bulk", methods=["POST"])
+def retry_uploads_bulk():
+    """
+    Reset many failed uploads at once, scoped by transcript, platform or explicit video IDs.
+    Responds with the number of reset records as JSON, or redirects back for form posts.
+    """
+    payload = request.get_json(silent=True) or {}
+    transcript_id = payload.get("transcript_id") or request.form.get("transcript_id")
+    platform = payload.get("platform") or request.form.get("platform")
+    video_ids = payload.get("video_ids")
+    if video_ids is None:
+        video_ids = request.form.getlist("video_ids")
+
+    try:
+        _check_video_ids(video_ids)
+        app.logger.info(
+            f"Attempting bulk retry (transcript={transcript_id}, platform={platform}, videos={len(video_ids)})"
+        )
+        retried = retry_failed_videos(transcript_id=transcript_id, platform=platform, video_ids=video_ids)
+    except ValueError as e:
+        error_msg = str(e)
+        app.logger.error(error_msg)
+        if request.is_json:
+            return jsonify({"error": error_msg}), 400
+        return render_template("error.html", error=error_msg), 400
+    except Exception as e:
+        error_msg = f"Error retrying uploads: {e}"
+        app.logger.error(error_msg)
+        if request.is_json:
+            return jsonify({"error": error_msg}), 500
+        return render_template("error.html", error=error_msg), 500
+
+    if video_ids and not transcript_id:
+        for video_id in video_ids:
+            page_cache.invalidate_video(video_id)
+    elif transcript_id:
+        page_cache.invalidate(transcript_id)
+    else:
+        page_cache.clear()
+
+    app.logger.info(f"Successfully reset {retried} videos for retry")
+    if request.is_json:
+        return jsonify({"retried": retried})
+    return redirect(request.referrer or url_for("view_publish_summary", transcript_id=transcript_id or "unknown"))
+
+@app.route("/api/transcript/<transcript_id>")
+async def transcript_api(transcript_id):
+    """
+    Return a transcript's video schedule, and optionally a user's files for it, as JSON.
+    The schedule and the files are fetched concurrently on worker threads through the
+    pooled service functions, so their caches, read coalescing and circuit breakers apply.
+    """
+    platform = request.args.get("platform") or None
+    status = request.args.get("status") or None
+    user_id = request.args.get("user_id")
+    try:
+        videos, files = await asyncio.gather(
+            asyncio.to_thread(fetch_video_schedule, transcript_id, platform=platform, status=status),
+            asyncio.to_thread(fetch_user_files, user_id, transcript_id) if user_id else _no_files()
+        )
+        if files and request.args.get("previews") == "1":
+            urls = await asyncio.to_thread(get_signed_urls, [(file["bucket"], file["file_path"]) for file in files])
+            for file in files:
+                file["preview_url"] = urls[(file["bucket"], file["file_path"])]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        error_msg = f"Error loading data for transcript {transcript_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+    return jsonify({"transcript_id": transcript_id, "videos": videos, "files": files})
+
+@app.route("/api/files/<file_id>/approve", methods=["POST"])
+async def approve_file_api(file_id):
+    """
+    Approve a deliverable and return its updated record as JSON.
+    """
+    try:
+        return jsonify(await asyncio.to_thread(approve_file, file_id))
+    except Exception as e:
+        error_msg = f"Error approving file {file_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+@app.route("/api/files/<file_id>/reject", methods=["POST"])
+async def reject_file_api(file_id):
+    """
+    Reject a deliverable, with an optional reason, and return its updated record as JSON.
+    """
+    payload = request.get_json(silent=True) or {}
+    reason = payload.get("reason") or request.form.get("reason")
+    try:
+        return jsonify(await asyncio.to_thread(reject_file, file_id, reason))
+    except Exception as e:
+        error_msg = f"Error rejecting file {file_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+@app.route("/export/users/<user_id>/files.<export_format>")
+def export_user_files(user_id, export_format):
+    """
+    Download a user's transcript files as CSV or JSON Lines, streamed page by page.
+    Optional ``transcript_id`` and ``status`` (repeatable) query arguments narrow the export.
+    """
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+    pages = iter_user_file_export_pages(
+        user_id, request.args.get("transcript_id") or None, status=request.args.getlist("status") or None
+    )
+    try:
+        return _export_response(
+            export_chunks(pages, export_format, FILE_EXPORT_COLUMNS), export_format, f"{user_id}-files.{export_format}"
+        )
+    except Exception as e:
+        error_msg = f"Error exporting files for user {user_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+@app.route("/export/transcripts/<transcript_id>/schedule.<export_format>")
+def export_video_schedule(transcript_id, export_format):
+    """
+    Download a transcript's video schedule as CSV or JSON Lines, streamed page by page.
+    Optional ``platform`` and ``status`` query arguments narrow the export.
+    """
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+    pages = iter_schedule_export_pages(
+        transcript_id, platform=request.args.get("platform") or None, status=request.args.get("status") or None
+    )
+    try:
+        return _export_response(
+            export_chunks(pages, export_format, SCHEDULE_EXPORT_COLUMNS), export_format,
+            f"{transcript_id}-schedule.{export_format}"
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        error_msg = f"Error exporting schedule for transcript {transcript_id}: {str(e)}"
+        app.logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+@app.route("/timings")
+def view_timings():
+    """
+    Return per-stage latency histograms (count, mean, p50, p95) as JSON.
+    """
+    return jsonify(timing.stage_summary())
+
+@app.route("/resilience")
+def view_resilience():
+    """
+    Return circuit breaker state, call outcomes and hedging delays per Supabase operation.
+    """
+    return jsonify(supabase_calls.stats())
+
+@app.route("/metrics")
+def view_metrics():
+    """
+    Expose request, Supabase, manifest cache and pipeline metrics in Prometheus text format.
+    """
+    return app.response_class(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,9 +1,7 @@
 """
 Main controller for the deliverables dashboard, integrating file fetching, preview, and approval functionality.
 """
-from typing import Dict, List, Optional
-from itertools import groupby
-from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Union
 
 from ..services import supabase_service
 
@@ -15,46 +13,74 @@ class DashboardController:
             'text': ['.md', '.json']
         }
     
-    def get_user_files(self, user_id: str, transcript_id: Optional[str] = None) -> Dict[str, List[Dict]]:
+    def get_user_files(
+        self,
+        user_id: str,
+        transcript_id: Optional[str] = None,
+        include_preview_urls: bool = True,
+        status: Optional[Union[str, Sequence[str]]] = None
+    ) -> Dict[str, List[Dict]]:
         """
         Fetch all files for a user with preview URLs.
         
         Args:
             user_id (str): The ID of the user
             transcript_id (Optional[str]): Optional transcript ID filter
+            include_preview_urls (bool): Sign preview URLs up front. When False only
+                metadata and preview_type are returned; use sign_preview_urls or
+                get_file_preview_data to sign previews as they are opened.
+            status (Optional[Union[str, Sequence[str]]]): Optional status filter,
+                applied in the database
             
         Returns:
             Dict[str, List[Dict]]: Files grouped by transcript_id with preview URLs
         """
-        # Fetch base file data
-        files = supabase_service.fetch_user_files(user_id, transcript_id)
+        grouped_files: Dict[str, List[Dict]] = {}
         
-        # Add preview URLs and organize by type
-        for file in files:
-            file['preview_url'] = supabase_service.get_signed_url(
-                file['bucket'],
-                file['file_path'],
-                self.PREVIEW_URL_EXPIRY
-            )
+        # Pages arrive ordered by (transcript_id, id), so grouping is a single pass
+        for page in supabase_service.iter_user_file_pages(user_id, transcript_id, status=status):
+            for file in page:
+                file['preview_type'] = self._get_preview_type(file.get('file_name', ''))
+                grouped_files.setdefault(file['transcript_id'], []).append(file)
             
-            # Determine preview type
-            extension = file.get('file_name', '').lower()
-            if any(extension.endswith(ext) for ext in self.SUPPORTED_PREVIEW_TYPES['video']):
-                file['preview_type'] = 'video'
-            elif any(extension.endswith(ext) for ext in self.SUPPORTED_PREVIEW_TYPES['text']):
-                file['preview_type'] = 'text'
-            else:
-                file['preview_type'] = 'unknown'
-        
-        # Group by transcript_id
-        files.sort(key=itemgetter('transcript_id'))
-        grouped_files = {
-            transcript_id: list(group)
-            for transcript_id, group in groupby(files, key=itemgetter('transcript_id'))
-        }
+            if include_preview_urls:
+                self.sign_preview_urls(page)
         
         return grouped_files
     
+    def _get_preview_type(self, file_name: str) -> str:
+        """Classify a file as 'video', 'text' or 'unknown' from its extension."""
+        extension = file_name.lower()
+        if any(extension.endswith(ext) for ext in self.SUPPORTED_PREVIEW_TYPES['video']):
+            return 'video'
+        if any(extension.endswith(ext) for ext in self.SUPPORTED_PREVIEW_TYPES['text']):
+            return 'text'
+        return 'unknown'
+    
+    def sign_preview_urls(self, files: List[Dict]) -> List[Dict]:
+        """
+        Add preview URLs to the given files, e.g. the ones currently visible.
+        
+        Files that already have a preview URL are left alone; the rest are signed
+        in bulk.
+        
+        Args:
+            files (List[Dict]): File metadata with bucket and file_path
+            
+        Returns:
+            List[Dict]: The same files with preview_url set
+        """
+        unsigned = [file for file in files if not file.get('preview_url')]
+        if unsigned:
+            # Sign all preview URLs in bulk rather than one request per file
+            signed_urls = supabase_service.get_signed_urls(
+                ((file['bucket'], file['file_path']) for file in unsigned),
+                self.PREVIEW_URL_EXPIRY
+            )
+            for file in unsigned:
+                file['preview_url'] = signed_urls[(file['bucket'], file['file_path'])]
+        return files
+    
     def approve_user_file(self, file_id: str) -> Dict:
         """
         Approve a file and return updated record.
@@ -80,21 +106,59 @@ class DashboardController:
         """
         return supabase_service.reject_file(file_id, reason)
     
+    def approve_user_files(self, file_ids: List[str]) -> Dict[str, List]:
+        """
+        Approve several files in one request.
+        
+        Args:
+            file_ids (List[str]): The IDs of the files to approve
+            
+        Returns:
+            Dict[str, List]: Updated records under 'updated' and unknown IDs under 'missing'
+        """
+        return supabase_service.approve_files(file_ids)
+    
+    def reject_user_files(self, file_ids: List[str], reason: Optional[str] = None) -> Dict[str, List]:
+        """
+        Reject several files in one request.
+        
+        Args:
+            file_ids (List[str]): The IDs of the files to reject
+            reason (Optional[str]): Optional reason for rejection
+            
+        Returns:
+            Dict[str, List]: Updated records under 'updated' and unknown IDs under 'missing'
+        """
+        return supabase_service.reject_files(file_ids, reason)
+    
     def get_file_preview_data(self, file_data: Dict) -> Dict:
         """
         Get formatted preview data for a file.
         
+        The preview URL is signed on demand when the listing was fetched without
+        preview URLs, so opening a preview costs one (cached) signing call.
+        
         Args:
-            file_data (Dict): File metadata including preview_url and preview_type
+            file_data (Dict): File metadata including bucket, file_path and optionally
+                preview_url and preview_type
             
         Returns:
             Dict: Preview configuration for the UI
         """
+        preview_url = file_data.get('preview_url')
+        if not preview_url:
+            preview_url = supabase_service.get_signed_url(
+                file_data['bucket'],
+                file_data['file_path'],
+                self.PREVIEW_URL_EXPIRY
+            )
+            file_data['preview_url'] = preview_url
+        
         preview_config = {
             'id': file_data['id'],
             'name': file_data['file_name'],
-            'type': file_data['preview_type'],
-            'url': file_data['preview_url'],
+            'type': file_data.get('preview_type') or self._get_preview_type(file_data['file_name']),
+            'url': preview_url,
             'status': file_data.get('status', 'pending'),
             'approved_at': file_data.get('approved_at'),
             'rejected_at': file_data.get('rejected_at'),
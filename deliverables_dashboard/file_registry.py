@@ -2,6 +2,11 @@ from pathlib import Path
 from typing import List, Dict
 import re
 
+try:
+    from .utils.metrics import timed
+except ImportError:  # imported as a top-level module
+    from utils.metrics import timed
+
 def _extract_title(content: str) -> str:
     """Extract the first # heading from markdown content"""
     title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
@@ -36,6 +41,7 @@ def _count_words(content: str) -> int:
     words = [word for word in content.split() if word.strip()]
     return len(words)
 
+@timed("scan")
 def scan_drafts(directory_path: str) -> List[Dict]:
     """
     Scan a directory for markdown files and extract metadata.
@@ -6,6 +6,11 @@ import json
 import re
 import shutil
 
+try:
+    from .utils.metrics import timed
+except ImportError:  # imported as a top-level module
+    from utils.metrics import timed
+
 @dataclass
 class HandoffMetadata:
     """Metadata for content handoff to App 6"""
@@ -19,6 +24,7 @@ def count_revision_notes(content: str) -> int:
     """Count revision notes (HTML comments) in content"""
     return len(re.findall(r'<!--\s*MISALIGNMENT:', content))
 
+@timed("handoff")
 def prepare_handoff(
     content_files: List[str],
     project_id: str,
@@ -84,6 +90,7 @@ def prepare_handoff(
     print(f"[HANDOFF] ✅ {len(copied_files)} files prepared")
     return metadata
 
+@timed("handoff_manifest")
 def write_handoff_manifest(metadata: HandoffMetadata, output_dir: str) -> str:
     """
     Write handoff manifest for App 6.
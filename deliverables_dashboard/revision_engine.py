@@ -2,6 +2,11 @@ from dataclasses import dataclass
 from typing import Dict, List
 import re
 
+try:
+    from .utils.metrics import timed
+except ImportError:  # imported as a top-level module
+    from utils.metrics import timed
+
 @dataclass
 class StyleProfile:
     """Style guidelines for content revision"""
@@ -23,6 +28,7 @@ class RevisionRequest:
     content: str
     style_profile: StyleProfile
 
+@timed("revision")
 def apply_revision_guidelines(content: str, style_profile: Dict[str, List[str]]) -> str:
     """
     Apply style guidelines to content and return annotated markdown.
@@ -0,0 +1,120 @@
+"""
+Streaming CSV and JSON Lines exports of transcript files and video schedules.
+
+Rows are read one keyset page at a time, and each page is serialized and handed
+on before the next one is fetched, so an export holds a single page in memory
+however many rows it covers.
+"""
+import csv
+import io
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .supabase_service import FILE_LIST_COLUMNS, fetch_user_files_page
+from .video_schedule import SCHEDULE_COLUMNS, fetch_video_schedule_page
+
+# Rows fetched per backend round trip while exporting
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+
+# Export format -> response MIME type
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson"
+}
+
+FILE_EXPORT_COLUMNS = FILE_LIST_COLUMNS.split(",")
+SCHEDULE_EXPORT_COLUMNS = SCHEDULE_COLUMNS.split(",")
+
+
+def iter_user_file_export_pages(
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    status: Optional[Union[str, Sequence[str]]] = None,
+    page_size: Optional[int] = None
+) -> Iterator[List[Dict]]:
+    """
+    Yield a user's transcript files page by page, straight from the backend.
+
+    Unlike iter_user_file_pages this skips the listing cache, which would keep a
+    copy of every row to store once the listing is complete.
+
+    Raises:
+        Exception: If a page query fails
+    """
+    page_size = page_size or EXPORT_PAGE_SIZE
+    after = None
+    while True:
+        rows, after = fetch_user_files_page(
+            user_id, transcript_id, status=status, columns=FILE_LIST_COLUMNS, after=after, limit=page_size
+        )
+        if rows:
+            yield rows
+        if after is None:
+            return
+
+
+def iter_schedule_export_pages(
+    transcript_id: str,
+    platform: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> Iterator[List[Dict]]:
+    """
+    Yield a transcript's video schedule page by page.
+
+    Raises:
+        ValueError: If the status filter is unknown
+        Exception: If a page query fails
+    """
+    page_size = page_size or EXPORT_PAGE_SIZE
+    cursor = None
+    while True:
+        records, cursor = fetch_video_schedule_page(transcript_id, platform, status, cursor, page_size)
+        if records:
+            yield records
+        if cursor is None:
+            return
+
+
+def csv_chunks(pages: Iterable[List[Dict]], columns: Sequence[str]) -> Iterator[str]:
+    """
+    Serialize pages of rows as CSV, one chunk per page.
+
+    The header goes out with the first page, so nothing is produced until the first
+    query has succeeded. Missing values are written as empty cells.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore")
+    writer.writeheader()
+    for page in pages:
+        writer.writerows(page)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # No rows at all: still send the header
+        yield buffer.getvalue()
+
+
+def jsonl_chunks(pages: Iterable[List[Dict]], columns: Sequence[str]) -> Iterator[str]:
+    """Serialize pages of rows as JSON Lines, one chunk per page."""
+    for page in pages:
+        yield "".join(
+            json.dumps({column: row.get(column) for column in columns}, default=str) + "\n"
+            for row in page
+        )
+
+
+def export_chunks(pages: Iterable[List[Dict]], export_format: str, columns: Sequence[str]) -> Iterator[str]:
+    """
+    Serialize pages of rows in the requested format.
+
+    Raises:
+        ValueError: If the format is not one of EXPORT_FORMATS
+    """
+    if export_format == "csv":
+        return csv_chunks(pages, columns)
+    if export_format == "jsonl":
+        return jsonl_chunks(pages, columns)
+    raise ValueError(f"Unknown export format: {export_format}")
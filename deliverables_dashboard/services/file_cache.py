@@ -0,0 +1,148 @@
+"""
+Read-through cache of transcript file listings with write-through on review.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (user_id, transcript_id); transcript_id is None for a user's full listing
+ListingKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class CachedListing:
+    """A user's file rows, ordered by (transcript_id, id), indexed by file ID"""
+    rows: List[Dict]
+    by_id: Dict[str, Dict]
+    expires_at: float
+
+
+class UserFileCache:
+    """
+    Thread-safe LRU cache of transcript file listings keyed by (user_id, transcript_id).
+
+    Approvals and rejections are written through: rows returned by an update replace
+    the cached copies in place, so the next read needs no query. Entries expire after
+    ``ttl_seconds`` (zero or less disables caching) and at most ``max_entries`` listings
+    are kept. Expired listings stay until evicted so ``get_stale`` can serve them
+    while the backend is down. Callers always get copies of the cached rows.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[ListingKey, CachedListing]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every write, used to discard listings read before it."""
+        return self._generation
+
+    def get(self, user_id: str, transcript_id: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Return copies of the cached rows for a listing, or None if missing or expired.
+        """
+        key = (user_id, transcript_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                return None
+            self._entries.move_to_end(key)
+            return [dict(row) for row in entry.rows]
+
+    def get_stale(self, user_id: str, transcript_id: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Return copies of the cached rows for a listing even if expired, or None if missing.
+        """
+        with self._lock:
+            entry = self._entries.get((user_id, transcript_id))
+            if entry is None:
+                return None
+            return [dict(row) for row in entry.rows]
+
+    def set(
+        self,
+        user_id: str,
+        transcript_id: Optional[str],
+        rows: List[Dict],
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Store a listing. If ``generation`` is given and a write happened since it was
+        read, the listing may be stale and is not stored.
+        """
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        copies = [dict(row) for row in rows]
+        entry = CachedListing(
+            rows=copies,
+            by_id={str(row.get("id")): row for row in copies},
+            expires_at=self._clock() + self.ttl_seconds
+        )
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[(user_id, transcript_id)] = entry
+            self._entries.move_to_end((user_id, transcript_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update_rows(self, rows: Iterable[Dict]) -> int:
+        """
+        Write updated rows into every cached listing that holds them.
+
+        Only the columns already cached are copied over. A listing that should hold a
+        row but does not is dropped so the next read refetches it.
+
+        Returns:
+            int: Number of cached rows updated
+        """
+        updated = 0
+        with self._lock:
+            self._generation += 1
+            for row in rows:
+                file_id = str(row.get("id"))
+                user_id, transcript_id = row.get("user_id"), row.get("transcript_id")
+                for key, entry in list(self._entries.items()):
+                    if user_id is not None and key[0] != user_id:
+                        continue
+                    cached = entry.by_id.get(file_id)
+                    if cached is not None:
+                        cached.update({column: row[column] for column in cached if column in row})
+                        updated += 1
+                    elif user_id is not None and key[1] in (None, transcript_id):
+                        del self._entries[key]
+        return updated
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop every cached listing for a user."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached listings."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Cache shared by supabase_service
+user_file_cache = UserFileCache(
+    ttl_seconds=float(os.getenv("USER_FILE_CACHE_TTL", "60")),
+    max_entries=int(os.getenv("USER_FILE_CACHE_MAX_ENTRIES", "1024"))
+)
@@ -0,0 +1,42 @@
+"""
+Helpers for keyset (seek) pagination over PostgREST queries.
+"""
+import base64
+import json
+from typing import Sequence, Tuple
+
+
+def quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST logical filter."""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def after_filter(first_column: str, second_column: str, after: Tuple[str, str]) -> str:
+    """
+    Build an ``or_`` filter selecting rows strictly after ``after`` in
+    (first_column, second_column) order.
+    """
+    first, second = quote(after[0]), quote(after[1])
+    return (
+        f"{first_column}.gt.{first},"
+        f"and({first_column}.eq.{first},{second_column}.gt.{second})"
+    )
+
+
+def encode_cursor(values: Sequence[str]) -> str:
+    """Pack the sort key of the last row on a page into an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Unpack a two-column cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        first, second = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(first), str(second)
+    except Exception as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
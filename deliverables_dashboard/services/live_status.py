@@ -0,0 +1,246 @@
+"""
+Live publishing status for the records shown on a dashboard page, polled once and
+shared by every watcher.
+
+A watch covers one transcript and the record IDs of one page, so a poll reads only
+those records (at most one query per RECORD_ID_BATCH_SIZE IDs) rather than the
+whole schedule. Each watch has one background poller that diffs the records
+against the previous read and fans the changed ones out to every subscriber's
+queue; however many browsers show the same page, the backend sees one read per
+poll interval. A poller stops once its last subscriber leaves.
+
+Every open stream holds a connection, and under a synchronous WSGI server a
+worker thread, for as long as the page is watched. The dashboard only opens one
+when asked to, and the app must run on a threaded or async server (e.g. gunicorn
+with ``--threads`` or gevent workers) sized for the expected watchers.
+"""
+import logging
+import os
+import queue
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .publishing_summary import classify
+from .video_schedule import fetch_video_records
+
+logger = logging.getLogger(__name__)
+
+# (event name, payload) handed to subscribers
+StatusEvent = Tuple[str, Dict]
+
+# (transcript_id, record IDs) identifying what a poller reads
+WatchKey = Tuple[str, FrozenSet[str]]
+
+
+class TooManyWatchersError(Exception):
+    """Raised when subscribing would start more pollers than allowed"""
+
+
+def _with_status(record: Dict) -> Dict:
+    return dict(record, status=classify(record))
+
+
+def diff_records(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict[str, List]:
+    """
+    Compare two reads of a schedule keyed by record ID.
+
+    Returns:
+        Dict[str, List]: ``changed`` holds new or modified records (with a derived
+        ``status``) and ``removed`` the IDs that disappeared
+    """
+    return {
+        "changed": [_with_status(record) for record_id, record in current.items()
+                    if previous.get(record_id) != record],
+        "removed": [record_id for record_id in previous if record_id not in current]
+    }
+
+
+class Subscription:
+    """One watcher's queue of status events for a transcript."""
+
+    def __init__(self, hub: "LiveStatusHub", key: WatchKey, max_events: int):
+        self.transcript_id = key[0]
+        self.key = key
+        self.closed = False
+        self._hub = hub
+        self._events: "queue.Queue[StatusEvent]" = queue.Queue(maxsize=max_events)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[StatusEvent]:
+        """
+        Return the next event, or None if none arrived within ``timeout``. Once the
+        subscription is closed, waiting events are still returned, then None at once.
+        """
+        try:
+            if self.closed:
+                return self._events.get_nowait()
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events; the poller stops when nobody is left."""
+        self._hub.unsubscribe(self)
+
+    def _push(self, event: StatusEvent) -> bool:
+        try:
+            self._events.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+
+class _Watch:
+    """Poller state for one transcript's set of records"""
+
+    def __init__(self, key: WatchKey):
+        self.key = key
+        self.transcript_id = key[0]
+        self.subscribers: Set[Subscription] = set()
+        self.records: Optional[Dict[str, Dict]] = None
+        self.failing = False
+        self.stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+
+class LiveStatusHub:
+    """
+    Shares one poller per transcript and set of record IDs among its subscribers.
+
+    A new subscriber is sent a ``snapshot`` of its records (as soon as the first
+    poll has finished), then ``changes`` events with only the records that differ
+    from the previous poll. A failing poll sends one ``error`` event and polling
+    carries on. A subscriber whose queue fills up is closed; once it has read what
+    is waiting its stream ends, and the client reconnects to start again from a
+    snapshot.
+
+    Args:
+        poll_seconds: Time between polls of a watch
+        max_watches: Watches that may be polled at once
+        max_records: Record IDs a single watch may cover
+        max_events: Events a subscriber may have waiting
+        fetch: Reads a transcript's records with the given IDs
+        on_change: Called with the transcript ID after a poll found changes
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = 5.0,
+        max_watches: int = 200,
+        max_records: int = 500,
+        max_events: int = 100,
+        fetch: Callable[[str, List[str]], List[Dict]] = fetch_video_records,
+        on_change: Optional[Callable[[str], None]] = None
+    ):
+        self.poll_seconds = poll_seconds
+        self.max_watches = max_watches
+        self.max_records = max_records
+        self.max_events = max_events
+        self.on_change = on_change
+        self._fetch = fetch
+        self._watches: Dict[WatchKey, _Watch] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, transcript_id: str, record_ids: Iterable[str]) -> Subscription:
+        """
+        Start watching records of a transcript, sharing the poller of any subscriber
+        watching the same records.
+
+        Raises:
+            ValueError: If no record IDs, or more than ``max_records``, are given
+            TooManyWatchersError: If a new poller would exceed ``max_watches``
+        """
+        ids = frozenset(str(record_id) for record_id in record_ids if record_id)
+        if not ids:
+            raise ValueError("Live status needs at least one record ID")
+        if len(ids) > self.max_records:
+            raise ValueError(f"Live status covers at most {self.max_records} records")
+        key = (transcript_id, ids)
+        subscription = Subscription(self, key, self.max_events)
+        with self._lock:
+            watch = self._watches.get(key)
+            if watch is None:
+                if len(self._watches) >= self.max_watches:
+                    raise TooManyWatchersError(f"Already watching {self.max_watches} pages")
+                watch = self._watches[key] = _Watch(key)
+                watch.thread = threading.Thread(
+                    target=self._poll, args=(watch,), name=f"live-status-{transcript_id}", daemon=True
+                )
+                watch.thread.start()
+            elif watch.records is not None:
+                subscription._push(("snapshot", self._snapshot(watch.records)))
+            watch.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscription.closed = True
+            watch = self._watches.get(subscription.key)
+            if watch is None:
+                return
+            watch.subscribers.discard(subscription)
+            if not watch.subscribers:
+                del self._watches[watch.key]
+                watch.stop.set()
+
+    def watching(self) -> Dict[str, int]:
+        """Return subscriber counts per watched transcript."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for watch in self._watches.values():
+                counts[watch.transcript_id] = counts.get(watch.transcript_id, 0) + len(watch.subscribers)
+        return counts
+
+    def close(self) -> None:
+        """Stop every poller and drop all subscribers."""
+        with self._lock:
+            watches = list(self._watches.values())
+            self._watches.clear()
+        for watch in watches:
+            for subscription in watch.subscribers:
+                subscription.closed = True
+            watch.stop.set()
+        for watch in watches:
+            if watch.thread is not None and watch.thread is not threading.current_thread():
+                watch.thread.join()
+
+    @staticmethod
+    def _snapshot(records: Dict[str, Dict]) -> Dict:
+        return {"records": [_with_status(record) for record in records.values()]}
+
+    def _poll(self, watch: _Watch) -> None:
+        while not watch.stop.is_set():
+            try:
+                current = {str(record.get("id")): record
+                           for record in self._fetch(watch.transcript_id, sorted(watch.key[1]))}
+            except Exception as e:
+                logger.error(f"Live status poll for transcript {watch.transcript_id} failed: {str(e)}")
+                if not watch.failing:
+                    watch.failing = True
+                    self._publish(watch, ("error", {"error": str(e)}))
+            else:
+                watch.failing = False
+                previous, watch.records = watch.records, current
+                if previous is None:
+                    self._publish(watch, ("snapshot", self._snapshot(current)))
+                else:
+                    delta = diff_records(previous, current)
+                    if delta["changed"] or delta["removed"]:
+                        self._publish(watch, ("changes", delta))
+                        if self.on_change is not None:
+                            self.on_change(watch.transcript_id)
+            watch.stop.wait(self.poll_seconds)
+
+    def _publish(self, watch: _Watch, event: StatusEvent) -> None:
+        with self._lock:
+            subscribers = list(watch.subscribers)
+        for subscription in subscribers:
+            if not subscription._push(event):
+                # Too far behind: end its stream so the client reconnects for a snapshot
+                self.unsubscribe(subscription)
+
+
+# Hub shared by the live status endpoint
+live_status = LiveStatusHub(
+    poll_seconds=float(os.getenv("LIVE_STATUS_POLL_SECONDS", "5")),
+    max_watches=int(os.getenv("LIVE_STATUS_MAX_WATCHES", "200"))
+)
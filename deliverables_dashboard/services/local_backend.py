@@ -0,0 +1,521 @@
+"""
+SQLite-backed stand-in for the Supabase client, for offline load tests and benchmarks.
+
+Implements the subset of the client the dashboard uses: ``table()`` queries built
+from ``select``/``update`` with ``eq``, ``in_``, ``is_``, ``not_``, ``or_``,
+``order`` and ``limit``, and storage ``create_signed_url``/``create_signed_urls``.
+
+Set ``DASHBOARD_BACKEND=local`` to use it in place of Supabase. ``LOCAL_BACKEND_PATH``
+picks the database file (an in-memory database by default). To have data to look
+at, either set ``LOCAL_BACKEND_SEED=1`` so an empty database is filled with
+synthetic rows when it is first opened, or seed a file ahead of time::
+
+    python -m deliverables_dashboard.services.local_backend seed dashboard.db --users 5
+
+An in-memory database lives and dies with its process and all threads share its
+one connection. Use a file path whenever the app runs more than one worker
+process (each would otherwise see its own, separately seeded data, and writes in
+one would not show up in the others) or many threads, which then get SQLite's WAL
+mode instead of queuing on a single in-memory connection.
+"""
+import argparse
+import itertools
+import os
+import random
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Column name -> SQLite type for each table the dashboard reads or writes
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "transcript_files": {
+        "id": "TEXT PRIMARY KEY",
+        "user_id": "TEXT",
+        "transcript_id": "TEXT",
+        "file_name": "TEXT",
+        "bucket": "TEXT",
+        "file_path": "TEXT",
+        "status": "TEXT",
+        "approved_at": "TEXT",
+        "rejected_at": "TEXT",
+        "rejection_reason": "TEXT"
+    },
+    "video_schedule": {
+        "id": "TEXT PRIMARY KEY",
+        "transcript_id": "TEXT",
+        "platform": "TEXT",
+        "scheduled_at": "TEXT",
+        "published": "BOOLEAN",
+        "publish_url": "TEXT",
+        "manifest_url": "TEXT",
+        "publish_error": "TEXT",
+        "updated_at": "TEXT"
+    }
+}
+
+# Columns stamped on every update, as the moddatetime trigger does in Supabase
+TOUCHED_COLUMNS: Dict[str, str] = {"video_schedule": "updated_at"}
+
+# Indexes matching the dashboard's filters and keyset orderings
+INDEXES: Dict[str, List[Tuple[str, ...]]] = {
+    "transcript_files": [("user_id", "transcript_id", "id"), ("status",)],
+    "video_schedule": [("transcript_id", "scheduled_at", "id"), ("platform",), ("updated_at", "id")]
+}
+
+# Base of the URLs handed out by the fake storage signer
+LOCAL_STORAGE_URL = "http://localhost:54321/storage/v1/object/sign"
+
+# SQLite's default limit on bound parameters is 999
+_MAX_PARAMS = 900
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+@dataclass
+class LocalResponse:
+    """Query result with the same ``data``/``count`` shape as a PostgREST response."""
+
+    data: List[Dict] = field(default_factory=list)
+    count: Optional[int] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access; a local query never carries an ``error``."""
+        return getattr(self, key, default)
+
+
+class LocalQuery:
+    """Chainable query on one table, executed against SQLite."""
+
+    def __init__(self, backend: "LocalBackend", table: str):
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown table for the local backend: {table}")
+        self._backend = backend
+        self._table = table
+        self._columns = list(SCHEMAS[table])
+        self._action = "select"
+        self._selected = self._columns
+        self._values: Dict[str, Any] = {}
+        self._count: Optional[str] = None
+        self._returning = "representation"
+        self._where: List[Tuple[str, List[Any]]] = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._negate = False
+
+    def _column(self, name: str) -> str:
+        if name not in self._columns:
+            raise ValueError(f"Unknown column {name} on {self._table}")
+        return name
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "LocalQuery":
+        self._action = "select"
+        self._count = count
+        if columns.strip() != "*":
+            self._selected = [self._column(name.strip()) for name in columns.split(",") if name.strip()]
+        return self
+
+    def update(self, json: Dict, count: Optional[str] = None, returning: str = "representation") -> "LocalQuery":
+        self._action = "update"
+        self._values = {self._column(name): value for name, value in json.items()}
+        self._count = count
+        self._returning = returning
+        return self
+
+    @property
+    def not_(self) -> "LocalQuery":
+        self._negate = True
+        return self
+
+    def _filter(self, sql: str, params: List[Any]) -> "LocalQuery":
+        if self._negate:
+            sql = f"NOT ({sql})"
+            self._negate = False
+        self._where.append((sql, params))
+        return self
+
+    def _compare(self, column: str, operator: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{self._column(column)} {_OPERATORS[operator]} ?", [value])
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(*self._is_clause(column, value))
+
+    def in_(self, column: str, values: Iterable[Any]) -> "LocalQuery":
+        values = list(values)
+        if not values:
+            return self._filter("0", [])
+        return self._filter(f"{self._column(column)} IN ({','.join('?' * len(values))})", values)
+
+    def or_(self, filters: str) -> "LocalQuery":
+        """Apply a PostgREST logical filter such as ``a.gt."x",and(a.eq."x",b.gt."y")``."""
+        return self._filter(*self._logical(filters, " OR "))
+
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self._order.append(f"{self._column(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, size: int) -> "LocalQuery":
+        self._limit = int(size)
+        return self
+
+    def execute(self) -> LocalResponse:
+        where = " AND ".join(f"({sql})" for sql, _ in self._where) or "1"
+        params = [param for _, clause_params in self._where for param in clause_params]
+        if self._action == "update":
+            return self._backend.update(self._table, self._values, where, params,
+                                        self._returning == "representation")
+        return self._backend.select(self._table, self._selected, where, params,
+                                    self._order, self._limit, self._count == "exact")
+
+    def _is_clause(self, column: str, value: Any) -> Tuple[str, List[Any]]:
+        column = self._column(column)
+        value = "null" if value is None else str(value).lower()
+        if value == "null":
+            return f"{column} IS NULL", []
+        if value in ("true", "false"):
+            return f"{column} = ?", [value == "true"]
+        raise ValueError(f"Unsupported is_ value: {value}")
+
+    def _logical(self, filters: str, joiner: str) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for term in _split_terms(filters):
+            match = re.fullmatch(r"(not\.)?(and|or)\((.*)\)", term, re.S)
+            if match:
+                sql, term_params = self._logical(match.group(3), " AND " if match.group(2) == "and" else " OR ")
+                negate = bool(match.group(1))
+            else:
+                column, operator, value = _split_condition(term)
+                negate = operator.startswith("not.")
+                operator = operator[4:] if negate else operator
+                if operator == "is":
+                    sql, term_params = self._is_clause(column, value)
+                elif operator in _OPERATORS:
+                    sql, term_params = f"{self._column(column)} {_OPERATORS[operator]} ?", [value]
+                else:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+            clauses.append(f"NOT ({sql})" if negate else f"({sql})")
+            params.extend(term_params)
+        return joiner.join(clauses), params
+
+
+def _split_terms(filters: str) -> List[str]:
+    """Split a logical filter on commas outside quotes and parentheses."""
+    terms, current, depth, quoted, escaped = [], [], 0, False, False
+    for char in filters:
+        if escaped:
+            escaped = False
+        elif char == "\\" and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            terms.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    terms.append("".join(current).strip())
+    return [term for term in terms if term]
+
+
+def _split_condition(term: str) -> Tuple[str, str, str]:
+    """Split ``column.[not.]op.value`` and unquote the value."""
+    column, rest = term.split(".", 1)
+    operator, value = rest.split(".", 1)
+    if operator == "not":
+        negated, value = value.split(".", 1)
+        operator = f"not.{negated}"
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = re.sub(r"\\(.)", r"\1", value[1:-1])
+    return column, operator, value
+
+
+class LocalBucket:
+    """Storage bucket that signs URLs without contacting anything."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _sign(self, path: str, expires_in: int) -> str:
+        expires = int(time.time()) + int(expires_in)
+        return f"{LOCAL_STORAGE_URL}/{self.name}/{path}?token={secrets.token_urlsafe(16)}&expires={expires}"
+
+    def create_signed_url(self, path: str, expires_in: int, options: Optional[Dict] = None) -> Dict:
+        url = self._sign(path, expires_in)
+        return {"signedURL": url, "signedUrl": url}
+
+    def create_signed_urls(self, paths: Sequence[str], expires_in: int, options: Optional[Dict] = None) -> List[Dict]:
+        return [
+            {"path": path, "signedURL": url, "signedUrl": url, "error": None}
+            for path, url in ((path, self._sign(path, expires_in)) for path in paths)
+        ]
+
+
+class LocalStorage:
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(bucket)
+
+
+class LocalBackend:
+    """
+    Supabase-compatible client over one SQLite database.
+
+    A single connection is shared behind a lock, so the backend can be used from
+    request threads; it is meant for benchmarking the dashboard, not for production.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.storage = LocalStorage()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            for table, columns in SCHEMAS.items():
+                definition = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition})")
+                for indexed in INDEXES.get(table, []):
+                    index = f"idx_{table}_{'_'.join(indexed)}"
+                    self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({', '.join(indexed)})")
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def _to_dict(self, table: str, row: sqlite3.Row) -> Dict:
+        schema = SCHEMAS[table]
+        record = dict(row)
+        for name, value in record.items():
+            if value is not None and schema.get(name) == "BOOLEAN":
+                record[name] = bool(value)
+        return record
+
+    def select(self, table: str, columns: List[str], where: str, params: List[Any],
+               order: List[str], limit: Optional[int], count: bool) -> LocalResponse:
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE {where}"
+        if order:
+            sql += f" ORDER BY {', '.join(order)}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = [self._to_dict(table, row) for row in self._conn.execute(sql, params)]
+            total = None
+            if count:
+                total = self._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+        return LocalResponse(rows, total)
+
+    def update(self, table: str, values: Dict, where: str, params: List[Any], returning: bool) -> LocalResponse:
+        touched = TOUCHED_COLUMNS.get(table)
+        if touched and touched not in values:
+            values = dict(values, **{touched: datetime.now(timezone.utc).isoformat()})
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with self._lock, self._conn:
+            rowids = [row[0] for row in self._conn.execute(f"SELECT rowid FROM {table} WHERE {where}", params)]
+            rows = []
+            for start in range(0, len(rowids), _MAX_PARAMS):
+                chunk = rowids[start:start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute(
+                    f"UPDATE {table} SET {assignments} WHERE rowid IN ({placeholders})",
+                    list(values.values()) + chunk
+                )
+                if returning:
+                    rows.extend(
+                        self._to_dict(table, row)
+                        for row in self._conn.execute(f"SELECT * FROM {table} WHERE rowid IN ({placeholders})", chunk)
+                    )
+        return LocalResponse(rows, len(rowids))
+
+    def insert_rows(self, table: str, rows: Iterable[Dict], batch_size: int = 10000) -> int:
+        """
+        Insert rows in batches without holding them all in memory.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        columns = list(SCHEMAS[table])
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        inserted = 0
+        rows = iter(rows)
+        while True:
+            batch = [tuple(row.get(name) for name in columns) for row in itertools.islice(rows, batch_size)]
+            if not batch:
+                return inserted
+            with self._lock, self._conn:
+                self._conn.executemany(sql, batch)
+            inserted += len(batch)
+
+    def is_empty(self) -> bool:
+        """True when no table holds any rows."""
+        with self._lock:
+            return not any(self._conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in SCHEMAS)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _synthetic_files(users: int, transcripts_per_user: int, files_per_transcript: int,
+                     rng: random.Random) -> Iterator[Dict]:
+    names = ("clip.mp4", "short.mp4", "script.md", "captions.json", "thumbnail.png")
+    statuses = ("pending", "pending", "approved", "rejected")
+    for user in range(users):
+        for transcript in range(transcripts_per_user):
+            transcript_id = f"t{user:05d}-{transcript:05d}"
+            for index in range(files_per_transcript):
+                name = f"{index:03d}_{names[index % len(names)]}"
+                status = rng.choice(statuses)
+                yield {
+                    "id": f"{transcript_id}-f{index:04d}",
+                    "user_id": f"user-{user:05d}",
+                    "transcript_id": transcript_id,
+                    "file_name": name,
+                    "bucket": "deliverables",
+                    "file_path": f"{transcript_id}/{name}",
+                    "status": status,
+                    "approved_at": "2025-04-10T12:00:00+00:00" if status == "approved" else None,
+                    "rejected_at": "2025-04-10T12:00:00+00:00" if status == "rejected" else None,
+                    "rejection_reason": "Off brand" if status == "rejected" else None
+                }
+
+
+def _synthetic_videos(users: int, transcripts_per_user: int, videos_per_transcript: int,
+                      rng: random.Random) -> Iterator[Dict]:
+    platforms = ("YouTube", "TikTok", "Instagram", "LinkedIn")
+    start = datetime(2025, 4, 1, tzinfo=timezone.utc)
+    for user in range(users):
+        for transcript in range(transcripts_per_user):
+            transcript_id = f"t{user:05d}-{transcript:05d}"
+            for index in range(videos_per_transcript):
+                outcome = rng.random()
+                video_id = f"{transcript_id}-v{index:04d}"
+                yield {
+                    "id": video_id,
+                    "transcript_id": transcript_id,
+                    "platform": platforms[index % len(platforms)],
+                    "scheduled_at": (start + timedelta(hours=transcript + index)).isoformat(),
+                    "published": outcome < 0.7,
+                    "publish_url": f"https://example.com/watch/{video_id}" if outcome < 0.7 else None,
+                    "manifest_url": f"https://example.com/manifests/{video_id}.txt",
+                    "publish_error": "Upload timed out" if outcome > 0.9 else None,
+                    "updated_at": (start + timedelta(hours=transcript + index)).isoformat()
+                }
+
+
+def seed(
+    backend: LocalBackend,
+    users: int = 10,
+    transcripts_per_user: int = 100,
+    files_per_transcript: int = 10,
+    videos_per_transcript: int = 8,
+    random_seed: int = 0,
+    batch_size: int = 10000
+) -> Dict[str, int]:
+    """
+    Fill the backend with deterministic synthetic data.
+
+    Rows are generated and inserted in batches, so millions of rows can be seeded
+    in constant memory, e.g. ``seed(backend, users=100, transcripts_per_user=1000)``.
+
+    Returns:
+        Dict[str, int]: Rows inserted per table
+    """
+    rng = random.Random(random_seed)
+    return {
+        "transcript_files": backend.insert_rows(
+            "transcript_files", _synthetic_files(users, transcripts_per_user, files_per_transcript, rng), batch_size
+        ),
+        "video_schedule": backend.insert_rows(
+            "video_schedule", _synthetic_videos(users, transcripts_per_user, videos_per_transcript, rng), batch_size
+        )
+    }
+
+
+def is_enabled() -> bool:
+    """True when DASHBOARD_BACKEND selects the local backend."""
+    return os.getenv("DASHBOARD_BACKEND", "supabase").strip().lower() == "local"
+
+
+_backend: Optional[LocalBackend] = None
+_backend_lock = threading.Lock()
+
+def get_local_backend() -> LocalBackend:
+    """
+    Return the process-wide local backend, opening LOCAL_BACKEND_PATH on first use.
+    With LOCAL_BACKEND_SEED set, an empty database is seeded before it is returned.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend = LocalBackend(os.getenv("LOCAL_BACKEND_PATH", ":memory:"))
+                if os.getenv("LOCAL_BACKEND_SEED", "").strip().lower() in ("1", "true", "yes") and backend.is_empty():
+                    seed(backend)
+                _backend = backend
+    return _backend
+
+def reset_local_backend() -> None:
+    """Close and forget the process-wide local backend."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+        _backend = None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``seed <path>`` fills a database file with synthetic rows."""
+    parser = argparse.ArgumentParser(description="Manage the dashboard's local SQLite backend.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seeding = commands.add_parser("seed", help="Fill a database with deterministic synthetic data")
+    seeding.add_argument("path", help="SQLite database file, later passed as LOCAL_BACKEND_PATH")
+    seeding.add_argument("--users", type=int, default=10)
+    seeding.add_argument("--transcripts-per-user", type=int, default=100)
+    seeding.add_argument("--files-per-transcript", type=int, default=10)
+    seeding.add_argument("--videos-per-transcript", type=int, default=8)
+    seeding.add_argument("--random-seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    backend = LocalBackend(args.path)
+    try:
+        counts = seed(backend, users=args.users, transcripts_per_user=args.transcripts_per_user,
+                      files_per_transcript=args.files_per_transcript,
+                      videos_per_transcript=args.videos_per_transcript, random_seed=args.random_seed)
+    finally:
+        backend.close()
+    for table, inserted in counts.items():
+        print(f"Seeded {inserted} rows into {table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,26 @@
-import requests
+"""
+Manifest fetching with pooled keep-alive sessions, conditional requests,
+size-capped streaming downloads, background prefetching and cached markdown rendering.
+"""
+import codecs
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def fetch_manifest_text(manifest_url: str) -> str:
-    """
-    Fetch and return the content of a markdown manifest from a given URL.
-    
-    Args:
-        manifest_url (str): The URL of the manifest to fetch
-        
-    Returns:
-        str: The text content of the manifest
-        
-    Raises:
-        Exception: If the manifest fails to load or returns a non-200 status code
-    """
-    try:
-        # For testing purposes, return mock manifest content
-        if "test123" in manifest_url:
-            return """# Video Publishing Manifest
+from ..utils.metrics import MANIFEST_CACHE
+from ..utils.timing import span
+
+if TYPE_CHECKING:
+    import requests
+
+# Mock manifest served for test URLs
+MOCK_MANIFEST = """# Video Publishing Manifest
 
 ## Platform: YouTube
 - Title: How to Build a Web App
@@ -32,11 +36,381 @@ def fetch_manifest_text(manifest_url: str) -> str:
 - Remember to add timestamps
 - Include links in description
 - Enable captions"""
-            
-        # For real URLs, make the actual request
-        response = requests.get(manifest_url)
+
+logger = logging.getLogger(__name__)
+
+# Default cap on a manifest download (5 MB)
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+
+class ManifestTooLargeError(Exception):
+    """Raised when a manifest download exceeds the configured byte cap"""
+
+
+@dataclass
+class CachedManifest:
+    """A manifest body with the validators needed to revalidate it"""
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+class _LRUCache:
+    """
+    Small thread-safe LRU mapping bounded by entry count and, optionally, by the
+    total size of its values as measured by ``sizeof``.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int = 0, sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        size = self._sizeof(value) if self._sizeof else 0
+        with self._lock:
+            self._bytes -= self._sizes.pop(key, 0)
+            self._data.pop(key, None)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                evicted, _ = self._data.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ManifestFetcher:
+    """
+    Fetches manifests over pooled keep-alive sessions.
+
+    Bodies are streamed in chunks up to ``max_bytes`` and cached with their
+    ETag/Last-Modified validators so repeat fetches become conditional requests.
+    Bodies younger than ``fresh_seconds`` are served without contacting the server,
+    which lets ``prefetch`` warm the cache ahead of a click. Rendered HTML is cached
+    by content hash.
+
+    Cached bodies are bounded by count and by ``max_cached_bytes`` in total. One
+    ``prefetch`` call schedules at most ``max_prefetch`` URLs, and no more than
+    ``max_pending_prefetch`` downloads are ever queued or running.
+    """
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = (3.05, 10),
+        pool_maxsize: int = 10,
+        max_cached_bodies: int = 128,
+        max_cached_bytes: int = 32 * 1024 * 1024,
+        max_rendered: int = 128,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        chunk_size: int = 8192,
+        fresh_seconds: float = 0,
+        prefetch_workers: int = 4,
+        max_prefetch: int = 20,
+        max_pending_prefetch: int = 64,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.fresh_seconds = fresh_seconds
+        self.prefetch_workers = prefetch_workers
+        self.max_prefetch = max_prefetch
+        self.max_pending_prefetch = max_pending_prefetch
+        self._clock = clock
+        self._bodies = _LRUCache(
+            max_cached_bodies, max_cached_bytes, lambda manifest: len(manifest.text.encode("utf-8"))
+        )
+        self._rendered = _LRUCache(max_rendered)
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = set()
+        self._prefetch_lock = threading.Lock()
+
+    def _session(self) -> "requests.Session":
+        """Return this thread's keep-alive session, creating it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            # Imported here so the app starts without loading requests
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_maxsize, pool_maxsize=self.pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def fetch(
+        self,
+        manifest_url: str,
+        max_bytes: Optional[int] = None,
+        read_timeout: Optional[float] = None
+    ) -> str:
+        """
+        Fetch a whole manifest, revalidating any cached copy with a conditional request.
+
+        Raises:
+            ManifestTooLargeError: If the body exceeds the byte cap
+            Exception: If the server returns anything other than 200 or 304
+        """
+        return "".join(self.stream(manifest_url, max_bytes, read_timeout))
+
+    def stream(
+        self,
+        manifest_url: str,
+        max_bytes: Optional[int] = None,
+        read_timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Start a manifest download and return an iterator over its decoded text.
+
+        The request is sent and its status checked before returning, so connection
+        and HTTP errors surface here rather than part way through the body.
+
+        Args:
+            manifest_url: The URL of the manifest to fetch
+            max_bytes: Byte cap for the body (defaults to ``self.max_bytes``)
+            read_timeout: Seconds to wait between received bytes (defaults to ``self.timeout``)
+
+        Raises:
+            Exception: If the server returns anything other than 200 or 304
+        """
+        cached = self._bodies.get(manifest_url)
+        if self._is_fresh(cached):
+            MANIFEST_CACHE.labels("body", "hit").inc()
+            return iter([cached.text])
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        timeout = (self.timeout[0], read_timeout) if read_timeout else self.timeout
+        response = self._session().get(manifest_url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            MANIFEST_CACHE.labels("body", "revalidated").inc()
+            return iter([cached.text])
         if response.status_code != 200:
+            response.close()
             raise Exception(f"Failed to load manifest: {response.status_code}")
-        return response.text
+
+        MANIFEST_CACHE.labels("body", "miss").inc()
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        return self._iter_body(manifest_url, response, limit)
+
+    def _iter_body(self, manifest_url: str, response: "requests.Response", max_bytes: int) -> Iterator[str]:
+        """Decode a streamed body chunk by chunk, caching it once fully received."""
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        parts = []
+        received = 0
+        try:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                received += len(chunk)
+                if max_bytes and received > max_bytes:
+                    raise ManifestTooLargeError(f"Manifest exceeds the {max_bytes} byte limit")
+                text = decoder.decode(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                parts.append(tail)
+                yield tail
+
+            self._bodies.set(manifest_url, CachedManifest(
+                text="".join(parts),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                fetched_at=self._clock()
+            ))
+        finally:
+            response.close()
+
+    def _is_fresh(self, cached: Optional[CachedManifest]) -> bool:
+        """Whether a cached body can be served without revalidation."""
+        return (
+            cached is not None
+            and self.fresh_seconds > 0
+            and self._clock() - cached.fetched_at < self.fresh_seconds
+        )
+
+    def prefetch(
+        self,
+        manifest_urls: Iterable[str],
+        max_bytes: Optional[int] = None,
+        read_timeout: Optional[float] = None
+    ) -> List[Future]:
+        """
+        Fetch manifests into the cache in the background.
+
+        At most ``prefetch_workers`` downloads run at once. URLs that are already
+        fresh in the cache or currently being prefetched are skipped. Only the first
+        ``max_prefetch`` remaining URLs are scheduled, and none once
+        ``max_pending_prefetch`` downloads are outstanding.
+
+        Returns:
+            List[Future]: One future per download that was scheduled
+        """
+        futures = []
+        with self._prefetch_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.prefetch_workers,
+                    thread_name_prefix="manifest-prefetch"
+                )
+            for url in dict.fromkeys(manifest_urls):
+                if len(futures) >= self.max_prefetch or len(self._in_flight) >= self.max_pending_prefetch:
+                    break
+                if url in self._in_flight or self._is_fresh(self._bodies.get(url)):
+                    continue
+                self._in_flight.add(url)
+                futures.append(self._executor.submit(self._prefetch_one, url, max_bytes, read_timeout))
+        return futures
+
+    def _prefetch_one(self, manifest_url: str, max_bytes: Optional[int], read_timeout: Optional[float]) -> None:
+        try:
+            self.fetch(manifest_url, max_bytes, read_timeout)
+        except Exception as e:
+            logger.warning(f"Manifest prefetch failed for {manifest_url}: {str(e)}")
+        finally:
+            with self._prefetch_lock:
+                self._in_flight.discard(manifest_url)
+
+    def render_markdown(self, content: str) -> str:
+        """Convert markdown to HTML, reusing earlier renders of identical content."""
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        html = self._rendered.get(key)
+        if html is not None:
+            MANIFEST_CACHE.labels("rendered", "hit").inc()
+            return html
+
+        MANIFEST_CACHE.labels("rendered", "miss").inc()
+        import markdown
+        with span("markdown"):
+            html = markdown.markdown(content)
+        self._rendered.set(key, html)
+        return html
+
+    def clear(self) -> None:
+        """Drop all cached bodies and rendered HTML."""
+        self._bodies.clear()
+        self._rendered.clear()
+
+
+# Shared fetcher used by the Flask views
+manifest_fetcher = ManifestFetcher(
+    fresh_seconds=float(os.getenv("MANIFEST_FRESH_SECONDS", "60")),
+    prefetch_workers=int(os.getenv("MANIFEST_PREFETCH_WORKERS", "4")),
+    max_cached_bytes=int(os.getenv("MANIFEST_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    max_prefetch=int(os.getenv("MANIFEST_PREFETCH_LIMIT", "20"))
+)
+
+
+def fetch_manifest_text(
+    manifest_url: str,
+    max_bytes: Optional[int] = None,
+    read_timeout: Optional[float] = None
+) -> str:
+    """
+    Fetch and return the content of a markdown manifest from a given URL.
+
+    Args:
+        manifest_url (str): The URL of the manifest to fetch
+        max_bytes (Optional[int]): Byte cap for the download
+        read_timeout (Optional[float]): Seconds to wait between received bytes
+
+    Returns:
+        str: The text content of the manifest
+
+    Raises:
+        Exception: If the manifest fails to load, is too large or returns a non-200 status code
+    """
+    try:
+        # For testing purposes, return mock manifest content
+        if "test123" in manifest_url:
+            return MOCK_MANIFEST
+
+        # For real URLs, make a (conditional) request over the pooled session
+        with span("manifest_fetch"):
+            return manifest_fetcher.fetch(manifest_url, max_bytes, read_timeout)
     except Exception as e:
         raise Exception(f"Failed to fetch manifest: {str(e)}")
+
+
+def stream_manifest_text(
+    manifest_url: str,
+    max_bytes: Optional[int] = None,
+    read_timeout: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Start fetching a manifest and return an iterator over its text chunks.
+
+    Raises:
+        Exception: If the manifest cannot be requested or returns a non-200 status code.
+            Errors after the body has started (such as ManifestTooLargeError) are
+            raised by the iterator.
+    """
+    try:
+        if "test123" in manifest_url:
+            return iter([MOCK_MANIFEST])
+        with span("manifest_fetch"):
+            return manifest_fetcher.stream(manifest_url, max_bytes, read_timeout)
+    except Exception as e:
+        raise Exception(f"Failed to fetch manifest: {str(e)}")
+
+
+def prefetch_manifests(
+    manifest_urls: Iterable[Optional[str]],
+    max_bytes: Optional[int] = None,
+    read_timeout: Optional[float] = None
+) -> List[Future]:
+    """
+    Warm the manifest cache for the given URLs without blocking the caller.
+
+    Empty values and test URLs (which are served from mock content) are ignored.
+    """
+    urls = [url for url in manifest_urls if url and "test123" not in url]
+    if not urls:
+        return []
+    return manifest_fetcher.prefetch(urls, max_bytes, read_timeout)
+
+
+def render_manifest_html(content: str) -> str:
+    """
+    Render markdown manifest content to HTML, cached by content hash.
+    """
+    return manifest_fetcher.render_markdown(content)
@@ -0,0 +1,212 @@
+"""
+Per-transcript TTL cache for video schedule records and rendered dashboard pages,
+and a content-addressed cache of rendered page fragments.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.metrics import FRAGMENT_CACHE
+
+# (transcript_id, variant)
+PageKey = Tuple[str, str]
+
+
+@dataclass
+class CachedPage:
+    """A rendered dashboard page together with the records it was built from"""
+    records: List[Dict]
+    html: str
+    etag: str
+    expires_at: float
+
+
+class TranscriptPageCache:
+    """
+    Thread-safe LRU cache of dashboard pages keyed by transcript ID and variant.
+
+    Each transcript can hold several variants (filter and page combinations), all
+    of which are dropped together on invalidation. Entries expire after
+    ``ttl_seconds``; a TTL of zero or less disables caching. At most
+    ``max_entries`` pages are kept across all transcripts and variants, and
+    expired pages are swept whenever a page is stored.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[PageKey, CachedPage]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation, used to discard pages rendered from stale data."""
+        return self._generation
+
+    @staticmethod
+    def make_etag(html: str) -> str:
+        """Build a strong ETag value from the rendered page."""
+        return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, transcript_id: str, variant: str = "") -> Optional[CachedPage]:
+        """
+        Return the cached page for a transcript, or None if missing or expired.
+        """
+        key = (transcript_id, variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        transcript_id: str,
+        records: List[Dict],
+        html: str,
+        variant: str = "",
+        generation: Optional[int] = None
+    ) -> CachedPage:
+        """
+        Store the records and rendered page for a transcript (and optional variant).
+
+        If ``generation`` is given and an invalidation happened since it was read,
+        the page is not stored.
+
+        Returns:
+            CachedPage: The new entry (not stored when caching is disabled)
+        """
+        now = self._clock()
+        entry = CachedPage(
+            records=records,
+            html=html,
+            etag=self.make_etag(html),
+            expires_at=now + self.ttl_seconds
+        )
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return entry
+        key = (transcript_id, variant)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return entry
+            for expired in [k for k, cached in self._entries.items() if cached.expires_at <= now]:
+                del self._entries[expired]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, transcript_id: str) -> bool:
+        """Drop every cached page for a transcript. Returns True if any were cached."""
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._entries if key[0] == transcript_id]
+            for key in keys:
+                del self._entries[key]
+        return bool(keys)
+
+    def invalidate_video(self, video_id: str) -> List[str]:
+        """
+        Drop every cached transcript page that contains the given video record.
+
+        Returns:
+            List[str]: The transcript IDs that were invalidated
+        """
+        with self._lock:
+            self._generation += 1
+            affected = list(dict.fromkeys(
+                transcript_id
+                for (transcript_id, _), entry in self._entries.items()
+                if any(str(record.get("id")) == str(video_id) for record in entry.records)
+            ))
+            for key in [key for key in self._entries if key[0] in affected]:
+                del self._entries[key]
+        return affected
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def fragment_key(template: str, **context: Any) -> str:
+    """
+    Digest a fragment's template name and context. Equal keys render equal HTML, so
+    a changed record gets a new key and nothing needs invalidating.
+    """
+    payload = json.dumps([template, context], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    """
+    Thread-safe LRU cache of rendered HTML fragments keyed by content digest.
+
+    Entries never go stale, since a key covers everything the fragment was rendered
+    from; the least recently used are evicted beyond ``max_entries`` (zero or less
+    disables caching).
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, template: str, render: Callable[..., str], **context: Any) -> str:
+        """
+        Return the cached fragment for a template and context, rendering it on a miss.
+
+        Args:
+            template: Name of the fragment's template, part of the key
+            render: Called with ``template`` and the context to render a miss
+            **context: Values the fragment is rendered from; must be JSON-serializable
+                (other values are keyed by their ``str``)
+        """
+        key = fragment_key(template, **context)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+        if html is not None:
+            FRAGMENT_CACHE.labels("hit").inc()
+            return html
+
+        FRAGMENT_CACHE.labels("miss").inc()
+        html = render(template, **context)
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = html
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return html
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached fragments."""
+        with self._lock:
+            self._entries.clear()
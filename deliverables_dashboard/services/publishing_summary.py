@@ -0,0 +1,319 @@
+"""
+Materialized publishing summary across every transcript.
+
+Published, scheduled and failed counts are kept in memory per transcript and
+platform, with fleet-wide totals per platform maintained alongside. The first
+refresh counts the whole schedule once. Later refreshes read only the rows whose
+``updated_at`` is at or after the last watermark (less a small overlap for late
+commits) and recount just the transcripts those rows belong to, so reading the
+overview needs no query and a refresh with nothing to do is one empty page.
+
+``video_schedule.updated_at`` must be kept current by the database, e.g.::
+
+    create extension if not exists moddatetime;
+    alter table video_schedule add column if not exists updated_at timestamptz default now();
+    create trigger video_schedule_updated_at before update on video_schedule
+        for each row execute procedure moddatetime (updated_at);
+
+A deleted row is only noticed when another row of its transcript changes, or at
+the periodic full rebuild.
+
+Requests never wait for a refresh: ``start_refresh`` runs it on a background
+thread while readers keep getting the current snapshot, which reports
+``building`` until the first full count has finished.
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from ..supabase_client import supabase
+from ..utils.metrics import observe_supabase
+from ..utils.resilience import supabase_calls
+from ..utils.timing import span
+from . import keyset
+
+logger = logging.getLogger(__name__)
+
+# Outcomes counted for every schedule row, matching video_schedule.STATUS_FILTERS
+STATUSES = ("published", "scheduled", "failed")
+
+SUMMARY_COLUMNS = "id,transcript_id,platform,published,publish_error,updated_at"
+
+# platform -> status -> count
+PlatformCounts = Dict[str, Dict[str, int]]
+
+
+def classify(record: Dict) -> str:
+    """Return the publishing outcome of a schedule row."""
+    if record.get("published"):
+        return "published"
+    if record.get("publish_error"):
+        return "failed"
+    return "scheduled"
+
+
+def _empty() -> Dict[str, int]:
+    return {status: 0 for status in STATUSES}
+
+
+def _count(counts: Dict[str, PlatformCounts], record: Dict) -> None:
+    platforms = counts.setdefault(record.get("transcript_id"), {})
+    platforms.setdefault(record.get("platform") or "unknown", _empty())[classify(record)] += 1
+
+
+def _merge(totals: PlatformCounts, platforms: PlatformCounts, sign: int) -> None:
+    for platform, counts in platforms.items():
+        target = totals.setdefault(platform, _empty())
+        for status, value in counts.items():
+            target[status] += sign * value
+        if not any(target.values()):
+            del totals[platform]
+
+
+def _transcript_totals(platforms: PlatformCounts) -> Dict[str, int]:
+    return {status: sum(counts[status] for counts in platforms.values()) for status in STATUSES}
+
+
+def _parse(timestamp: str) -> datetime:
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class PublishingSummary:
+    """
+    In-memory publishing counters across transcripts, refreshed incrementally.
+
+    Args:
+        refresh_seconds: Minimum time between incremental refreshes
+        overlap_seconds: How far before the watermark changed rows are re-read
+        rebuild_seconds: Time after which a refresh recounts everything
+        page_size: Rows read per query
+        recount_batch: Transcripts recounted per query
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 15.0,
+        overlap_seconds: float = 5.0,
+        rebuild_seconds: float = 3600.0,
+        page_size: int = 1000,
+        recount_batch: int = 100,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.overlap_seconds = overlap_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.page_size = page_size
+        self.recount_batch = recount_batch
+        self._clock = clock
+        self._counts: Dict[str, PlatformCounts] = {}
+        self._totals: PlatformCounts = {}
+        # transcript_id -> failed uploads, for transcripts with any
+        self._failing: Dict[str, int] = {}
+        self._watermark: Optional[datetime] = None
+        self._built_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+        self._refreshed_wall: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Bring the counters up to date if a refresh is due.
+
+        Only one thread refreshes at a time; once the summary has been built, others
+        carry on with the current counters instead of waiting.
+
+        Returns:
+            int: Number of transcripts counted or recounted
+
+        Raises:
+            Exception: If a query fails; the previous counters are kept
+        """
+        if not force and not self._due():
+            return 0
+        if not self._refresh_lock.acquire(blocking=not self.is_built):
+            return 0
+        try:
+            if not force and not self._due():
+                return 0
+            if self._watermark is None or self._clock() - self._built_at >= self.rebuild_seconds:
+                return self._rebuild()
+            return self._apply_changes()
+        finally:
+            self._refresh_lock.release()
+
+    def start_refresh(self) -> bool:
+        """
+        Start a refresh on a background thread if one is due and none is running.
+
+        A failure is logged and reported in the snapshot's ``error``; the previous
+        counters are kept.
+
+        Returns:
+            bool: True if a refresh was started
+        """
+        with self._lock:
+            if not self._due() or (self._worker is not None and self._worker.is_alive()):
+                return False
+            self._worker = threading.Thread(target=self._refresh_in_background,
+                                            name="publishing-summary", daemon=True)
+            self._worker.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background refresh, if one is running."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def snapshot(self, attention_limit: int = 20) -> Dict:
+        """
+        Return fleet-wide counts per platform, overall totals, and the transcripts
+        with the most failed uploads.
+        """
+        with self._lock:
+            platforms = {platform: dict(counts) for platform, counts in sorted(self._totals.items())}
+            worst = heapq.nlargest(attention_limit, self._failing.items(), key=lambda item: (item[1], item[0]))
+            failing = [(transcript_id, _transcript_totals(self._counts[transcript_id])) for transcript_id, _ in worst]
+            transcripts = len(self._counts)
+            watermark, refreshed_at = self._watermark, self._refreshed_wall
+            building, error = not self.is_built, self._last_error
+
+        totals = _empty()
+        for counts in platforms.values():
+            for status in STATUSES:
+                totals[status] += counts[status]
+        return {
+            "platforms": platforms,
+            "totals": totals,
+            "transcripts": transcripts,
+            "needs_attention": [dict(counts, transcript_id=transcript_id) for transcript_id, counts in failing],
+            "watermark": watermark.isoformat() if watermark else None,
+            "refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
+            "building": building,
+            "error": error
+        }
+
+    def clear(self) -> None:
+        """Forget every counter; the next refresh rebuilds from scratch."""
+        self.wait()
+        with self._refresh_lock, self._lock:
+            self._counts, self._totals, self._failing = {}, {}, {}
+            self._watermark = self._built_at = self._refreshed_at = self._refreshed_wall = None
+            self._last_error = None
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Publishing summary refresh failed: {str(e)}")
+            self._last_error = str(e)
+        else:
+            self._last_error = None
+
+    def _due(self) -> bool:
+        return self._refreshed_at is None or self._clock() - self._refreshed_at >= self.refresh_seconds
+
+    def _rebuild(self) -> int:
+        # Read the watermark first so changes made during the scan are picked up next time
+        watermark = self._latest_update()
+        counts: Dict[str, PlatformCounts] = {}
+        for page in self._scan(lambda query: query, "transcript_id", "id"):
+            for record in page:
+                _count(counts, record)
+        totals: PlatformCounts = {}
+        failing: Dict[str, int] = {}
+        for transcript_id, platforms in counts.items():
+            _merge(totals, platforms, 1)
+            failed = _transcript_totals(platforms)["failed"]
+            if failed:
+                failing[transcript_id] = failed
+        with self._lock:
+            self._counts, self._totals, self._failing = counts, totals, failing
+            self._watermark = watermark or datetime.now(timezone.utc)
+            self._built_at = self._clock()
+            self._mark_refreshed()
+        return len(counts)
+
+    def _apply_changes(self) -> int:
+        since = (self._watermark - timedelta(seconds=self.overlap_seconds)).isoformat()
+        newest = self._watermark
+        changed: Set[str] = set()
+        for page in self._scan(lambda query: query.gte("updated_at", since), "updated_at", "id"):
+            for record in page:
+                changed.add(record.get("transcript_id"))
+                newest = max(newest, _parse(record["updated_at"]))
+
+        fresh: Dict[str, PlatformCounts] = {}
+        ordered = sorted(changed)
+        for start in range(0, len(ordered), self.recount_batch):
+            batch = ordered[start:start + self.recount_batch]
+            for page in self._scan(lambda query: query.in_("transcript_id", batch), "transcript_id", "id"):
+                for record in page:
+                    _count(fresh, record)
+
+        with self._lock:
+            for transcript_id in changed:
+                _merge(self._totals, self._counts.pop(transcript_id, {}), -1)
+                self._failing.pop(transcript_id, None)
+                if transcript_id in fresh:
+                    self._counts[transcript_id] = fresh[transcript_id]
+                    _merge(self._totals, fresh[transcript_id], 1)
+                    failed = _transcript_totals(fresh[transcript_id])["failed"]
+                    if failed:
+                        self._failing[transcript_id] = failed
+            self._watermark = newest
+            self._mark_refreshed()
+        return len(changed)
+
+    def _mark_refreshed(self) -> None:
+        self._refreshed_at = self._clock()
+        self._refreshed_wall = datetime.now(timezone.utc)
+
+    def _latest_update(self) -> Optional[datetime]:
+        query = (supabase.table("video_schedule")
+                 .select("updated_at")
+                 .not_.is_("updated_at", "null")
+                 .order("updated_at", desc=True)
+                 .limit(1))
+        rows = self._execute(query)
+        return _parse(rows[0]["updated_at"]) if rows else None
+
+    def _scan(self, narrow: Callable, first: str, second: str) -> Iterator[List[Dict]]:
+        """Yield every row matching ``narrow`` in keyset pages ordered by (first, second)."""
+        after = None
+        while True:
+            query = narrow(supabase.table("video_schedule").select(SUMMARY_COLUMNS))
+            if after:
+                query = query.or_(keyset.after_filter(first, second, after))
+            rows = self._execute(query.order(first).order(second).limit(self.page_size))
+            if rows:
+                yield rows
+            if len(rows) < self.page_size:
+                return
+            after = (rows[-1][first], rows[-1][second])
+
+    @staticmethod
+    def _execute(query) -> List[Dict]:
+        with span("supabase"), observe_supabase("video_schedule", "select"):
+            response = supabase_calls.read("video_schedule:select", query.execute)
+        return response.data or []
+
+
+# Summary shared by the overview routes
+publishing_summary = PublishingSummary(
+    refresh_seconds=float(os.getenv("PUBLISHING_SUMMARY_REFRESH", "15")),
+    rebuild_seconds=float(os.getenv("PUBLISHING_SUMMARY_REBUILD", "3600"))
+)
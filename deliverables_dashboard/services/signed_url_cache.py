@@ -0,0 +1,167 @@
+"""
+Expiry-aware cache for Supabase Storage signed URLs.
+
+A signed URL is reused until ``safety_margin`` seconds before it expires. Entries
+live in a pluggable backend: the default is a bounded in-process LRU, and
+``KeyValueBackend`` shares entries between workers through any client with
+Redis-style ``get``/``set(..., ex=...)``/``delete`` methods.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+# (bucket, path, expiry_seconds)
+CacheKey = Tuple[str, str, int]
+
+
+class SignedUrlBackend:
+    """Storage for cached URLs. Values are (url, expires_at) with expires_at in epoch seconds."""
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        raise NotImplementedError
+
+    def set(self, key: CacheKey, url: str, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: CacheKey) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBackend(SignedUrlBackend):
+    """
+    Thread-safe LRU bounded by entry count and by the total size of the stored URLs.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(key: CacheKey, url: str) -> int:
+        return len(key[0]) + len(key[1]) + len(url)
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: CacheKey, url: str, expires_at: float) -> None:
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (url, expires_at)
+            self._bytes += self._size(key, url)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._bytes -= self._size(key, value[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class KeyValueBackend(SignedUrlBackend):
+    """
+    Shared backend on top of an external key-value store such as Redis.
+
+    Entries are written with a store-side TTL so they disappear once expired.
+    """
+
+    def __init__(self, client: Any, prefix: str = "signed-url:", clock: Callable[[], float] = time.time):
+        self.client = client
+        self.prefix = prefix
+        self._clock = clock
+
+    def _key(self, key: CacheKey) -> str:
+        bucket, path, expiry = key
+        return f"{self.prefix}{bucket}:{expiry}:{path}"
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        return value["url"], value["expires_at"]
+
+    def set(self, key: CacheKey, url: str, expires_at: float) -> None:
+        ttl = int(expires_at - self._clock())
+        if ttl > 0:
+            self.client.set(self._key(key), json.dumps({"url": url, "expires_at": expires_at}), ex=ttl)
+
+    def delete(self, key: CacheKey) -> None:
+        self.client.delete(self._key(key))
+
+    def clear(self) -> None:
+        """Shared entries expire on their own; clearing them all is left to the store."""
+
+
+class SignedUrlCache:
+    """Reuses signed URLs until a safety margin before they expire."""
+
+    def __init__(
+        self,
+        backend: Optional[SignedUrlBackend] = None,
+        safety_margin: float = 300,
+        clock: Callable[[], float] = time.time
+    ):
+        self.backend = backend or InMemoryBackend()
+        self.safety_margin = safety_margin
+        self._clock = clock
+
+    def get(self, bucket: str, path: str, expiry_seconds: int) -> Optional[str]:
+        """Return a cached URL that stays valid beyond the safety margin, or None."""
+        key = (bucket, path, expiry_seconds)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"Signed URL cache lookup failed for {bucket}/{path}: {str(e)}")
+            return None
+        if value is None:
+            return None
+        url, expires_at = value
+        if expires_at - self.safety_margin <= self._clock():
+            return None
+        return url
+
+    def set(self, bucket: str, path: str, expiry_seconds: int, url: str, signed_at: Optional[float] = None) -> None:
+        """Remember a URL signed at ``signed_at`` (defaults to now) for ``expiry_seconds``."""
+        if expiry_seconds <= self.safety_margin:
+            return
+        expires_at = (self._clock() if signed_at is None else signed_at) + expiry_seconds
+        try:
+            self.backend.set((bucket, path, expiry_seconds), url, expires_at)
+        except Exception as e:
+            print(f"Signed URL cache store failed for {bucket}/{path}: {str(e)}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+# Cache shared by supabase_service; swap ``backend`` for a KeyValueBackend to share across workers
+signed_url_cache = SignedUrlCache(
+    backend=InMemoryBackend(max_entries=int(os.getenv("SIGNED_URL_CACHE_MAX_ENTRIES", "10000"))),
+    safety_margin=float(os.getenv("SIGNED_URL_SAFETY_MARGIN", "300"))
+)
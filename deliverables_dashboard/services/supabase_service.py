@@ -2,105 +2,459 @@
 Supabase service configuration and initialization.
 """
 import os
-from supabase import create_client
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timezone
 
+from ..supabase_client import SUPABASE_TIMEOUT, build_client
+from ..utils.metrics import observe_supabase
+from ..utils.resilience import supabase_calls
+from ..utils.singleflight import copy_rows, supabase_reads
+from . import keyset
+from .file_cache import user_file_cache
+from .signed_url_cache import signed_url_cache
+from .update_buffer import status_updates
+
+# Paths signed per bulk storage request, and threads used when bulk signing is unavailable
+SIGNED_URL_BATCH_SIZE = 100
+SIGNED_URL_FALLBACK_WORKERS = 8
+
+# Columns the dashboard listing needs; avoids shipping every column of transcript_files
+FILE_LIST_COLUMNS = (
+    "id,user_id,transcript_id,file_name,bucket,file_path,"
+    "status,approved_at,rejected_at,rejection_reason"
+)
+
+# Rows fetched per keyset page of transcript files
+FILE_PAGE_SIZE = int(os.getenv("FILE_PAGE_SIZE", "500"))
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
 def get_supabase_client():
-    """Get configured Supabase client, checking environment variables."""
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if not url or not key:
-        raise EnvironmentError(
-            "Missing required environment variables: SUPABASE_URL and/or SUPABASE_SERVICE_ROLE_KEY"
-        )
-    
-    return create_client(url, key)
-
-def fetch_user_files(user_id: str, transcript_id: Optional[str] = None) -> List[Dict]:
     """
-    Fetch transcript files metadata for a specific user from Supabase.
+    Get the process-wide Supabase client, creating it on first use.
+
+    The client (and its connection pool) is shared by all threads. A forked worker
+    builds its own client instead of reusing the parent's sockets.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            from . import local_backend
+            if local_backend.is_enabled():
+                _client = local_backend.get_local_backend()
+                _client_pid = pid
+                return _client
+
+            url = os.getenv("SUPABASE_URL")
+            key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+            
+            if not url or not key:
+                raise EnvironmentError(
+                    "Missing required environment variables: SUPABASE_URL and/or SUPABASE_SERVICE_ROLE_KEY"
+                )
+            
+            _client = build_client(url, key)
+            _client_pid = pid
+    return _client
+
+def reset_supabase_client() -> None:
+    """Forget the shared client so the next call builds a fresh one."""
+    global _client, _client_pid, _client_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+# A child process must not share the parent's pooled sockets or a lock held mid-fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_supabase_client)
+
+def _status_list(status: Optional[Union[str, Sequence[str]]]) -> List[str]:
+    return [status] if isinstance(status, str) else list(status or [])
+
+def _user_files_query(supabase, user_id: str, transcript_id: Optional[str], statuses: List[str],
+                      columns: str, after: Optional[Tuple[str, str]], limit: int):
+    """Build the keyset page query for one page of a user's transcript files."""
+    query = supabase.table("transcript_files").select(columns).eq("user_id", user_id)
+
+    if transcript_id:
+        query = query.eq("transcript_id", transcript_id)
+    if len(statuses) == 1:
+        query = query.eq("status", statuses[0])
+    elif statuses:
+        query = query.in_("status", statuses)
+    if after:
+        query = query.or_(keyset.after_filter("transcript_id", "id", after))
+
+    # One extra row tells us whether another page follows
+    return query.order("transcript_id").order("id").limit(limit + 1)
+
+def _split_file_page(rows: List[Dict], limit: int) -> Tuple[List[Dict], Optional[Tuple[str, str]]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last["transcript_id"], last["id"])
+    return rows, None
+
+def fetch_user_files_page(
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    status: Optional[Union[str, Sequence[str]]] = None,
+    columns: str = FILE_LIST_COLUMNS,
+    after: Optional[Tuple[str, str]] = None,
+    limit: int = FILE_PAGE_SIZE
+) -> Tuple[List[Dict], Optional[Tuple[str, str]]]:
+    """
+    Fetch one page of a user's transcript files, ordered by (transcript_id, id).
+
+    Args:
+        user_id: Owner of the files
+        transcript_id: Optional transcript filter
+        status: Optional status, or list of statuses, to filter on in the database
+        columns: Columns to select; must include transcript_id and id
+        after: (transcript_id, id) of the last row of the previous page
+        limit: Maximum rows to return
+
+    Returns:
+        Tuple[List[Dict], Optional[Tuple[str, str]]]: The rows and the key to pass as
+        ``after`` for the next page, or None on the last page
+
+    Raises:
+        Exception: If the query fails
     """
+    statuses = _status_list(status)
+
+    def run_query() -> List[Dict]:
+        query = _user_files_query(get_supabase_client(), user_id, transcript_id, statuses, columns, after, limit)
+        with observe_supabase("transcript_files", "select"):
+            result = supabase_calls.read("transcript_files:select", query.execute)
+        return (result.data if result else None) or []
+
     try:
-        supabase = get_supabase_client()
-        query = supabase.table("transcript_files").select("*").eq("user_id", user_id)
-        
-        if transcript_id:
-            query = query.eq("transcript_id", transcript_id)
+        # Concurrent requests for the same page share one query
+        key = ("transcript_files", user_id, transcript_id, tuple(statuses), columns, after, limit)
+        return _split_file_page(supabase_reads.do(key, run_query, share=copy_rows), limit)
 
-        result = query.execute()
-        return result.data if result else []
-        
     except Exception as e:
         print(f"Error fetching transcript files: {str(e)}")
         raise Exception(f"Failed to fetch transcript files for user {user_id}") from e
 
+def _cached_listing(user_id: str, transcript_id: Optional[str],
+                    status: Optional[Union[str, Sequence[str]]], columns: str,
+                    stale: bool = False) -> Optional[List[Dict]]:
+    """Return a cached listing with the status filter applied, or None on a miss."""
+    if columns != FILE_LIST_COLUMNS:
+        return None
+    if stale:
+        cached = user_file_cache.get_stale(user_id, transcript_id)
+    else:
+        cached = user_file_cache.get(user_id, transcript_id)
+    statuses = _status_list(status)
+    if cached is not None and statuses:
+        cached = [row for row in cached if row.get("status") in statuses]
+    return cached
+
+def iter_user_file_pages(
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    status: Optional[Union[str, Sequence[str]]] = None,
+    columns: str = FILE_LIST_COLUMNS,
+    page_size: int = FILE_PAGE_SIZE
+) -> Iterator[List[Dict]]:
+    """
+    Yield a user's transcript files one keyset page at a time.
+
+    Listings with the default columns are read through user_file_cache: a cached
+    listing is served from memory (status filters applied there), and a complete
+    unfiltered read is stored for the next caller. If the first page cannot be read
+    (the backend is failing or its circuit is open), an expired cached listing is
+    served instead when there is one.
+    """
+    cached = _cached_listing(user_id, transcript_id, status, columns)
+    if cached is not None:
+        for start in range(0, len(cached), page_size):
+            yield cached[start:start + page_size]
+        return
+
+    generation = user_file_cache.generation
+    # Copies, since callers annotate the rows they are given
+    collected: Optional[List[Dict]] = [] if columns == FILE_LIST_COLUMNS and not status else None
+    after = None
+    while True:
+        try:
+            rows, after = fetch_user_files_page(
+                user_id, transcript_id, status=status, columns=columns, after=after, limit=page_size
+            )
+        except Exception:
+            stale = None if after is not None else _cached_listing(user_id, transcript_id, status, columns, True)
+            if stale is None:
+                raise
+            print(f"Serving stale transcript files for user {user_id}")
+            supabase_calls.record_fallback("transcript_files:select")
+            for start in range(0, len(stale), page_size):
+                yield stale[start:start + page_size]
+            return
+        if collected is not None:
+            collected.extend(dict(row) for row in rows)
+        if rows:
+            yield rows
+        if after is None:
+            break
+    if collected is not None:
+        user_file_cache.set(user_id, transcript_id, collected, generation)
+
+def fetch_user_files(
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    status: Optional[Union[str, Sequence[str]]] = None,
+    columns: str = FILE_LIST_COLUMNS
+) -> List[Dict]:
+    """
+    Fetch transcript files metadata for a specific user from Supabase.
+    """
+    return [
+        row
+        for page in iter_user_file_pages(user_id, transcript_id, status=status, columns=columns)
+        for row in page
+    ]
+
+def _cache_signed_url(result: Dict, bucket: str, path: str, expiry_seconds: int, signed_at: float) -> str:
+    """Check a create_signed_url result and remember the URL it returned."""
+    if result.get('error'):
+        raise Exception(result['error']['message'])
+        
+    signed_url = result.get('signedURL')
+    if not signed_url:
+        raise Exception(f"Failed to generate signed URL for {bucket}/{path}")
+        
+    signed_url_cache.set(bucket, path, expiry_seconds, signed_url, signed_at)
+    return signed_url
+
 def get_signed_url(bucket: str, path: str, expiry_seconds: int = 3600) -> str:
     """
     Generate a signed URL for secure access to a file in Supabase Storage.
+    Reuses a cached URL while it has more than the cache's safety margin left.
     """
+    cached = signed_url_cache.get(bucket, path, expiry_seconds)
+    if cached:
+        return cached
+
     try:
         supabase = get_supabase_client()
-        result = supabase.storage.from_(bucket).create_signed_url(path, expiry_seconds)
+        signed_at = time.time()
+        with observe_supabase(f"storage:{bucket}", "create_signed_url"):
+            result = supabase_calls.read(
+                f"storage:{bucket}:create_signed_url",
+                lambda: supabase.storage.from_(bucket).create_signed_url(path, expiry_seconds)
+            )
         
-        if result.get('error'):
-            raise Exception(result['error']['message'])
-            
-        signed_url = result.get('signedURL')
-        if not signed_url:
-            raise Exception(f"Failed to generate signed URL for {bucket}/{path}")
-            
-        return signed_url
+        return _cache_signed_url(result, bucket, path, expiry_seconds, signed_at)
         
     except Exception as e:
         print(f"Error generating signed URL for {bucket}/{path}: {str(e)}")
         raise Exception(f"Failed to generate signed URL for file {path} in bucket {bucket}") from e
 
+def _sign_bucket_batch(bucket: str, paths: List[str], expiry_seconds: int) -> Dict[str, str]:
+    """
+    Sign a batch of paths in one storage call. Paths the call could not sign are left out.
+    """
+    supabase = get_supabase_client()
+    signed_at = time.time()
+    try:
+        with observe_supabase(f"storage:{bucket}", "create_signed_urls"):
+            results = supabase_calls.read(
+                f"storage:{bucket}:create_signed_urls",
+                lambda: supabase.storage.from_(bucket).create_signed_urls(paths, expiry_seconds)
+            )
+    except Exception as e:
+        print(f"Bulk signing failed for bucket {bucket}, falling back to single requests: {str(e)}")
+        return {}
+
+    signed = {}
+    for item in results or []:
+        if isinstance(item, dict) and not item.get('error') and item.get('signedURL'):
+            signed[item.get('path')] = item['signedURL']
+            signed_url_cache.set(bucket, item.get('path'), expiry_seconds, item['signedURL'], signed_at)
+    return signed
+
+def get_signed_urls(
+    files: Iterable[Tuple[str, str]],
+    expiry_seconds: int = 3600
+) -> Dict[Tuple[str, str], str]:
+    """
+    Generate signed URLs for many files with as few storage round trips as possible.
+
+    URLs still valid in the signed URL cache are reused. The rest are grouped by
+    bucket and signed with the storage bulk signing call, in batches of
+    SIGNED_URL_BATCH_SIZE. Anything the bulk call does not return is signed
+    individually on a bounded thread pool.
+
+    Args:
+        files: (bucket, path) pairs to sign
+        expiry_seconds: Lifetime of each URL
+
+    Returns:
+        Dict[Tuple[str, str], str]: Signed URL for each (bucket, path)
+
+    Raises:
+        Exception: If a file cannot be signed by either route
+    """
+    signed_urls: Dict[Tuple[str, str], str] = {}
+    by_bucket: Dict[str, List[str]] = {}
+    for bucket, path in dict.fromkeys(files):
+        cached = signed_url_cache.get(bucket, path, expiry_seconds)
+        if cached:
+            signed_urls[(bucket, path)] = cached
+        else:
+            by_bucket.setdefault(bucket, []).append(path)
+
+    unsigned: List[Tuple[str, str]] = []
+    for bucket, paths in by_bucket.items():
+        for start in range(0, len(paths), SIGNED_URL_BATCH_SIZE):
+            batch = paths[start:start + SIGNED_URL_BATCH_SIZE]
+            signed = _sign_bucket_batch(bucket, batch, expiry_seconds)
+            for path in batch:
+                if path in signed:
+                    signed_urls[(bucket, path)] = signed[path]
+                else:
+                    unsigned.append((bucket, path))
+
+    if unsigned:
+        workers = min(SIGNED_URL_FALLBACK_WORKERS, len(unsigned))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            urls = executor.map(lambda item: get_signed_url(item[0], item[1], expiry_seconds), unsigned)
+            signed_urls.update(zip(unsigned, urls))
+
+    return signed_urls
+
+def _approval_update() -> Dict:
+    return {
+        "status": "approved",
+        "approved_at": datetime.now(timezone.utc).isoformat()
+    }
+
+def _rejection_update(reason: Optional[str]) -> Dict:
+    update_data = {
+        "status": "rejected",
+        "rejected_at": datetime.now(timezone.utc).isoformat()
+    }
+    if reason:
+        update_data["rejection_reason"] = reason
+    return update_data
+
+def _updated_file(result, file_id: str) -> Dict:
+    """Return the single row an update touched, writing it through to the listing cache."""
+    if not result.data:
+        raise Exception(f"No file found with ID {file_id}")
+        
+    user_file_cache.update_rows(result.data)
+    return result.data[0]
+
 def approve_file(file_id: str) -> Dict:
     """
     Mark a file as approved and record the approval timestamp.
+    Goes through the status update buffer when it is enabled.
     """
     try:
+        if status_updates.enabled:
+            return status_updates.update(_apply_file_updates, file_id, _approval_update(), ("approved_at",))
         supabase = get_supabase_client()
-        result = (supabase.table("transcript_files")
-                 .update({
-                     "status": "approved",
-                     "approved_at": datetime.now(timezone.utc).isoformat()
-                 })
-                 .eq("id", file_id)
-                 .execute())
+        query = supabase.table("transcript_files").update(_approval_update()).eq("id", file_id)
+        with observe_supabase("transcript_files", "update"):
+            result = supabase_calls.write("transcript_files:update", query.execute)
         
-        if not result.data:
-            raise Exception(f"No file found with ID {file_id}")
-            
-        return result.data[0]
+        return _updated_file(result, file_id)
     except Exception as e:
         print(f"Error approving file {file_id}: {str(e)}")
         raise Exception(f"Failed to approve file {file_id}") from e
 
+def _apply_file_updates(update_data: Dict, file_ids: List[str]) -> List[Dict]:
+    """Write one update to many files in a single request and return the updated rows."""
+    supabase = get_supabase_client()
+    query = supabase.table("transcript_files").update(update_data).in_("id", file_ids)
+    with observe_supabase("transcript_files", "update"):
+        result = supabase_calls.write("transcript_files:update", query.execute)
+
+    updated = result.data or []
+    user_file_cache.update_rows(updated)
+    return updated
+
+def _update_files(file_ids: Iterable[str], update_data: Dict) -> Dict[str, List]:
+    """
+    Apply one update to many files with a single filtered request.
+    """
+    ids = list(dict.fromkeys(file_id for file_id in file_ids if file_id))
+    if not ids:
+        return {"updated": [], "missing": []}
+
+    updated = _apply_file_updates(update_data, ids)
+    found = {row.get("id") for row in updated}
+    return {"updated": updated, "missing": [file_id for file_id in ids if file_id not in found]}
+
+def approve_files(file_ids: Iterable[str]) -> Dict[str, List]:
+    """
+    Mark many files as approved in one request.
+
+    Args:
+        file_ids: IDs of the files to approve
+
+    Returns:
+        Dict[str, List]: ``updated`` holds the updated records and ``missing`` the
+        requested IDs that matched no file
+
+    Raises:
+        Exception: If the update fails
+    """
+    try:
+        return _update_files(file_ids, _approval_update())
+    except Exception as e:
+        print(f"Error approving files: {str(e)}")
+        raise Exception("Failed to approve files") from e
+
 def reject_file(file_id: str, reason: Optional[str] = None) -> Dict:
     """
     Mark a file as rejected with an optional reason.
+    Goes through the status update buffer when it is enabled.
     """
     try:
+        if status_updates.enabled:
+            return status_updates.update(_apply_file_updates, file_id, _rejection_update(reason), ("rejected_at",))
         supabase = get_supabase_client()
-        update_data = {
-            "status": "rejected",
-            "rejected_at": datetime.now(timezone.utc).isoformat()
-        }
-        if reason:
-            update_data["rejection_reason"] = reason
-            
-        result = (supabase.table("transcript_files")
-                 .update(update_data)
-                 .eq("id", file_id)
-                 .execute())
+        query = supabase.table("transcript_files").update(_rejection_update(reason)).eq("id", file_id)
+        with observe_supabase("transcript_files", "update"):
+            result = supabase_calls.write("transcript_files:update", query.execute)
         
-        if not result.data:
-            raise Exception(f"No file found with ID {file_id}")
-            
-        return result.data[0]
+        return _updated_file(result, file_id)
     except Exception as e:
         print(f"Error rejecting file {file_id}: {str(e)}")
         raise Exception(f"Failed to reject file {file_id}") from e
+
+def reject_files(file_ids: Iterable[str], reason: Optional[str] = None) -> Dict[str, List]:
+    """
+    Mark many files as rejected in one request, with an optional shared reason.
+
+    Args:
+        file_ids: IDs of the files to reject
+        reason: Optional reason recorded on every file
+
+    Returns:
+        Dict[str, List]: ``updated`` holds the updated records and ``missing`` the
+        requested IDs that matched no file
+
+    Raises:
+        Exception: If the update fails
+    """
+    try:
+        return _update_files(file_ids, _rejection_update(reason))
+    except Exception as e:
+        print(f"Error rejecting files: {str(e)}")
+        raise Exception("Failed to reject files") from e
+
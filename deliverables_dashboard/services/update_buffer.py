@@ -0,0 +1,205 @@
+"""
+Optional write-coalescing buffer for single-row status updates.
+
+Approvals, rejections and upload retries arrive as bursts of one-row updates. With
+the buffer enabled they are held for a short window (or until a batch fills up)
+and written as one ``in_("id", ...)`` update per distinct payload. Each caller
+waits on a future that resolves with its row once its batch has committed.
+
+Enable it with ``STATUS_UPDATE_BUFFER=1``; ``STATUS_UPDATE_WINDOW_MS`` and
+``STATUS_UPDATE_MAX_BATCH`` tune the window and the batch size.
+
+Callers wait for their batch without a timeout of their own: giving up early would
+report a failure for an update that may still commit. The wait is bounded by the
+Supabase client's HTTP timeout (``SUPABASE_TIMEOUT``) on each batch write.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Writes a payload to every listed row and returns the updated rows
+ApplyUpdate = Callable[[Dict, List[str]], List[Dict]]
+
+
+@dataclass
+class _Group:
+    """Pending rows that share one payload"""
+    apply: ApplyUpdate
+    payload: Dict
+    waiters: "OrderedDict[str, List[Future]]" = field(default_factory=OrderedDict)
+
+
+class UpdateBuffer:
+    """
+    Batches row updates by payload and flushes them from a background thread.
+
+    A batch is flushed ``window_seconds`` after its first update, or as soon as
+    ``max_batch`` updates are pending. If a row is updated again before its batch
+    is flushed, the latest payload wins and every waiter for the row gets the
+    committed result.
+
+    Args:
+        window_seconds: How long the first pending update waits for company
+        max_batch: Pending updates that trigger an immediate flush
+        enabled: Whether callers should route updates through the buffer
+    """
+
+    def __init__(self, window_seconds: float = 0.05, max_batch: int = 100, enabled: bool = True):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.enabled = enabled
+        self._groups: "OrderedDict[Hashable, _Group]" = OrderedDict()
+        self._row_groups: Dict[Tuple[ApplyUpdate, str], Hashable] = {}
+        self._pending = 0
+        self._first_at: Optional[float] = None
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(
+        self,
+        apply: ApplyUpdate,
+        row_id: str,
+        payload: Dict,
+        stamp_fields: Sequence[str] = ()
+    ) -> Future:
+        """
+        Queue an update of one row.
+
+        Args:
+            apply: Function that writes a payload to many rows
+            row_id: ID of the row to update
+            payload: Column values to write
+            stamp_fields: Timestamp columns left out when grouping payloads; a batch
+                writes the latest submitted value
+
+        Returns:
+            Future: Resolves with the updated row, or fails with the batch's error or
+            when no row has the ID
+        """
+        future: Future = Future()
+        values = {name: value for name, value in payload.items() if name not in stamp_fields}
+        key = (apply, _freeze(values))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Update buffer is closed")
+            waiters: List[Future] = []
+            previous = self._row_groups.pop((apply, row_id), None)
+            if previous is not None:
+                waiters = self._groups[previous].waiters.pop(row_id)
+                self._pending -= 1
+                if not self._groups[previous].waiters:
+                    del self._groups[previous]
+
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(apply, dict(payload))
+            else:
+                # Keep the latest timestamps for the batch
+                group.payload.update({name: payload[name] for name in stamp_fields if name in payload})
+            group.waiters[row_id] = waiters + [future]
+            self._row_groups[(apply, row_id)] = key
+            self._pending += 1
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            self._ensure_worker()
+            self._cond.notify_all()
+        return future
+
+    def update(self, apply: ApplyUpdate, row_id: str, payload: Dict, stamp_fields: Sequence[str] = ()) -> Dict:
+        """
+        Queue an update of one row and wait until its batch has committed or failed.
+
+        Returns:
+            Dict: The updated row
+
+        Raises:
+            Exception: If the batch failed or no row has the ID
+        """
+        return self.submit(apply, row_id, payload, stamp_fields).result()
+
+    def flush(self) -> None:
+        """Write every pending update now, in the calling thread."""
+        with self._cond:
+            groups = self._take()
+        self._commit(groups)
+
+    def close(self) -> None:
+        """Flush what is pending and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+        self.flush()
+
+    def _ensure_worker(self) -> None:
+        # Also restarts the worker in a forked child, where threads do not survive
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="status-update-buffer", daemon=True)
+            self._worker.start()
+
+    def _take(self) -> List[_Group]:
+        groups = list(self._groups.values())
+        self._groups.clear()
+        self._row_groups.clear()
+        self._pending = 0
+        self._first_at = None
+        return groups
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                while self._pending and self._pending < self.max_batch and not self._closed:
+                    remaining = self._first_at + self.window_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                groups = self._take()
+            self._commit(groups)
+
+    def _commit(self, groups: List[_Group]) -> None:
+        for group in groups:
+            ids = list(group.waiters)
+            for start in range(0, len(ids), self.max_batch):
+                batch = ids[start:start + self.max_batch]
+                try:
+                    rows = {str(row.get("id")): row for row in group.apply(group.payload, batch)}
+                except Exception as e:
+                    for row_id in batch:
+                        for future in group.waiters[row_id]:
+                            future.set_exception(e)
+                    continue
+                for row_id in batch:
+                    row = rows.get(str(row_id))
+                    for future in group.waiters[row_id]:
+                        if row is None:
+                            future.set_exception(Exception(f"No row found with ID {row_id}"))
+                        else:
+                            future.set_result(row)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn a payload into a hashable grouping key."""
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Buffer shared by supabase_service and video_schedule
+status_updates = UpdateBuffer(
+    window_seconds=float(os.getenv("STATUS_UPDATE_WINDOW_MS", "50")) / 1000,
+    max_batch=int(os.getenv("STATUS_UPDATE_MAX_BATCH", "100")),
+    enabled=os.getenv("STATUS_UPDATE_BUFFER", "").strip().lower() in ("1", "true", "yes")
+)
@@ -1,11 +1,150 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
 from ..supabase_client import supabase
+from ..utils.metrics import observe_supabase
+from ..utils.resilience import supabase_calls
+from ..utils.singleflight import copy_rows, supabase_reads
+from ..utils.timing import span
+from . import keyset
+from .update_buffer import status_updates
+
+# Columns shown on the publishing dashboard
+SCHEDULE_COLUMNS = "id,transcript_id,platform,scheduled_at,published,publish_url,manifest_url,publish_error"
+
+# Page size used when paging through a transcript's schedule
+DEFAULT_PAGE_SIZE = 100
+
+# Record IDs looked up per query by fetch_video_records
+RECORD_ID_BATCH_SIZE = 100
+
+# Server-side status filters accepted by fetch_video_schedule_page
+STATUS_FILTERS = ("published", "failed", "scheduled")
+
+# Field values that send a video back to App 7 for another upload attempt
+RETRY_RESET = {
+    "published": False,
+    "publish_error": None
+}
+
+def encode_cursor(record: Dict) -> str:
+    """
+    Build an opaque keyset cursor pointing just after the given record.
+    """
+    return keyset.encode_cursor([record["scheduled_at"], record["id"]])
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Unpack a cursor produced by encode_cursor into (scheduled_at, id).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return keyset.decode_cursor(cursor)
+
+def _check_page_args(status: Optional[str], cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Validate the status filter and decode the cursor into a keyset position."""
+    if status and status not in STATUS_FILTERS:
+        raise ValueError(f"Unknown status filter: {status}")
+    return decode_cursor(cursor) if cursor else None
+
+def _schedule_query(client, transcript_id: str, platform: Optional[str], status: Optional[str],
+                    after: Optional[Tuple[str, str]], limit: int):
+    """Build the keyset page query for one page of a transcript's schedule."""
+    query = (client.table("video_schedule")
+             .select(SCHEDULE_COLUMNS)
+             .eq("transcript_id", transcript_id))
+    if platform:
+        query = query.eq("platform", platform)
+    if status == "published":
+        query = query.eq("published", True)
+    elif status == "failed":
+        query = query.eq("published", False).not_.is_("publish_error", "null")
+    elif status == "scheduled":
+        query = query.eq("published", False).is_("publish_error", "null")
+    if after:
+        query = query.or_(keyset.after_filter("scheduled_at", "id", after))
+
+    # Fetch one extra row to learn whether another page follows
+    return query.order("scheduled_at").order("id").limit(limit + 1)
+
+def _split_page(records: List[Dict], limit: int) -> Tuple[List[Dict], Optional[str]]:
+    if len(records) > limit:
+        records = records[:limit]
+        return records, encode_cursor(records[-1])
+    return records, None
+
+def fetch_video_schedule_page(
+    transcript_id: str,
+    platform: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch one page of video schedule entries, ordered by (scheduled_at, id).
+
+    Pagination is keyset based: pass the returned cursor back in to get the next page.
+
+    Args:
+        transcript_id (str): The ID of the transcript to fetch schedule data for
+        platform (Optional[str]): Only return entries for this platform
+        status (Optional[str]): One of "published", "failed" or "scheduled"
+        cursor (Optional[str]): Cursor returned with the previous page
+        limit (int): Maximum number of entries in the page
+
+    Returns:
+        Tuple[List[Dict], Optional[str]]: The entries and the cursor for the next page
+            (None on the last page)
+
+    Raises:
+        ValueError: If the status or cursor is invalid
+        Exception: If there's an error in the Supabase query
+    """
+    after = _check_page_args(status, cursor)
+
+    def run_query() -> List[Dict]:
+        query = _schedule_query(supabase, transcript_id, platform, status, after, limit)
+        with span("supabase"), observe_supabase("video_schedule", "select"):
+            response = supabase_calls.read("video_schedule:select", query.execute)
+        return response.data or []
+
+    try:
+        # Concurrent requests for the same page share one query
+        key = ("video_schedule", transcript_id, platform, status, after, limit)
+        records = supabase_reads.do(key, run_query, share=copy_rows)
+    except Exception as e:
+        raise Exception(f"Failed to fetch video schedule: {str(e)}")
+
+    return _split_page(records, limit)
+
+def iter_video_schedule(
+    transcript_id: str,
+    platform: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[Dict]:
+    """
+    Yield every matching video schedule entry, one keyset page at a time.
+    """
+    cursor = None
+    while True:
+        records, cursor = fetch_video_schedule_page(transcript_id, platform, status, cursor, page_size)
+        yield from records
+        if cursor is None:
+            return
 
-def fetch_video_schedule(transcript_id: str):
+def fetch_video_schedule(
+    transcript_id: str,
+    platform: Optional[str] = None,
+    status: Optional[str] = None
+) -> List[Dict]:
     """
     Fetch video schedule data for a specific transcript from Supabase.
     
     Args:
         transcript_id (str): The ID of the transcript to fetch schedule data for
+        platform (Optional[str]): Only return entries for this platform
+        status (Optional[str]): One of "published", "failed" or "scheduled"
         
     Returns:
         list: List of video schedule entries for the transcript
@@ -13,36 +152,115 @@ def fetch_video_schedule(transcript_id: str):
     Raises:
         Exception: If there's an error in the Supabase query
     """
+    return list(iter_video_schedule(transcript_id, platform, status))
+
+def fetch_video_records(transcript_id: str, video_ids: Iterable[str]) -> List[Dict]:
+    """
+    Fetch specific video schedule entries of a transcript by ID.
+
+    IDs are looked up RECORD_ID_BATCH_SIZE at a time; IDs that do not exist, or
+    belong to another transcript, are simply missing from the result.
+
+    Args:
+        transcript_id (str): The transcript the records belong to
+        video_ids (Iterable[str]): The record IDs to read
+
+    Returns:
+        list: The matching video schedule entries
+
+    Raises:
+        Exception: If there's an error in the Supabase query
+    """
+    video_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+    records: List[Dict] = []
     try:
-        # For testing purposes, return mock data
-        return [
-            {
-                "id": "vid_123",
-                "platform": "website",
-                "scheduled_at": "2025-04-15T10:00:00Z",
-                "published": True,
-                "publish_url": "https://example.com/videos/test123.mp4",
-                "manifest_url": "https://example.com/manifest/test123.md",
-                "publish_error": None
-            },
-            {
-                "id": "vid_124",
-                "platform": "YouTube",
-                "scheduled_at": "2025-04-16T14:30:00Z",
-                "published": True,
-                "publish_url": "https://youtube.com/watch?v=test123",
-                "manifest_url": None,
-                "publish_error": None
-            },
-            {
-                "id": "vid_125",
-                "platform": "Vimeo",
-                "scheduled_at": "2025-04-17T09:00:00Z",
-                "published": False,
-                "publish_url": None,
-                "manifest_url": None,
-                "publish_error": "Failed to upload: Network timeout"
-            }
-        ]
+        for start in range(0, len(video_ids), RECORD_ID_BATCH_SIZE):
+            query = (supabase.table("video_schedule")
+                     .select(SCHEDULE_COLUMNS)
+                     .eq("transcript_id", transcript_id)
+                     .in_("id", video_ids[start:start + RECORD_ID_BATCH_SIZE]))
+            with span("supabase"), observe_supabase("video_schedule", "select"):
+                response = supabase_calls.read("video_schedule:select", query.execute)
+            records.extend(response.data or [])
     except Exception as e:
-        raise Exception(f"Failed to fetch video schedule: {str(e)}")
+        raise Exception(f"Failed to fetch video records: {str(e)}")
+    return records
+
+def _apply_schedule_updates(update_data: Dict, video_ids: List[str]) -> List[Dict]:
+    """Write one update to many schedule records in a single request."""
+    query = supabase.table("video_schedule").update(update_data).in_("id", video_ids)
+    with span("supabase"), observe_supabase("video_schedule", "update"):
+        response = supabase_calls.write("video_schedule:update", query.execute)
+    return response.data or []
+
+def retry_video(video_id: str) -> Dict:
+    """
+    Reset one failed upload for reprocessing.
+
+    Goes through the status update buffer when it is enabled, so a burst of retries
+    is written as a single update.
+
+    Args:
+        video_id (str): The ID of the video schedule record
+
+    Returns:
+        Dict: The reset record
+
+    Raises:
+        Exception: If no record has the ID or the update fails
+    """
+    try:
+        if status_updates.enabled:
+            return status_updates.update(_apply_schedule_updates, video_id, RETRY_RESET)
+        query = supabase.table("video_schedule").update(RETRY_RESET).eq("id", video_id)
+        with span("supabase"), observe_supabase("video_schedule", "update"):
+            response = supabase_calls.write("video_schedule:update", query.execute)
+        if not response.data:
+            raise Exception(f"No video found with ID {video_id}")
+        return response.data[0]
+    except Exception as e:
+        raise Exception(f"Failed to retry video upload {video_id}: {str(e)}")
+
+def retry_failed_videos(
+    transcript_id: Optional[str] = None,
+    platform: Optional[str] = None,
+    video_ids: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Reset many failed uploads for reprocessing with a single Supabase update.
+
+    With ``video_ids`` exactly those records are reset; otherwise every unpublished
+    record with a ``publish_error`` is reset. ``transcript_id`` and ``platform`` narrow either scope.
+
+    Args:
+        transcript_id (Optional[str]): Only reset records for this transcript
+        platform (Optional[str]): Only reset records for this platform
+        video_ids (Optional[Iterable[str]]): Explicit record IDs to reset
+
+    Returns:
+        int: The number of records that were reset
+
+    Raises:
+        ValueError: If no scope was given
+        Exception: If the Supabase update fails
+    """
+    video_ids = [video_id for video_id in (video_ids or []) if video_id]
+    if not (transcript_id or platform or video_ids):
+        raise ValueError("Bulk retry needs a transcript, platform or list of video IDs")
+
+    try:
+        query = supabase.table("video_schedule").update(RETRY_RESET, count="exact", returning="minimal")
+        if video_ids:
+            query = query.in_("id", video_ids)
+        else:
+            query = query.eq("published", False).not_.is_("publish_error", "null")
+        if transcript_id:
+            query = query.eq("transcript_id", transcript_id)
+        if platform:
+            query = query.eq("platform", platform)
+
+        with span("supabase"), observe_supabase("video_schedule", "update"):
+            response = supabase_calls.write("video_schedule:update", query.execute)
+        return response.count if response.count is not None else len(response.data or [])
+    except Exception as e:
+        raise Exception(f"Failed to retry video uploads: {str(e)}")
@@ -1,26 +1,97 @@
 """
 Supabase client configuration and initialization.
-Provides a configured Supabase client instance for database operations.
+Provides a lazily created Supabase client instance for database operations.
+
+Nothing is loaded or connected at import time: the environment is read and the
+client built on first use, so importing the app needs no credentials.
 """
-from supabase import create_client
 import os
-from typing import Optional
-from dotenv import load_dotenv
+import threading
+from typing import Any, Optional
+
+# Per-request timeout (seconds) for database and storage calls
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+
+# Keep-alive connection pool shared by every call made through one client
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+
+def build_client(url: str, key: str):
+    """
+    Create a Supabase client with bounded timeouts and a keep-alive connection pool.
+
+    Every call made through the client gives up after SUPABASE_TIMEOUT seconds,
+    rather than the client library's much longer default.
+    """
+    import httpx
+    from supabase import ClientOptions, create_client
+
+    option_fields = getattr(ClientOptions, "__dataclass_fields__", {})
+    options = {
+        "postgrest_client_timeout": SUPABASE_TIMEOUT,
+        "storage_client_timeout": SUPABASE_TIMEOUT
+    }
+    if "httpx_client" in option_fields:
+        options["httpx_client"] = httpx.Client(
+            timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=min(SUPABASE_TIMEOUT, 5.0)),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+                keepalive_expiry=30
+            )
+        )
+    return create_client(url, key, options=ClientOptions(**options))
+
+def get_supabase():
+    """
+    Return the shared Supabase client, creating it on first call.
+
+    With DASHBOARD_BACKEND=local the SQLite stand-in from services.local_backend
+    is returned instead.
+
+    Raises:
+        EnvironmentError: If SUPABASE_URL or SUPABASE_ANON_KEY is not set
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from dotenv import load_dotenv
+
+                # Load environment variables
+                load_dotenv()
+
+                from .services import local_backend
+                if local_backend.is_enabled():
+                    _client = local_backend.get_local_backend()
+                    return _client
+
+                # Environment variables for Supabase configuration
+                url = os.getenv("SUPABASE_URL")
+                key = os.getenv("SUPABASE_ANON_KEY")  # Using anon key for client operations
+
+                if not url or not key:
+                    raise EnvironmentError(
+                        "Missing required environment variables: SUPABASE_URL and/or SUPABASE_ANON_KEY"
+                    )
 
-# Load environment variables
-load_dotenv()
+                _client = build_client(url, key)
+    return _client
 
-# Environment variables for Supabase configuration
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY")  # Using anon key for client operations
+class _LazySupabaseClient:
+    """Stand-in that creates the real client the first time an attribute is used."""
 
-print("Debug - SUPABASE_URL:", SUPABASE_URL)
-print("Debug - SUPABASE_KEY:", SUPABASE_KEY)
+    def __getattr__(self, name: str) -> Any:
+        # Introspection (mock, inspect, copy) must not trigger a connection
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(get_supabase(), name)
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise EnvironmentError(
-        "Missing required environment variables: SUPABASE_URL and/or SUPABASE_ANON_KEY"
-    )
+    def __repr__(self) -> str:
+        return "<lazy Supabase client>"
 
-# Initialize Supabase client
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Shared client; safe to import, connects on first use
+supabase = _LazySupabaseClient()
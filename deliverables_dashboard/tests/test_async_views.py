@@ -0,0 +1,72 @@
+"""
+Tests for the async JSON views, which fan out the blocking service functions on worker threads.
+"""
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+import app as dashboard_app
+from deliverables_dashboard.services import local_backend, supabase_service
+
+LOCAL = {"DASHBOARD_BACKEND": "local", "LOCAL_BACKEND_PATH": ":memory:"}
+
+
+class TestAsyncViews(unittest.TestCase):
+    def setUp(self):
+        self.client = dashboard_app.app.test_client()
+
+    def test_schedule_and_files_are_fetched_concurrently(self):
+        """The transcript API runs its independent reads at the same time."""
+        files_started = threading.Event()
+
+        def fetch_schedule(transcript_id, platform=None, status=None):
+            # Only finishes if the file listing started while this call was waiting
+            if not files_started.wait(1):
+                raise TimeoutError("file listing did not start")
+            return [{"id": "v1"}]
+
+        def fetch_files(user_id, transcript_id):
+            files_started.set()
+            return [{"id": "f1", "bucket": "deliverables", "file_path": "t1/a.mp4"}]
+
+        def sign(pairs, expiry_seconds=3600):
+            return {pair: f"https://signed/{pair[1]}" for pair in pairs}
+
+        with patch("app.fetch_video_schedule", fetch_schedule), \
+                patch("app.fetch_user_files", fetch_files), \
+                patch("app.get_signed_urls", sign):
+            response = self.client.get("/api/transcript/t1?user_id=u1&previews=1")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body["videos"], [{"id": "v1"}])
+        self.assertEqual(body["files"][0]["preview_url"], "https://signed/t1/a.mp4")
+
+    @patch.dict(os.environ, LOCAL)
+    def test_review_endpoints_on_local_backend(self):
+        """Approve and reject endpoints update records through the pooled service functions."""
+        local_backend.reset_local_backend()
+        self.addCleanup(local_backend.reset_local_backend)
+        supabase_service.reset_supabase_client()
+        self.addCleanup(supabase_service.reset_supabase_client)
+        supabase_service.user_file_cache.clear()
+        local_backend.seed(local_backend.get_local_backend(), users=1, transcripts_per_user=1,
+                           files_per_transcript=2, videos_per_transcript=1)
+
+        approved = self.client.post("/api/files/t00000-00000-f0000/approve")
+        rejected = self.client.post("/api/files/t00000-00000-f0001/reject", json={"reason": "Off brand"})
+        missing = self.client.post("/api/files/nope/approve")
+
+        self.assertEqual(approved.get_json()["status"], "approved")
+        self.assertEqual(rejected.get_json()["rejection_reason"], "Off brand")
+        self.assertEqual(missing.status_code, 500)
+
+    def test_invalid_status_is_a_client_error(self):
+        """Unknown status filters are rejected before any query."""
+        response = self.client.get("/api/transcript/t1?status=deleted")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
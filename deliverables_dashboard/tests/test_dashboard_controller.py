@@ -0,0 +1,83 @@
+"""
+Tests for DashboardController listing and preview behaviour.
+"""
+import unittest
+from unittest.mock import patch
+
+from deliverables_dashboard.controllers.dashboard_controller import DashboardController
+
+
+def make_file(file_id, transcript_id, file_name):
+    return {
+        'id': file_id,
+        'transcript_id': transcript_id,
+        'file_name': file_name,
+        'bucket': 'deliverables',
+        'file_path': f'{transcript_id}/{file_name}',
+        'status': 'pending'
+    }
+
+
+@patch('deliverables_dashboard.controllers.dashboard_controller.supabase_service')
+class TestLazyPreviews(unittest.TestCase):
+    def setUp(self):
+        self.dashboard = DashboardController()
+        self.files = [
+            make_file('f1', 't1', 'clip.mp4'),
+            make_file('f2', 't1', 'notes.md'),
+            make_file('f3', 't2', 'cover.png')
+        ]
+
+    def test_listing_without_preview_urls_skips_signing(self, mock_service):
+        """Metadata-only listings never touch storage."""
+        mock_service.iter_user_file_pages.return_value = iter([self.files[:2], self.files[2:]])
+
+        grouped = self.dashboard.get_user_files('user-1', include_preview_urls=False)
+
+        mock_service.get_signed_urls.assert_not_called()
+        mock_service.get_signed_url.assert_not_called()
+        self.assertEqual([f['preview_type'] for f in grouped['t1']], ['video', 'text'])
+        self.assertEqual(grouped['t2'][0]['preview_type'], 'unknown')
+        self.assertNotIn('preview_url', grouped['t1'][0])
+
+    def test_pages_are_grouped_and_signed_as_they_arrive(self, mock_service):
+        """Each page is signed once and appended to its transcript group."""
+        mock_service.iter_user_file_pages.return_value = iter([self.files[:1], self.files[1:]])
+        mock_service.get_signed_urls.side_effect = lambda pairs, expiry: {
+            pair: f'https://signed/{pair[1]}' for pair in pairs
+        }
+
+        grouped = self.dashboard.get_user_files('user-1', status='pending')
+
+        mock_service.iter_user_file_pages.assert_called_once_with('user-1', None, status='pending')
+        self.assertEqual(mock_service.get_signed_urls.call_count, 2)
+        self.assertEqual([f['id'] for f in grouped['t1']], ['f1', 'f2'])
+        self.assertEqual(grouped['t2'][0]['preview_url'], 'https://signed/t2/cover.png')
+
+    def test_preview_data_signs_on_demand(self, mock_service):
+        """Opening a preview signs just that file."""
+        mock_service.get_signed_url.return_value = 'https://signed/clip.mp4'
+        file_data = dict(self.files[0], preview_type='video')
+
+        preview = self.dashboard.get_file_preview_data(file_data)
+
+        self.assertEqual(preview['url'], 'https://signed/clip.mp4')
+        mock_service.get_signed_url.assert_called_once_with('deliverables', 't1/clip.mp4', 3600)
+        self.dashboard.get_file_preview_data(file_data)
+        self.assertEqual(mock_service.get_signed_url.call_count, 1)
+
+    def test_sign_visible_files_only(self, mock_service):
+        """Only the requested, still unsigned files are signed."""
+        visible = [self.files[0], dict(self.files[1], preview_url='https://signed/already')]
+        mock_service.get_signed_urls.side_effect = lambda pairs, expiry: {
+            pair: f'https://signed/{pair[1]}' for pair in pairs
+        }
+
+        self.dashboard.sign_preview_urls(visible)
+
+        self.assertEqual(visible[0]['preview_url'], 'https://signed/t1/clip.mp4')
+        self.assertEqual(visible[1]['preview_url'], 'https://signed/already')
+
+
+if __name__ == '__main__':
+    unittest.main()
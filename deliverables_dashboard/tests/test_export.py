@@ -0,0 +1,88 @@
+"""
+Tests for the streaming CSV and JSON Lines exports.
+"""
+import csv
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+import app as dashboard_app
+from deliverables_dashboard.services import export, local_backend
+
+LOCAL = {"DASHBOARD_BACKEND": "local", "LOCAL_BACKEND_PATH": ":memory:"}
+
+
+class TestChunks(unittest.TestCase):
+    def test_pages_are_serialized_lazily(self):
+        """A page is only fetched after the previous chunk has been consumed."""
+        fetched = []
+
+        def pages():
+            for number in range(3):
+                fetched.append(number)
+                yield [{"id": f"r{number}", "status": "pending", "ignored": 1}]
+
+        chunks = export.csv_chunks(pages(), ["id", "status"])
+        self.assertEqual(next(chunks), "id,status\r\nr0,pending\r\n")
+        self.assertEqual(fetched, [0])
+        self.assertEqual(list(chunks), ["r1,pending\r\n", "r2,pending\r\n"])
+
+    def test_empty_export_still_has_a_header(self):
+        """A CSV export with no rows is just the header; JSON Lines is empty."""
+        self.assertEqual(list(export.csv_chunks(iter([]), ["id"])), ["id\r\n"])
+        self.assertEqual(list(export.jsonl_chunks(iter([]), ["id"])), [])
+
+    def test_jsonl_uses_export_columns(self):
+        """Each row becomes one JSON object with exactly the export columns."""
+        chunk = next(export.jsonl_chunks(iter([[{"id": "a", "extra": 1}]]), ["id", "status"]))
+        self.assertEqual(json.loads(chunk), {"id": "a", "status": None})
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export.export_chunks(iter([]), "xml", ["id"])
+
+
+@patch.dict(os.environ, LOCAL)
+class TestExportViews(unittest.TestCase):
+    def setUp(self):
+        local_backend.reset_local_backend()
+        self.addCleanup(local_backend.reset_local_backend)
+        self.backend = local_backend.get_local_backend()
+        local_backend.seed(self.backend, users=1, transcripts_per_user=3, files_per_transcript=4,
+                           videos_per_transcript=5)
+        self.client = dashboard_app.app.test_client()
+
+    def test_user_files_csv(self):
+        """Every file row is exported across several pages, with the file columns."""
+        with patch.object(export, "fetch_user_files_page", wraps=export.fetch_user_files_page) as fetch, \
+                patch.object(export, "EXPORT_PAGE_SIZE", 5):
+            response = self.client.get("/export/users/user-00000/files.csv")
+            rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertIn('filename="user-00000-files.csv"', response.headers["Content-Disposition"])
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(list(rows[0]), export.FILE_EXPORT_COLUMNS)
+        self.assertEqual(fetch.call_count, 3)
+
+    def test_schedule_jsonl(self):
+        """A transcript's schedule is exported as one JSON object per line."""
+        with patch("deliverables_dashboard.services.video_schedule.supabase", self.backend):
+            response = self.client.get("/export/transcripts/t00000-00001/schedule.jsonl")
+            lines = response.get_data(as_text=True).splitlines()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(json.loads(line)["transcript_id"] == "t00000-00001" for line in lines))
+
+    def test_invalid_requests(self):
+        """Unknown formats and status filters are client errors."""
+        self.assertEqual(self.client.get("/export/users/user-00000/files.xml").status_code, 400)
+        self.assertEqual(self.client.get("/export/transcripts/t1/schedule.csv?status=deleted").status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for the transcript file listing cache and its write-through on review.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from deliverables_dashboard.services import supabase_service
+from deliverables_dashboard.services.file_cache import UserFileCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_row(file_id, transcript_id="t1", status="pending"):
+    return {"id": file_id, "user_id": "u1", "transcript_id": transcript_id, "status": status}
+
+
+class TestUserFileCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = UserFileCache(ttl_seconds=60, max_entries=2, clock=self.clock)
+
+    def test_entries_expire_and_are_bounded(self):
+        """Listings expire after the TTL and the least recently used are evicted."""
+        self.cache.set("u1", None, [make_row("a")])
+        self.cache.set("u2", None, [])
+        self.assertIsNotNone(self.cache.get("u1"))
+        self.cache.set("u3", None, [])
+
+        self.assertIsNone(self.cache.get("u2"))
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get("u1"))
+
+    def test_callers_get_copies(self):
+        """Annotating returned rows does not change the cache."""
+        self.cache.set("u1", None, [make_row("a")])
+        self.cache.get("u1")[0]["preview_url"] = "https://signed"
+        self.assertNotIn("preview_url", self.cache.get("u1")[0])
+
+    def test_update_rows_writes_through_cached_columns(self):
+        """Updated rows replace cached values without adding uncached columns."""
+        self.cache.set("u1", None, [make_row("a"), make_row("b")])
+        self.cache.set("u1", "t1", [make_row("a")])
+
+        updated = self.cache.update_rows([dict(make_row("a", status="approved"), approved_at="now", extra=1)])
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.cache.get("u1")[0], dict(make_row("a", status="approved")))
+        self.assertEqual(self.cache.get("u1", "t1")[0]["status"], "approved")
+
+    def test_listing_missing_an_updated_row_is_dropped(self):
+        """A listing that should contain an updated row but does not is refetched."""
+        self.cache.set("u1", "t1", [make_row("a")])
+        self.cache.update_rows([make_row("new")])
+        self.assertIsNone(self.cache.get("u1", "t1"))
+
+    def test_stale_reads_are_not_stored(self):
+        """A listing read before a write is discarded."""
+        generation = self.cache.generation
+        self.cache.update_rows([make_row("a")])
+        self.cache.set("u1", None, [make_row("a")], generation)
+        self.assertIsNone(self.cache.get("u1"))
+
+
+@patch("deliverables_dashboard.services.supabase_service.get_supabase_client")
+class TestReadThrough(unittest.TestCase):
+    def setUp(self):
+        supabase_service.user_file_cache.clear()
+        self.addCleanup(supabase_service.user_file_cache.clear)
+
+    def listing_query(self, client, rows):
+        query = MagicMock()
+        for method in ("select", "eq", "in_", "or_", "order", "limit"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=rows)
+        client.table.return_value.select.return_value = query
+        return query
+
+    def test_repeat_reads_are_served_from_memory(self, mock_get_client):
+        """Only the first listing queries Supabase; status filters use the cache."""
+        client = mock_get_client.return_value
+        query = self.listing_query(client, [make_row("a"), make_row("b", status="approved")])
+
+        supabase_service.fetch_user_files("u1")
+        files = supabase_service.fetch_user_files("u1")
+        approved = supabase_service.fetch_user_files("u1", status="approved")
+
+        self.assertEqual(query.execute.call_count, 1)
+        self.assertEqual([row["id"] for row in files], ["a", "b"])
+        self.assertEqual([row["id"] for row in approved], ["b"])
+
+    def test_approval_updates_cached_rows(self, mock_get_client):
+        """Approving a file updates the cached listing instead of invalidating it."""
+        client = mock_get_client.return_value
+        query = self.listing_query(client, [make_row("a")])
+        supabase_service.fetch_user_files("u1")
+        client.table.return_value.update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[make_row("a", status="approved")]
+        )
+
+        supabase_service.approve_file("a")
+        files = supabase_service.fetch_user_files("u1")
+
+        self.assertEqual(files[0]["status"], "approved")
+        self.assertEqual(query.execute.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
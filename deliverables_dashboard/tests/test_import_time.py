@@ -0,0 +1,41 @@
+"""
+Import-time budget for the Flask app.
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Seconds allowed for a cold `import app`, generous enough for slow CI machines
+IMPORT_BUDGET_SECONDS = 2.0
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "elapsed": elapsed,
+    "loaded": sorted(name for name in ("supabase", "markdown", "requests") if name in sys.modules)
+}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_app_imports_quickly_without_credentials(self):
+        """Importing the app loads no Supabase client, markdown or requests and needs no credentials."""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = {key: value for key, value in os.environ.items() if not key.startswith("SUPABASE_")}
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=root, env=env, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(report["loaded"], [])
+        self.assertLess(report["elapsed"], IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Tests for the shared live status poller and its Server-Sent Events endpoint.
+"""
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+import app as dashboard_app
+from deliverables_dashboard.services.live_status import LiveStatusHub, TooManyWatchersError, diff_records
+
+
+def make_record(record_id, published=False, publish_error=None):
+    return {"id": record_id, "platform": "YouTube", "published": published, "publish_error": publish_error}
+
+
+class FakeSchedule:
+    """Thread-safe stand-in for fetch_video_records that records the IDs it was asked for."""
+
+    def __init__(self, records):
+        self.records = records
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def __call__(self, transcript_id, record_ids):
+        with self.lock:
+            self.requested.append(record_ids)
+            return [dict(record) for record in self.records if record["id"] in record_ids]
+
+
+class TestDiff(unittest.TestCase):
+    def test_changed_and_removed(self):
+        """Only new or modified records are sent, with a derived status."""
+        previous = {"a": make_record("a"), "b": make_record("b")}
+        current = {"a": make_record("a", published=True), "c": make_record("c", publish_error="Timed out")}
+
+        delta = diff_records(previous, current)
+
+        self.assertEqual([(record["id"], record["status"]) for record in delta["changed"]],
+                         [("a", "published"), ("c", "failed")])
+        self.assertEqual(delta["removed"], ["b"])
+
+
+class TestLiveStatusHub(unittest.TestCase):
+    def setUp(self):
+        self.schedule = FakeSchedule([make_record("a"), make_record("b")])
+        self.changed = []
+        self.hub = LiveStatusHub(poll_seconds=0.01, max_watches=1, fetch=self.schedule,
+                                 on_change=self.changed.append)
+        self.addCleanup(self.hub.close)
+
+    def test_watchers_share_one_poller(self):
+        """Every subscriber gets the snapshot and the same deltas from one poll loop."""
+        first = self.hub.subscribe("t1", ["a", "b"])
+        self.assertEqual(first.get(timeout=1)[0], "snapshot")
+        second = self.hub.subscribe("t1", ["b", "a"])
+        self.assertEqual(len(second.get(timeout=1)[1]["records"]), 2)
+
+        self.schedule.records = [make_record("a", published=True), make_record("b")]
+        for subscription in (first, second):
+            name, delta = subscription.get(timeout=1)
+            self.assertEqual(name, "changes")
+            self.assertEqual([record["id"] for record in delta["changed"]], ["a"])
+
+        self.assertEqual(self.hub.watching(), {"t1": 2})
+        self.assertEqual(len([thread for thread in threading.enumerate() if thread.name == "live-status-t1"]), 1)
+        self.assertEqual(self.changed[:1], ["t1"])
+
+    def test_only_watched_records_are_polled(self):
+        """A poll reads just the subscribed IDs, and the snapshot holds only those records."""
+        self.schedule.records.append(make_record("c"))
+        subscription = self.hub.subscribe("t1", ["a", "c"])
+        name, snapshot = subscription.get(timeout=1)
+
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(sorted(record["id"] for record in snapshot["records"]), ["a", "c"])
+        self.assertEqual(self.schedule.requested[0], ["a", "c"])
+
+    def test_record_ids_are_required_and_bounded(self):
+        """Subscribing needs some record IDs and no more than max_records."""
+        self.hub.max_records = 2
+        with self.assertRaises(ValueError):
+            self.hub.subscribe("t1", [])
+        with self.assertRaises(ValueError):
+            self.hub.subscribe("t1", ["a", "b", "c"])
+
+    def test_poller_stops_with_last_subscriber(self):
+        """Closing the last subscription stops polling and frees the slot."""
+        subscription = self.hub.subscribe("t1", ["a"])
+        subscription.get(timeout=1)
+        with self.assertRaises(TooManyWatchersError):
+            self.hub.subscribe("t1", ["b"])
+
+        subscription.close()
+        self.assertEqual(self.hub.watching(), {})
+        self.assertIsNone(subscription.get(timeout=1))
+        self.hub.subscribe("t2", ["a"]).close()
+
+    def test_slow_subscriber_is_dropped(self):
+        """A subscriber whose queue is full is closed rather than blocking the poller."""
+        self.hub.max_events = 1
+        subscription = self.hub.subscribe("t1", ["a"])
+        for index in range(50):
+            if subscription.closed:
+                break
+            self.schedule.records = [make_record("a", publish_error=f"Attempt {index}")]
+            threading.Event().wait(0.01)
+        self.assertTrue(subscription.closed)
+
+
+class TestEventStream(unittest.TestCase):
+    def setUp(self):
+        dashboard_app.page_cache.clear()
+
+    @patch("app.fetch_video_schedule_page", return_value=([make_record("a")], None))
+    def test_stream_sends_snapshot_and_unsubscribes(self, mock_page):
+        """The endpoint streams the page's records and releases its subscription when closed."""
+        schedule = FakeSchedule([make_record("a"), make_record("b")])
+        hub = LiveStatusHub(poll_seconds=0.01, fetch=schedule)
+        self.addCleanup(hub.close)
+        with patch("app.live_status", hub):
+            response = dashboard_app.app.test_client().get("/transcript/t1/events?status=scheduled")
+            chunks = iter(response.response)
+            self.assertEqual(next(chunks), b"retry: 3000\n\n")
+            event = next(chunks).decode()
+            response.close()
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertTrue(event.startswith("event: snapshot\n"))
+        self.assertEqual([record["id"] for record in json.loads(event.split("data: ", 1)[1])["records"]], ["a"])
+        self.assertEqual(mock_page.call_args.kwargs["status"], "scheduled")
+        self.assertEqual(schedule.requested[0], ["a"])
+        self.assertEqual(hub.watching(), {})
+
+    @patch("app.fetch_video_schedule_page", return_value=([], None))
+    def test_empty_page_has_nothing_to_watch(self, mock_page):
+        """A page without records gets 204 so the browser does not reconnect."""
+        response = dashboard_app.app.test_client().get("/transcript/t1/events")
+        self.assertEqual(response.status_code, 204)
+
+
+if __name__ == '__main__':
+    unittest.main()
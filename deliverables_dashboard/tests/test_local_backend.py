@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite stand-in backend, driven through the real service functions.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from deliverables_dashboard.services import local_backend, supabase_service, video_schedule
+
+
+class TestLocalBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = local_backend.LocalBackend()
+        self.addCleanup(self.backend.close)
+        self.counts = local_backend.seed(
+            self.backend, users=2, transcripts_per_user=3, files_per_transcript=4, videos_per_transcript=5
+        )
+        supabase_service.signed_url_cache.clear()
+        supabase_service.user_file_cache.clear()
+        patcher = patch("deliverables_dashboard.services.supabase_service.get_supabase_client",
+                        return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_seed_inserts_synthetic_rows(self):
+        """Seeding is deterministic and reports the rows inserted."""
+        self.assertEqual(self.counts, {"transcript_files": 24, "video_schedule": 30})
+        again = local_backend.LocalBackend()
+        self.addCleanup(again.close)
+        local_backend.seed(again, users=2, transcripts_per_user=3, files_per_transcript=4, videos_per_transcript=5)
+        first = self.backend.table("video_schedule").select("id,published").order("id").execute().data
+        self.assertEqual(first, again.table("video_schedule").select("id,published").order("id").execute().data)
+        self.assertIsInstance(first[0]["published"], bool)
+
+    def test_keyset_pages_cover_every_file_once(self):
+        """File listings page through the keyset without gaps or repeats."""
+        pages = list(supabase_service.iter_user_file_pages("user-00000", page_size=5))
+
+        ids = [row["id"] for page in pages for row in page]
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 12)
+
+    def test_status_filters_and_bulk_review(self):
+        """Status filters and bulk updates run as SQL."""
+        pending = supabase_service.fetch_user_files("user-00001", status="pending")
+        ids = [row["id"] for row in pending][:2] + ["missing-id"]
+
+        result = supabase_service.reject_files(ids, reason="Too long")
+
+        self.assertEqual(result["missing"], ["missing-id"])
+        self.assertTrue(all(row["status"] == "rejected" for row in result["updated"]))
+        rejected = supabase_service.fetch_user_files("user-00001", status=["rejected"])
+        self.assertTrue(set(ids[:2]) <= {row["id"] for row in rejected})
+
+    def test_video_schedule_queries(self):
+        """Schedule paging, status filters and bulk retries work offline."""
+        with patch("deliverables_dashboard.services.video_schedule.supabase", self.backend):
+            records = video_schedule.fetch_video_schedule("t00000-00000")
+            failed = video_schedule.fetch_video_schedule("t00000-00000", status="failed")
+            first, cursor = video_schedule.fetch_video_schedule_page("t00000-00000", limit=2)
+            second, _ = video_schedule.fetch_video_schedule_page("t00000-00000", cursor=cursor, limit=2)
+            with patch.object(video_schedule, "RECORD_ID_BATCH_SIZE", 1):
+                by_id = video_schedule.fetch_video_records(
+                    "t00000-00000", [records[0]["id"], records[1]["id"], "missing"]
+                )
+            retried = video_schedule.retry_failed_videos(transcript_id="t00000-00000")
+            remaining = video_schedule.fetch_video_schedule("t00000-00000", status="failed")
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual([r["id"] for r in first + second], [r["id"] for r in records[:4]])
+        self.assertEqual(sorted(r["id"] for r in by_id), sorted(r["id"] for r in records[:2]))
+        self.assertEqual(retried, len(failed))
+        self.assertEqual(remaining, [])
+
+    def test_storage_signs_urls(self):
+        """Single and bulk signing return URLs for every path."""
+        url = supabase_service.get_signed_url("deliverables", "t1/clip.mp4")
+        urls = supabase_service.get_signed_urls([("deliverables", "a.md"), ("deliverables", "b.md")])
+
+        self.assertIn("/deliverables/t1/clip.mp4?", url)
+        self.assertEqual(len(urls), 2)
+
+    def test_unknown_columns_are_rejected(self):
+        """Column names are validated rather than interpolated blindly."""
+        with self.assertRaises(ValueError):
+            self.backend.table("transcript_files").select("id; DROP TABLE transcript_files")
+
+
+class TestBackendSelection(unittest.TestCase):
+    def setUp(self):
+        supabase_service.reset_supabase_client()
+        local_backend.reset_local_backend()
+        self.addCleanup(supabase_service.reset_supabase_client)
+        self.addCleanup(local_backend.reset_local_backend)
+
+    @patch.dict(os.environ, {"DASHBOARD_BACKEND": "local", "LOCAL_BACKEND_PATH": ":memory:"})
+    def test_configuration_selects_local_backend(self):
+        """DASHBOARD_BACKEND=local needs no Supabase credentials."""
+        client = supabase_service.get_supabase_client()
+        self.assertIsInstance(client, local_backend.LocalBackend)
+        self.assertIs(client, local_backend.get_local_backend())
+
+    @patch.dict(os.environ, {"LOCAL_BACKEND_PATH": ":memory:", "LOCAL_BACKEND_SEED": "1"})
+    def test_seed_flag_fills_an_empty_database(self):
+        """LOCAL_BACKEND_SEED seeds the backend when it is first opened."""
+        with patch.object(local_backend, "seed", wraps=local_backend.seed) as seed:
+            backend = local_backend.get_local_backend()
+            local_backend.get_local_backend()
+        seed.assert_called_once_with(backend)
+        self.assertFalse(backend.is_empty())
+
+    def test_seed_command_writes_a_database_file(self):
+        """The seed command fills a file that can be opened as LOCAL_BACKEND_PATH."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dashboard.db")
+            with patch("builtins.print"):
+                local_backend.main(["seed", path, "--users", "1", "--transcripts-per-user", "2"])
+            backend = local_backend.LocalBackend(path)
+            rows = backend.table("video_schedule").select("id").execute().data
+            backend.close()
+        self.assertEqual(len(rows), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
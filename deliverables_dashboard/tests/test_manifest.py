@@ -0,0 +1,169 @@
+"""
+Tests for the pooled, caching manifest fetcher.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import app as dashboard_app
+from deliverables_dashboard.services.manifest import (
+    ManifestFetcher, ManifestTooLargeError, fetch_manifest_text, MOCK_MANIFEST
+)
+
+
+def make_response(status_code, text="", headers=None):
+    body = text.encode("utf-8")
+    response = MagicMock()
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response.headers = headers or {}
+    response.iter_content.side_effect = lambda chunk_size=1: iter(
+        [body[i:i + 4] for i in range(0, len(body), 4)]
+    )
+    return response
+
+
+class TestManifestFetcher(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = ManifestFetcher()
+        self.session = MagicMock()
+        patcher = patch.object(self.fetcher, "_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = "https://example.com/manifest.md"
+
+    def test_repeat_fetch_is_conditional(self):
+        """A cached body is revalidated with its validators and reused on 304."""
+        self.session.get.side_effect = [
+            make_response(200, "# Manifest", {"ETag": '"abc"', "Last-Modified": "Tue, 15 Apr 2025 10:00:00 GMT"}),
+            make_response(304)
+        ]
+
+        self.assertEqual(self.fetcher.fetch(self.url), "# Manifest")
+        self.assertEqual(self.fetcher.fetch(self.url), "# Manifest")
+
+        second_headers = self.session.get.call_args_list[1].kwargs["headers"]
+        self.assertEqual(second_headers["If-None-Match"], '"abc"')
+        self.assertEqual(second_headers["If-Modified-Since"], "Tue, 15 Apr 2025 10:00:00 GMT")
+        self.assertEqual(self.session.get.call_args_list[0].kwargs["timeout"], self.fetcher.timeout)
+
+    def test_stream_yields_chunks_and_caches_complete_body(self):
+        """Streamed bodies arrive incrementally and are cached once complete."""
+        self.session.get.side_effect = [
+            make_response(200, "plain text ✓ manifest", {"ETag": '"v1"'}),
+            make_response(304)
+        ]
+
+        chunks = list(self.fetcher.stream(self.url))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), "plain text ✓ manifest")
+        self.assertTrue(self.session.get.call_args.kwargs["stream"])
+        self.assertEqual(self.fetcher.fetch(self.url), "plain text ✓ manifest")
+
+    def test_byte_cap_stops_download(self):
+        """Bodies larger than the cap raise and are not cached."""
+        response = make_response(200, "x" * 64)
+        self.session.get.return_value = response
+
+        with self.assertRaises(ManifestTooLargeError):
+            self.fetcher.fetch(self.url, max_bytes=16, read_timeout=2)
+        response.close.assert_called()
+        self.assertEqual(self.session.get.call_args.kwargs["timeout"], (self.fetcher.timeout[0], 2))
+        self.assertEqual(len(self.fetcher._bodies), 0)
+
+    def test_error_status_raises(self):
+        """Non-200 responses without a cached copy raise."""
+        self.session.get.return_value = make_response(404)
+        with self.assertRaises(Exception):
+            self.fetcher.fetch(self.url)
+
+    @patch("markdown.markdown", return_value="<h1>Manifest</h1>")
+    def test_rendered_html_is_cached_by_content(self, mock_markdown):
+        """Identical content is only converted once."""
+        self.assertEqual(self.fetcher.render_markdown("# Manifest"), "<h1>Manifest</h1>")
+        self.assertEqual(self.fetcher.render_markdown("# Manifest"), "<h1>Manifest</h1>")
+        self.assertEqual(mock_markdown.call_count, 1)
+
+    def test_prefetched_manifest_is_served_from_memory(self):
+        """Prefetched bodies within the freshness window skip the network."""
+        self.fetcher.fresh_seconds = 60
+        self.session.get.return_value = make_response(200, "# Prefetched")
+
+        futures = self.fetcher.prefetch([self.url, self.url])
+        self.assertEqual(len(futures), 1)
+        futures[0].result(timeout=5)
+
+        self.assertEqual(self.fetcher.fetch(self.url), "# Prefetched")
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(self.fetcher.prefetch([self.url]), [])
+
+    def test_prefetch_is_capped_per_call(self):
+        """One call schedules at most max_prefetch downloads."""
+        self.fetcher.max_prefetch = 2
+        self.session.get.return_value = make_response(200, "# Body")
+        urls = [f"https://example.com/manifest/{index}.md" for index in range(5)]
+
+        futures = self.fetcher.prefetch(urls)
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(len(futures), 2)
+
+    def test_body_cache_is_bounded_by_bytes(self):
+        """Older bodies are evicted once the cached text exceeds max_bytes."""
+        self.fetcher._bodies.max_bytes = 10
+        self.session.get.side_effect = [make_response(200, "123456"), make_response(200, "abcdef")]
+
+        self.fetcher.fetch("https://example.com/manifest/a.md")
+        self.fetcher.fetch("https://example.com/manifest/b.md")
+
+        self.assertEqual(len(self.fetcher._bodies), 1)
+        self.assertEqual(self.fetcher._bodies.total_bytes, 6)
+        self.assertIsNotNone(self.fetcher._bodies.get("https://example.com/manifest/b.md"))
+
+    def test_prefetch_failures_are_swallowed(self):
+        """A failed prefetch is logged and leaves nothing cached."""
+        self.session.get.side_effect = ConnectionError("unreachable")
+        futures = self.fetcher.prefetch([self.url])
+        self.assertIsNone(futures[0].result(timeout=5))
+        self.assertEqual(len(self.fetcher._bodies), 0)
+
+    def test_mock_manifest_for_test_urls(self):
+        """Test URLs never hit the network."""
+        self.assertEqual(fetch_manifest_text("https://example.com/manifest/test123.md"), MOCK_MANIFEST)
+
+
+class TestManifestRoute(unittest.TestCase):
+    def setUp(self):
+        self.client = dashboard_app.app.test_client()
+        dashboard_app.page_cache.clear()
+
+    @patch("app.prefetch_manifests")
+    @patch("app.fetch_video_schedule_page")
+    def test_transcript_page_prefetches_manifests(self, mock_fetch, mock_prefetch):
+        """Rendering a transcript page schedules its manifest URLs for prefetch."""
+        mock_fetch.return_value = ([
+            {"id": "a", "platform": "website", "manifest_url": "https://example.com/a.md"},
+            {"id": "b", "platform": "YouTube", "manifest_url": None}
+        ], None)
+        self.client.get("/transcript/prefetch-test")
+        urls = list(mock_prefetch.call_args.args[0])
+        self.assertEqual(urls, ["https://example.com/a.md", None])
+
+    @patch("app.stream_manifest_text")
+    def test_plain_text_is_streamed_with_truncation_notice(self, mock_stream):
+        """A download that fails part way still completes the page with a notice."""
+        def chunks():
+            yield "first <chunk>"
+            raise ManifestTooLargeError("Manifest exceeds the 16 byte limit")
+        mock_stream.return_value = chunks()
+
+        response = self.client.get("/manifest?url=https://example.com/manifest.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        body = response.get_data(as_text=True)
+        self.assertIn("first &lt;chunk&gt;", body)
+        self.assertIn("[Manifest truncated: Manifest exceeds the 16 byte limit]", body)
+        self.assertEqual(mock_stream.call_args.kwargs["max_bytes"], dashboard_app.app.config["MANIFEST_MAX_BYTES"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the internal metrics registry and the /metrics endpoint.
+"""
+import unittest
+
+import app as dashboard_app
+from deliverables_dashboard.file_registry import scan_drafts
+from deliverables_dashboard.utils.metrics import MetricsRegistry, observe_supabase, REGISTRY, SUPABASE_CALLS
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_counter_and_histogram_exposition(self):
+        """Metrics render in the Prometheus text format with cumulative buckets."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run.", ("kind",))
+        histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+        counter.labels("scan").inc()
+        counter.labels(kind='say "hi"').inc(2)
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        text = registry.render()
+        self.assertIn("# TYPE jobs_total counter", text)
+        self.assertIn('jobs_total{kind="scan"} 1', text)
+        self.assertIn('jobs_total{kind="say \\"hi\\""} 2', text)
+        self.assertIn('job_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('job_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('job_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("job_seconds_count 3", text)
+
+    def test_conflicting_registration_is_rejected(self):
+        """Re-registering a name with a different shape fails."""
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs run.")
+        self.assertIs(registry.counter("jobs_total", "Jobs run."), registry.counter("jobs_total", "Jobs run."))
+        with self.assertRaises(ValueError):
+            registry.histogram("jobs_total", "Jobs run.")
+
+    def test_supabase_errors_are_counted(self):
+        """Failed calls are counted with an error outcome and still re-raised."""
+        with self.assertRaises(RuntimeError):
+            with observe_supabase("metrics_test", "select"):
+                raise RuntimeError("down")
+        self.assertEqual(SUPABASE_CALLS.labels("metrics_test", "select", "error").value, 1)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_metrics_endpoint_reports_routes_and_pipeline(self):
+        """Route and pipeline timings appear on /metrics."""
+        client = dashboard_app.app.test_client()
+        client.get("/manifest")
+        scan_drafts("/nonexistent-directory")
+
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        text = response.get_data(as_text=True)
+        self.assertIn('dashboard_http_requests_total{route="/manifest",method="GET",status="400"}', text)
+        self.assertIn('dashboard_http_request_duration_seconds_count{route="/manifest"}', text)
+        self.assertIn('dashboard_pipeline_duration_seconds_count{operation="scan"}', text)
+        self.assertIs(REGISTRY, dashboard_app.REGISTRY)
+
+
+if __name__ == '__main__':
+    unittest.main()
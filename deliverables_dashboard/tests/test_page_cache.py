@@ -0,0 +1,213 @@
+"""
+Tests for the per-transcript dashboard page cache and the record card fragment cache.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import app as dashboard_app
+from deliverables_dashboard.services.page_cache import FragmentCache, TranscriptPageCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTranscriptPageCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TranscriptPageCache(ttl_seconds=10, clock=self.clock)
+        self.records = [{"id": "vid_1"}, {"id": "vid_2"}]
+
+    def test_entry_expires_after_ttl(self):
+        """Entries are served until the TTL elapses."""
+        self.cache.set("t1", self.records, "<html>")
+        self.clock.now = 9.9
+        self.assertIsNotNone(self.cache.get("t1"))
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("t1"))
+
+    def test_invalidate_video_only_drops_affected_transcripts(self):
+        """Invalidating by video ID leaves unrelated transcripts cached."""
+        self.cache.set("t1", self.records, "<html>1")
+        self.cache.set("t2", [{"id": "vid_3"}], "<html>2")
+        self.assertEqual(self.cache.invalidate_video("vid_2"), ["t1"])
+        self.assertIsNone(self.cache.get("t1"))
+        self.assertIsNotNone(self.cache.get("t2"))
+
+    def test_stale_generation_is_not_stored(self):
+        """Pages rendered before an invalidation are discarded."""
+        generation = self.cache.generation
+        self.cache.invalidate("t1")
+        self.cache.set("t1", self.records, "<html>", generation=generation)
+        self.assertIsNone(self.cache.get("t1"))
+
+    def test_pages_are_bounded_across_transcripts(self):
+        """The least recently used page is evicted once max_entries is reached."""
+        cache = TranscriptPageCache(ttl_seconds=10, max_entries=2, clock=self.clock)
+        cache.set("t1", self.records, "<html>1")
+        cache.set("t1", self.records, "<html>1f", variant="failed")
+        cache.get("t1")
+        cache.set("t2", self.records, "<html>2")
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("t1"))
+        self.assertIsNone(cache.get("t1", "failed"))
+
+    def test_set_sweeps_expired_pages(self):
+        """Expired pages are dropped on write even if nobody reads them again."""
+        self.cache.set("t1", self.records, "<html>1")
+        self.cache.set("t1", self.records, "<html>1f", variant="failed")
+        self.clock.now = 10
+        self.cache.set("t2", self.records, "<html>2")
+        self.assertEqual(len(self.cache), 1)
+
+    def test_zero_ttl_disables_caching(self):
+        """A non-positive TTL never stores entries."""
+        cache = TranscriptPageCache(ttl_seconds=0, clock=self.clock)
+        entry = cache.set("t1", self.records, "<html>")
+        self.assertEqual(entry.etag, TranscriptPageCache.make_etag("<html>"))
+        self.assertIsNone(cache.get("t1"))
+
+
+class TestTranscriptRouteCaching(unittest.TestCase):
+    def setUp(self):
+        dashboard_app.page_cache.clear()
+        self.client = dashboard_app.app.test_client()
+        self.records = [{
+            "id": "vid_9",
+            "platform": "Vimeo",
+            "scheduled_at": "2025-04-17T09:00:00Z",
+            "published": False,
+            "publish_url": None,
+            "manifest_url": None,
+            "publish_error": "Network timeout"
+        }]
+
+    @patch("app.fetch_video_schedule_page")
+    def test_repeat_views_are_served_from_cache(self, mock_fetch):
+        """The schedule is fetched once and browsers can revalidate with ETags."""
+        mock_fetch.return_value = (self.records, None)
+
+        first = self.client.get("/transcript/t1")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+
+        second = self.client.get("/transcript/t1")
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers["ETag"], etag)
+
+        revalidated = self.client.get("/transcript/t1", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch("app.fetch_video_schedule_page")
+    def test_large_pages_are_streamed_then_cached(self, mock_fetch):
+        """Pages over the buffering threshold stream without an ETag; cache hits get one."""
+        mock_fetch.return_value = (self.records, None)
+        with patch.dict(dashboard_app.app.config, {"TRANSCRIPT_STREAM_MIN_RECORDS": 0}):
+            first = self.client.get("/transcript/t1")
+            self.assertNotIn("ETag", first.headers)
+            first_body = first.get_data()
+
+            second = self.client.get("/transcript/t1")
+        self.assertEqual(second.get_data(), first_body)
+        self.assertIn("ETag", second.headers)
+
+    @patch("app.fetch_video_schedule_page")
+    def test_filters_are_cached_separately(self, mock_fetch):
+        """Each filter and page combination is its own cache entry."""
+        mock_fetch.return_value = (self.records, None)
+
+        for url in ("/transcript/t1", "/transcript/t1?status=failed", "/transcript/t1?status=failed"):
+            self.client.get(url).get_data()
+
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(mock_fetch.call_args.kwargs["status"], "failed")
+
+    @patch("app.fetch_video_schedule_page")
+    def test_retry_all_form_keeps_platform_filter(self, mock_fetch):
+        """The retry-all form only resets failures on the filtered platform."""
+        mock_fetch.return_value = (self.records, None)
+
+        body = self.client.get("/transcript/t1?platform=Vimeo").get_data(as_text=True)
+
+        self.assertIn('<input type="hidden" name="platform" value="Vimeo">', body)
+
+    @patch("app.retry_video")
+    @patch("app.fetch_video_schedule_page")
+    def test_retry_invalidates_transcript(self, mock_fetch, mock_retry):
+        """Retrying an upload forces the next view to refetch the schedule."""
+        mock_fetch.return_value = (self.records, None)
+
+        self.client.get("/transcript/t1").get_data()
+        response = self.client.post("/retry", data={"video_id": "vid_9", "transcript_id": "t1"})
+        self.assertEqual(response.status_code, 302)
+
+        self.client.get("/transcript/t1")
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
+class TestFragmentCache(unittest.TestCase):
+    def test_fragments_are_keyed_by_content(self):
+        """Equal context reuses the HTML; any changed field renders again."""
+        cache = FragmentCache(max_entries=2)
+        render = MagicMock(side_effect=lambda template, **context: f"<li>{context['record']['id']}</li>")
+
+        cache.render("card.html", render, record={"id": "a", "published": False})
+        cache.render("card.html", render, record={"published": False, "id": "a"})
+        cache.render("card.html", render, record={"id": "a", "published": True})
+
+        self.assertEqual(render.call_count, 2)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = FragmentCache(max_entries=2)
+        render = MagicMock(return_value="<li>")
+        for record_id in ("a", "b", "a", "c", "a"):
+            cache.render("card.html", render, record_id=record_id)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(render.call_count, 3)
+
+
+class TestRecordCardFragments(unittest.TestCase):
+    def setUp(self):
+        dashboard_app.fragment_cache.clear()
+        self.records = [
+            {"id": f"vid_{index}", "platform": "website", "scheduled_at": "2025-04-17T09:00:00Z",
+             "published": index % 2 == 0, "publish_url": f"https://example.com/{index}",
+             "manifest_url": None, "publish_error": None if index % 2 == 0 else "Network timeout"}
+            for index in range(4)
+        ]
+
+    def render_page(self):
+        with dashboard_app.app.test_request_context("/transcript/t1"):
+            return dashboard_app.render_template("dashboard.html", transcript_id="t1", video_records=self.records)
+
+    def test_only_changed_cards_are_rendered_again(self):
+        """A page is assembled from cached cards, re-rendering just the changed record."""
+        with patch("app._render_fragment", wraps=dashboard_app._render_fragment) as render:
+            first = self.render_page()
+            self.assertEqual(self.render_page(), first)
+            self.records[1] = dict(self.records[1], published=True, publish_error=None)
+            changed = self.render_page()
+
+        self.assertEqual(render.call_count, 5)
+        self.assertNotEqual(changed, first)
+        dashboard_app.fragment_cache.clear()
+        self.assertEqual(self.render_page(), changed)
+
+    def test_card_markup(self):
+        """Cached cards are inserted as HTML, with record values escaped once."""
+        self.records = [dict(self.records[1], publish_error="<b>quota</b>")]
+        html = self.render_page()
+        self.assertIn('<li class="record-item" data-record-id="vid_1">', html)
+        self.assertIn("Error: &lt;b&gt;quota&lt;/b&gt;", html)
+        self.assertIn("Retry Upload", html)
+        self.assertIn("Copy Embed Code", html)
+
+
+if __name__ == '__main__':
+    unittest.main()
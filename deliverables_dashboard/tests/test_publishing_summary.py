@@ -0,0 +1,139 @@
+"""
+Tests for the materialized cross-transcript publishing summary.
+"""
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import app as dashboard_app
+from deliverables_dashboard.services import local_backend, publishing_summary
+from deliverables_dashboard.services.publishing_summary import PublishingSummary, classify
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPublishingSummary(unittest.TestCase):
+    def setUp(self):
+        self.backend = local_backend.LocalBackend()
+        self.addCleanup(self.backend.close)
+        local_backend.seed(self.backend, users=2, transcripts_per_user=5, files_per_transcript=0,
+                           videos_per_transcript=6)
+        patcher = patch.object(publishing_summary, "supabase", self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clock = FakeClock()
+        self.summary = PublishingSummary(refresh_seconds=15, page_size=7, recount_batch=2, clock=self.clock)
+
+    def expected_totals(self):
+        rows = self.backend.table("video_schedule").select("*").execute().data
+        return Counter(classify(row) for row in rows)
+
+    def test_first_refresh_counts_everything(self):
+        """The initial build matches a direct count over every row."""
+        self.assertEqual(self.summary.refresh(), 10)
+        snapshot = self.summary.snapshot()
+
+        self.assertEqual(snapshot["transcripts"], 10)
+        self.assertEqual(Counter(snapshot["totals"]), self.expected_totals())
+        self.assertEqual(sorted(snapshot["platforms"]), ["Instagram", "LinkedIn", "TikTok", "YouTube"])
+        failed = [row["failed"] for row in snapshot["needs_attention"]]
+        self.assertEqual(failed, sorted(failed, reverse=True))
+
+    def test_refresh_applies_only_changed_rows(self):
+        """A retry is reflected by recounting only the transcripts that changed."""
+        self.summary.refresh()
+        failed = self.backend.table("video_schedule").select("id,transcript_id").eq("published", False) \
+            .not_.is_("publish_error", "null").limit(1).execute().data[0]
+
+        self.backend.table("video_schedule").update({"publish_error": None}).eq("id", failed["id"]).execute()
+        self.assertEqual(self.summary.refresh(), 0)
+        self.clock.now += 15
+        recounted = self.summary.refresh()
+
+        self.assertLess(recounted, 10)
+        self.assertEqual(Counter(self.summary.snapshot()["totals"]), self.expected_totals())
+
+    def test_background_refresh(self):
+        """start_refresh builds on another thread and does nothing until the next is due."""
+        self.assertTrue(self.summary.snapshot()["building"])
+        self.assertTrue(self.summary.start_refresh())
+        self.summary.wait(5)
+
+        snapshot = self.summary.snapshot()
+        self.assertFalse(snapshot["building"])
+        self.assertEqual(snapshot["transcripts"], 10)
+        self.assertFalse(self.summary.start_refresh())
+
+    def test_background_failure_is_reported(self):
+        """A failed background build leaves the summary building and reports the error."""
+        with patch.object(PublishingSummary, "_scan", side_effect=RuntimeError("backend down")):
+            self.summary.start_refresh()
+            self.summary.wait(5)
+        snapshot = self.summary.snapshot()
+        self.assertTrue(snapshot["building"])
+        self.assertEqual(snapshot["error"], "backend down")
+
+    def test_failed_refresh_keeps_previous_counts(self):
+        """A query failure leaves the last counts in place."""
+        self.summary.refresh()
+        before = self.summary.snapshot()
+        self.clock.now += 15
+        with patch.object(PublishingSummary, "_scan", side_effect=RuntimeError("backend down")):
+            with self.assertRaises(RuntimeError):
+                self.summary.refresh()
+        self.assertEqual(self.summary.snapshot()["totals"], before["totals"])
+
+
+class TestOverviewViews(unittest.TestCase):
+    def setUp(self):
+        self.client = dashboard_app.app.test_client()
+        self.backend = local_backend.LocalBackend()
+        self.addCleanup(self.backend.close)
+        local_backend.seed(self.backend, users=1, transcripts_per_user=3, files_per_transcript=0,
+                           videos_per_transcript=4)
+        patcher = patch.object(publishing_summary, "supabase", self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        publishing_summary.publishing_summary.clear()
+        self.addCleanup(publishing_summary.publishing_summary.clear)
+
+    def test_overview_page_and_api(self):
+        """The overview answers at once while building, then serves the counts."""
+        with patch.object(publishing_summary.publishing_summary, "start_refresh"):
+            building = self.client.get("/overview")
+        self.assertEqual(building.status_code, 200)
+        self.assertIn(b"being built", building.data)
+
+        self.client.get("/api/overview")
+        publishing_summary.publishing_summary.wait(5)
+        page = self.client.get("/overview")
+        body = self.client.get("/api/overview").get_json()
+
+        self.assertEqual(page.status_code, 200)
+        self.assertIn(b"Publishing Overview", page.data)
+        self.assertFalse(body["building"])
+        self.assertEqual(body["transcripts"], 3)
+        self.assertEqual(sum(body["totals"].values()), 12)
+
+    def test_overview_is_served_stale_when_refresh_fails(self):
+        """Once built, the overview keeps answering while the backend is down."""
+        self.client.get("/api/overview")
+        publishing_summary.publishing_summary.wait(5)
+        with patch.object(publishing_summary.publishing_summary, "refresh", side_effect=RuntimeError("down")), \
+                patch.object(publishing_summary.publishing_summary, "_due", return_value=True):
+            self.client.get("/api/overview")
+            publishing_summary.publishing_summary.wait(5)
+            response = self.client.get("/api/overview")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["transcripts"], 3)
+        self.assertEqual(response.get_json()["error"], "down")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for call deadlines, hedged reads and circuit breakers.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import app as dashboard_app
+from deliverables_dashboard.services import supabase_service
+from deliverables_dashboard.utils.resilience import (
+    BACKEND_CALL_EVENTS, CircuitBreaker, CircuitOpenError, DeadlineExceeded, ResilientCaller
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def events(operation):
+    return {event: int(counter.value) for (name, event), counter in BACKEND_CALL_EVENTS.children()
+            if name == operation}
+
+
+def fail():
+    raise RuntimeError("backend down")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, open_seconds=10,
+                                      slow_call_seconds=1.0, clock=self.clock)
+
+    def test_opens_on_failures_and_slow_calls(self):
+        """Errors and slow successes both count towards opening the circuit."""
+        self.breaker.record(0.1)
+        self.breaker.record(0.1)
+        self.breaker.record(0.1, RuntimeError())
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(2.0)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_probe_decides(self):
+        """After the open period one probe is let through; its outcome closes or reopens."""
+        for _ in range(4):
+            self.breaker.record(0.1, RuntimeError())
+        self.clock.now += 10
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record(0.1, RuntimeError())
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(0.1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestResilientCaller(unittest.TestCase):
+    def setUp(self):
+        self.caller = ResilientCaller(
+            max_workers=4, hedge_reads=True, hedge_min_samples=3, hedge_min_delay=0.01,
+            breaker_factory=lambda: CircuitBreaker(window=4, min_calls=4)
+        )
+
+    def test_deadline_exceeded(self):
+        """A call that outlives its deadline raises instead of blocking the caller."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.assertRaises(DeadlineExceeded):
+            self.caller.call("test:deadline", lambda: release.wait(5), deadline=0.05)
+        self.assertEqual(events("test:deadline").get("timeout"), 1)
+
+    def test_open_circuit_fails_fast(self):
+        """Once enough calls fail the backend is not called at all."""
+        for _ in range(4):
+            with self.assertRaises(RuntimeError):
+                self.caller.write("test:open", fail)
+        backend = MagicMock()
+
+        with self.assertRaises(CircuitOpenError):
+            self.caller.write("test:open", backend)
+
+        backend.assert_not_called()
+        self.assertEqual(self.caller.stats()["test:open"]["state"], CircuitBreaker.OPEN)
+
+    def test_slow_read_is_hedged(self):
+        """A read running past the observed p95 gets a duplicate, and the first answer wins."""
+        for _ in range(3):
+            self.caller.read("test:hedge", lambda: "warm")
+        release = threading.Event()
+        self.addCleanup(release.set)
+        attempts = []
+
+        def read():
+            attempts.append(1)
+            if len(attempts) == 1:
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        self.assertEqual(self.caller.read("test:hedge", read), "fast")
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(events("test:hedge").get("hedge_won"), 1)
+
+    def test_writes_are_never_hedged(self):
+        """Writes run once even when they are slow."""
+        for _ in range(3):
+            self.caller.write("test:write", lambda: None)
+        calls = []
+        self.caller.write("test:write", lambda: calls.append(time.sleep(0.1)))
+        self.assertEqual(len(calls), 1)
+
+    def test_writes_have_no_deadline(self):
+        """A write slower than the read deadline is waited for, not abandoned."""
+        self.caller.read_deadline = 0.01
+        self.assertEqual(self.caller.write("test:slow-write", lambda: time.sleep(0.05) or "done"), "done")
+
+
+@patch("deliverables_dashboard.services.supabase_service.get_supabase_client")
+class TestStaleListings(unittest.TestCase):
+    def setUp(self):
+        supabase_service.user_file_cache.clear()
+        self.addCleanup(supabase_service.user_file_cache.clear)
+
+    def test_expired_listing_is_served_when_backend_fails(self, mock_get_client):
+        """A failing listing read falls back to the expired cached copy."""
+        rows = [{"id": "a", "user_id": "u1", "transcript_id": "t1", "status": "pending"}]
+        supabase_service.user_file_cache.set("u1", None, rows)
+        with patch.object(supabase_service.user_file_cache, "get", return_value=None):
+            mock_get_client.return_value.table.side_effect = RuntimeError("backend down")
+
+            self.assertEqual(supabase_service.fetch_user_files("u1"), rows)
+            with self.assertRaises(Exception):
+                supabase_service.fetch_user_files("u2")
+
+
+class TestResilienceView(unittest.TestCase):
+    def test_stats_are_exposed(self):
+        """The resilience endpoint reports per-operation state as JSON."""
+        response = dashboard_app.app.test_client().get("/resilience")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.get_json(), dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
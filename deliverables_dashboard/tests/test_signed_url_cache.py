@@ -0,0 +1,84 @@
+"""
+Tests for the expiry-aware signed URL cache.
+"""
+import unittest
+
+from deliverables_dashboard.services.signed_url_cache import InMemoryBackend, KeyValueBackend, SignedUrlCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeKeyValueStore:
+    """Minimal stand-in for a Redis client."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestSignedUrlCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SignedUrlCache(safety_margin=300, clock=self.clock)
+
+    def test_url_is_reused_until_safety_margin(self):
+        """URLs are served until safety_margin seconds before they expire."""
+        self.cache.set("videos", "a.mp4", 3600, "https://signed/a")
+        self.clock.now += 3299
+        self.assertEqual(self.cache.get("videos", "a.mp4", 3600), "https://signed/a")
+        self.clock.now += 1
+        self.assertIsNone(self.cache.get("videos", "a.mp4", 3600))
+
+    def test_key_includes_expiry(self):
+        """A URL signed for one lifetime is not reused for another."""
+        self.cache.set("videos", "a.mp4", 3600, "https://signed/a")
+        self.assertIsNone(self.cache.get("videos", "a.mp4", 7200))
+
+    def test_short_lived_urls_are_not_cached(self):
+        """URLs that would already be inside the safety margin are skipped."""
+        self.cache.set("videos", "a.mp4", 60, "https://signed/a")
+        self.assertIsNone(self.cache.get("videos", "a.mp4", 60))
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        """The in-memory backend honours both its entry and byte bounds."""
+        backend = InMemoryBackend(max_entries=2)
+        backend.set(("b", "1", 60), "u1", 1)
+        backend.set(("b", "2", 60), "u2", 1)
+        backend.get(("b", "1", 60))
+        backend.set(("b", "3", 60), "u3", 1)
+        self.assertIsNone(backend.get(("b", "2", 60)))
+        self.assertIsNotNone(backend.get(("b", "1", 60)))
+
+        small = InMemoryBackend(max_bytes=20)
+        small.set(("b", "1", 60), "x" * 10, 1)
+        small.set(("b", "2", 60), "y" * 10, 1)
+        self.assertEqual(len(small), 1)
+
+    def test_shared_backend_round_trip(self):
+        """Entries written through a key-value store carry a TTL and read back intact."""
+        store = FakeKeyValueStore()
+        cache = SignedUrlCache(backend=KeyValueBackend(store, clock=self.clock), clock=self.clock)
+        cache.set("videos", "a.mp4", 3600, "https://signed/a")
+
+        self.assertEqual(list(store.ttls.values()), [3600])
+        self.assertEqual(cache.get("videos", "a.mp4", 3600), "https://signed/a")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for single-flight coalescing of concurrent reads.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from deliverables_dashboard.services import video_schedule
+from deliverables_dashboard.utils.singleflight import COALESCED_CALLS, SingleFlight, copy_rows
+
+
+def wait_for_waiters(group, count, timeout=2.0):
+    """Block until ``count`` callers have joined an in-flight call in ``group``."""
+    deadline = time.monotonic() + timeout
+    while COALESCED_CALLS.labels(group).value < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_concurrently(self, flight, fn, callers=8, **kwargs):
+        """Start a leader, let the others join it, then release the leader."""
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do("key", fn, **kwargs))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        threads[0].start()
+        self.started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        wait_for_waiters(flight.name, callers - 1)
+        self.release.set()
+        for thread in threads:
+            thread.join(2)
+        return results, errors
+
+    def setUp(self):
+        COALESCED_CALLS.clear()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self, value=None, error=None):
+        def fn():
+            self.calls += 1
+            self.started.set()
+            self.release.wait(2)
+            if error:
+                raise error
+            return value
+        return fn
+
+    def test_concurrent_callers_share_one_call(self):
+        """Every concurrent caller receives the single call's result."""
+        flight = SingleFlight("test")
+        results, errors = self.run_concurrently(flight, self.slow([{"id": "1"}]), share=copy_rows)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [[{"id": "1"}]] * 8)
+        self.assertEqual(len({id(result[0]) for result in results}), 8)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_reach_every_waiter(self):
+        """A failing call fails all of its waiters with the same error."""
+        flight = SingleFlight("test")
+        results, errors = self.run_concurrently(flight, self.slow(error=RuntimeError("boom")), callers=4)
+
+        self.assertEqual(results, [])
+        self.assertEqual([str(e) for e in errors], ["boom"] * 4)
+
+    def test_waiters_time_out(self):
+        """Waiters give up after their timeout while the leader carries on."""
+        flight = SingleFlight("test")
+        leader = threading.Thread(target=flight.do, args=("key", self.slow("done")))
+        leader.start()
+        self.started.wait(1)
+
+        with self.assertRaises(TimeoutError):
+            flight.do("key", lambda: "other", timeout=0.01)
+
+        self.release.set()
+        leader.join(2)
+        self.assertEqual(flight.do("key", lambda: "fresh"), "fresh")
+
+    def test_sequential_calls_are_not_cached(self):
+        """Once a call finishes the next caller runs its own."""
+        flight = SingleFlight("test")
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+
+
+class TestCoalescedScheduleReads(unittest.TestCase):
+    @patch("deliverables_dashboard.services.video_schedule.supabase")
+    def test_identical_page_requests_share_a_query(self, mock_supabase):
+        """Simultaneous dashboard loads for a transcript issue one query."""
+        COALESCED_CALLS.clear()
+        release = threading.Event()
+        query = MagicMock()
+        for method in ("select", "eq", "order", "limit"):
+            getattr(query, method).return_value = query
+
+        def execute():
+            release.wait(2)
+            return MagicMock(data=[{"id": "1", "scheduled_at": "2025-04-10T10:00:00Z"}])
+
+        query.execute.side_effect = execute
+        mock_supabase.table.return_value = query
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(video_schedule.fetch_video_schedule_page("t1")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_for_waiters("supabase", 4)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(query.execute.call_count, 1)
+        self.assertEqual(len({id(records[0]) for records, _ in results}), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,8 @@ logger = setup_logger()
 class TestSupabaseIntegration(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
+        supabase_service.signed_url_cache.clear()
+        supabase_service.user_file_cache.clear()
         self.dashboard = DashboardController()
         self.test_user_id = "test-user-123"
         self.test_transcript_id = "test-transcript-456"
@@ -35,7 +37,7 @@ class TestSupabaseIntegration(unittest.TestCase):
         """Test file metadata retrieval functionality."""
         # Setup mock client
         mock_client = MagicMock()
-        mock_client.table().select().eq().execute.return_value.data = [self.mock_file]
+        mock_client.table().select().eq().order().order().limit().execute.return_value.data = [self.mock_file]
         
         # Mock storage signed URL
         mock_storage = MagicMock()
@@ -66,7 +68,7 @@ class TestSupabaseIntegration(unittest.TestCase):
         mock_client.storage.from_().create_signed_url.return_value = {
             'signedURL': mock_signed_url
         }
-        mock_client.table().select().eq().execute.return_value.data = [self.mock_file]
+        mock_client.table().select().eq().order().order().limit().execute.return_value.data = [self.mock_file]
         mock_get_client.return_value = mock_client
         
         # Test URL generation
@@ -0,0 +1,227 @@
+"""
+Tests for the shared Supabase client in supabase_service.
+"""
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from deliverables_dashboard import supabase_client
+from deliverables_dashboard.services import supabase_service
+
+CREDENTIALS = {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_SERVICE_ROLE_KEY": "service-key"}
+
+
+class TestSharedClient(unittest.TestCase):
+    def setUp(self):
+        supabase_service.reset_supabase_client()
+        self.addCleanup(supabase_service.reset_supabase_client)
+
+    @patch.dict(os.environ, CREDENTIALS)
+    @patch("deliverables_dashboard.services.supabase_service.build_client")
+    def test_client_is_built_once_across_threads(self, mock_build):
+        """Concurrent callers share a single client."""
+        mock_build.side_effect = lambda url, key: MagicMock()
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(supabase_service.get_supabase_client()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
+        mock_build.assert_called_once_with("https://example.supabase.co", "service-key")
+
+    @patch.dict(os.environ, CREDENTIALS)
+    @patch("deliverables_dashboard.services.supabase_service.build_client")
+    def test_forked_process_builds_its_own_client(self, mock_build):
+        """A change of process ID discards the parent's client."""
+        mock_build.side_effect = lambda url, key: MagicMock()
+        parent_client = supabase_service.get_supabase_client()
+        with patch("deliverables_dashboard.services.supabase_service.os.getpid", return_value=-1):
+            child_client = supabase_service.get_supabase_client()
+
+        self.assertIsNot(parent_client, child_client)
+        self.assertEqual(mock_build.call_count, 2)
+
+    @patch.dict(os.environ, {"SUPABASE_URL": "", "SUPABASE_SERVICE_ROLE_KEY": ""})
+    def test_missing_credentials_raise(self):
+        """Missing environment variables are reported on first use."""
+        with self.assertRaises(EnvironmentError):
+            supabase_service.get_supabase_client()
+
+    @patch.dict(os.environ, CREDENTIALS)
+    def test_client_uses_configured_timeouts(self):
+        """The real client is created with the service timeouts."""
+        client = supabase_service.get_supabase_client()
+        self.assertEqual(client.options.postgrest_client_timeout, supabase_service.SUPABASE_TIMEOUT)
+        self.assertEqual(client.options.storage_client_timeout, supabase_service.SUPABASE_TIMEOUT)
+
+
+class TestAnonClient(unittest.TestCase):
+    @patch.dict(os.environ, {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_ANON_KEY": "anon-key"})
+    def test_anon_client_uses_configured_timeouts(self):
+        """The client behind the schedule writes is bounded like the service client."""
+        with patch.object(supabase_client, "_client", None):
+            client = supabase_client.get_supabase()
+        self.assertEqual(client.options.postgrest_client_timeout, supabase_client.SUPABASE_TIMEOUT)
+        self.assertEqual(client.options.storage_client_timeout, supabase_client.SUPABASE_TIMEOUT)
+
+
+class TestBatchedSignedUrls(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("deliverables_dashboard.services.supabase_service.get_supabase_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.buckets = {}
+        self.client.storage.from_.side_effect = lambda bucket: self.buckets.setdefault(bucket, MagicMock())
+        supabase_service.signed_url_cache.clear()
+        self.addCleanup(supabase_service.signed_url_cache.clear)
+
+    @staticmethod
+    def bulk_result(paths, expiry):
+        return [{"path": path, "signedURL": f"https://signed/{path}", "error": None} for path in paths]
+
+    @patch("deliverables_dashboard.services.supabase_service.SIGNED_URL_BATCH_SIZE", 2)
+    def test_paths_are_signed_per_bucket_in_batches(self):
+        """Each bucket is signed with bulk calls of at most SIGNED_URL_BATCH_SIZE paths."""
+        videos = self.client.storage.from_("videos")
+        docs = self.client.storage.from_("docs")
+        videos.create_signed_urls.side_effect = self.bulk_result
+        docs.create_signed_urls.side_effect = self.bulk_result
+
+        files = [("videos", "a.mp4"), ("videos", "b.mp4"), ("videos", "c.mp4"), ("docs", "d.md"), ("videos", "a.mp4")]
+        urls = supabase_service.get_signed_urls(files, 600)
+
+        self.assertEqual(urls[("videos", "c.mp4")], "https://signed/c.mp4")
+        self.assertEqual(len(urls), 4)
+        self.assertEqual(videos.create_signed_urls.call_count, 2)
+        docs.create_signed_urls.assert_called_once_with(["d.md"], 600)
+        videos.create_signed_url.assert_not_called()
+
+    def test_unsigned_paths_fall_back_to_single_requests(self):
+        """Paths the bulk call fails on, or all paths if it raises, are signed one by one."""
+        videos = self.client.storage.from_("videos")
+        videos.create_signed_urls.return_value = [
+            {"path": "a.mp4", "signedURL": "https://signed/a.mp4", "error": None},
+            {"path": "b.mp4", "signedURL": None, "error": "Either the object does not exist or you do not have access"}
+        ]
+        videos.create_signed_url.return_value = {"signedURL": "https://single/b.mp4"}
+        docs = self.client.storage.from_("docs")
+        docs.create_signed_urls.side_effect = RuntimeError("bulk signing unavailable")
+        docs.create_signed_url.return_value = {"signedURL": "https://single/d.md"}
+
+        urls = supabase_service.get_signed_urls([("videos", "a.mp4"), ("videos", "b.mp4"), ("docs", "d.md")])
+
+        self.assertEqual(urls, {
+            ("videos", "a.mp4"): "https://signed/a.mp4",
+            ("videos", "b.mp4"): "https://single/b.mp4",
+            ("docs", "d.md"): "https://single/d.md"
+        })
+
+    def test_cached_urls_skip_storage(self):
+        """Repeat requests reuse URLs from the signed URL cache."""
+        videos = self.client.storage.from_("videos")
+        videos.create_signed_urls.side_effect = self.bulk_result
+        videos.create_signed_url.return_value = {"signedURL": "https://single/b.mp4"}
+
+        supabase_service.get_signed_urls([("videos", "a.mp4")])
+        self.assertEqual(supabase_service.get_signed_url("videos", "a.mp4"), "https://signed/a.mp4")
+        self.assertEqual(supabase_service.get_signed_urls([("videos", "a.mp4")]), {("videos", "a.mp4"): "https://signed/a.mp4"})
+        supabase_service.get_signed_url("videos", "b.mp4")
+        supabase_service.get_signed_url("videos", "b.mp4")
+
+        self.assertEqual(videos.create_signed_urls.call_count, 1)
+        self.assertEqual(videos.create_signed_url.call_count, 1)
+
+
+class TestFileListing(unittest.TestCase):
+    def setUp(self):
+        supabase_service.user_file_cache.clear()
+        patcher = patch("deliverables_dashboard.services.supabase_service.get_supabase_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.query = MagicMock()
+        for method in ("select", "eq", "in_", "or_", "order", "limit"):
+            getattr(self.query, method).return_value = self.query
+        self.client.table.return_value = self.query
+
+    def rows(self, *keys):
+        return [{"id": file_id, "transcript_id": transcript_id} for transcript_id, file_id in keys]
+
+    def test_page_projects_columns_and_pushes_filters_down(self):
+        """Listings select only the listing columns and filter status in the query."""
+        self.query.execute.return_value = MagicMock(data=self.rows(("t1", "a"), ("t1", "b"), ("t2", "c")))
+
+        rows, after = supabase_service.fetch_user_files_page("u1", status=["pending", "rejected"], limit=2)
+
+        self.assertEqual([row["id"] for row in rows], ["a", "b"])
+        self.assertEqual(after, ("t1", "b"))
+        self.query.select.assert_called_once_with(supabase_service.FILE_LIST_COLUMNS)
+        self.query.in_.assert_called_once_with("status", ["pending", "rejected"])
+        self.query.limit.assert_called_once_with(3)
+
+    def test_after_key_becomes_keyset_filter(self):
+        """Later pages continue strictly after (transcript_id, id)."""
+        self.query.execute.return_value = MagicMock(data=self.rows(("t2", "c")))
+
+        rows, after = supabase_service.fetch_user_files_page("u1", status="approved", after=("t1", "b"))
+
+        self.assertIsNone(after)
+        self.query.eq.assert_any_call("status", "approved")
+        self.query.or_.assert_called_once_with('transcript_id.gt."t1",and(transcript_id.eq."t1",id.gt."b")')
+
+    def test_pages_follow_the_keyset(self):
+        """iter_user_file_pages follows the keyset until the last page."""
+        self.query.execute.side_effect = [
+            MagicMock(data=self.rows(("t1", "a"), ("t1", "b"), ("t2", "c"))),
+            MagicMock(data=self.rows(("t2", "c"), ("t2", "d")))
+        ]
+        pages = list(supabase_service.iter_user_file_pages("u1", page_size=2))
+
+        self.assertEqual([[row["id"] for row in page] for page in pages], [["a", "b"], ["c", "d"]])
+
+
+class TestBulkReview(unittest.TestCase):
+    def setUp(self):
+        supabase_service.user_file_cache.clear()
+        patcher = patch("deliverables_dashboard.services.supabase_service.get_supabase_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.update = self.client.table.return_value.update
+
+    def test_approve_files_reports_missing_ids(self):
+        """One filtered update approves every file; unmatched ids are reported."""
+        self.update.return_value.in_.return_value.execute.return_value = MagicMock(
+            data=[{"id": "a", "status": "approved"}, {"id": "c", "status": "approved"}]
+        )
+
+        result = supabase_service.approve_files(["a", "b", "c", "a"])
+
+        self.assertEqual([row["id"] for row in result["updated"]], ["a", "c"])
+        self.assertEqual(result["missing"], ["b"])
+        self.update.assert_called_once()
+        self.assertEqual(self.update.call_args[0][0]["status"], "approved")
+        self.update.return_value.in_.assert_called_once_with("id", ["a", "b", "c"])
+
+    def test_reject_files_records_reason(self):
+        """Rejections share the reason across every file."""
+        self.update.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+
+        result = supabase_service.reject_files(["a"], reason="Off brand")
+
+        self.assertEqual(result, {"updated": [], "missing": ["a"]})
+        self.assertEqual(self.update.call_args[0][0]["rejection_reason"], "Off brand")
+
+    def test_no_ids_makes_no_request(self):
+        """An empty selection is a no-op."""
+        self.assertEqual(supabase_service.approve_files([]), {"updated": [], "missing": []})
+        self.client.table.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for request timing spans and Server-Timing reporting.
+"""
+import unittest
+
+import app as dashboard_app
+from deliverables_dashboard.services.manifest import manifest_fetcher
+from deliverables_dashboard.utils import timing
+
+
+class TestTiming(unittest.TestCase):
+    def setUp(self):
+        timing.reset()
+
+    def test_histogram_quantiles(self):
+        """Quantiles resolve to the upper bound of their bucket."""
+        histogram = timing.LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+        self.assertIsNone(histogram.quantile(0.95))
+        for seconds in [0.005] * 90 + [0.5] * 10:
+            histogram.observe(seconds)
+        self.assertEqual(histogram.quantile(0.5), 0.01)
+        self.assertEqual(histogram.quantile(0.95), 1.0)
+        histogram.observe(30)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+
+    def test_spans_are_collected_per_request(self):
+        """Spans are only kept between start_request and end_request."""
+        with timing.span("outside"):
+            pass
+        timing.start_request()
+        with timing.span("supabase"):
+            pass
+        timing.record("supabase", 0.002)
+        spans = timing.end_request()
+
+        self.assertEqual([stage for stage, _ in spans], ["supabase", "supabase"])
+        self.assertEqual(timing.get_histogram("supabase").count, 2)
+        self.assertEqual(timing.get_histogram("outside").count, 1)
+
+    def test_header_sums_repeated_stages(self):
+        """Repeated stages are reported once with their combined duration."""
+        header = timing.server_timing_header([("supabase", 0.01), ("supabase", 0.005), ("render", 0.002)], 0.02)
+        self.assertEqual(header, "supabase;dur=15.0, render;dur=2.0, total;dur=20.0")
+
+
+class TestServerTimingHeader(unittest.TestCase):
+    def setUp(self):
+        timing.reset()
+        manifest_fetcher.clear()
+        self.client = dashboard_app.app.test_client()
+
+    def test_manifest_route_reports_stages(self):
+        """Markdown manifests report markdown and render stages."""
+        response = self.client.get("/manifest?url=https://example.com/manifest/test123.md")
+
+        header = response.headers["Server-Timing"]
+        self.assertIn("markdown;dur=", header)
+        self.assertIn("render;dur=", header)
+        self.assertIn("total;dur=", header)
+        self.assertIn("render", self.client.get("/timings").get_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for the write-coalescing status update buffer.
+"""
+import threading
+import unittest
+from unittest.mock import patch
+
+from deliverables_dashboard.services import local_backend, supabase_service
+from deliverables_dashboard.services.update_buffer import UpdateBuffer
+
+
+class RecordingStore:
+    """Applies payloads to in-memory rows and records each bulk update."""
+
+    def __init__(self, ids, error=None):
+        self.rows = {row_id: {"id": row_id} for row_id in ids}
+        self.calls = []
+        self.error = error
+
+    def apply(self, payload, ids):
+        self.calls.append((dict(payload), list(ids)))
+        if self.error:
+            raise self.error
+        for row_id in ids:
+            if row_id in self.rows:
+                self.rows[row_id].update(payload)
+        return [dict(self.rows[row_id]) for row_id in ids if row_id in self.rows]
+
+
+class TestUpdateBuffer(unittest.TestCase):
+    def setUp(self):
+        # A long window so batches only flush when the test says so
+        self.buffer = UpdateBuffer(window_seconds=60, max_batch=100)
+        self.addCleanup(self.buffer.close)
+
+    def test_updates_are_grouped_by_payload(self):
+        """One bulk update is issued per distinct payload."""
+        store = RecordingStore(["a", "b", "c", "d"])
+        futures = [
+            self.buffer.submit(store.apply, "a", {"status": "approved", "approved_at": "t1"}, ("approved_at",)),
+            self.buffer.submit(store.apply, "b", {"status": "approved", "approved_at": "t2"}, ("approved_at",)),
+            self.buffer.submit(store.apply, "c", {"status": "rejected", "rejection_reason": "x"}),
+            self.buffer.submit(store.apply, "d", {"status": "approved", "approved_at": "t3"}, ("approved_at",))
+        ]
+        self.buffer.flush()
+
+        self.assertEqual(store.calls, [
+            ({"status": "approved", "approved_at": "t3"}, ["a", "b", "d"]),
+            ({"status": "rejected", "rejection_reason": "x"}, ["c"])
+        ])
+        self.assertEqual([future.result(0)["status"] for future in futures],
+                         ["approved", "approved", "rejected", "approved"])
+
+    def test_update_waits_for_a_slow_commit(self):
+        """A caller is only answered once its batch has actually committed."""
+        store = RecordingStore(["a"])
+        released = threading.Event()
+
+        def slow_apply(payload, ids):
+            released.wait(5)
+            return store.apply(payload, ids)
+
+        buffer = UpdateBuffer(window_seconds=0.01)
+        self.addCleanup(buffer.close)
+        threading.Timer(0.2, released.set).start()
+        self.assertEqual(buffer.update(slow_apply, "a", {"status": "approved"})["status"], "approved")
+        self.assertTrue(released.is_set())
+
+    def test_latest_update_of_a_row_wins(self):
+        """A row changed twice in one window is written once, with the last payload."""
+        store = RecordingStore(["a"])
+        first = self.buffer.submit(store.apply, "a", {"status": "approved"})
+        second = self.buffer.submit(store.apply, "a", {"status": "rejected"})
+        self.buffer.flush()
+
+        self.assertEqual(store.calls, [({"status": "rejected"}, ["a"])])
+        self.assertEqual(first.result(0), second.result(0))
+
+    def test_failures_reach_their_callers(self):
+        """Missing rows and failed batches fail the affected futures only."""
+        store = RecordingStore(["a"])
+        found = self.buffer.submit(store.apply, "a", {"status": "approved"})
+        missing = self.buffer.submit(store.apply, "zzz", {"status": "approved"})
+        broken = RecordingStore(["b"], error=RuntimeError("database down"))
+        failed = self.buffer.submit(broken.apply, "b", {"status": "approved"})
+        self.buffer.flush()
+
+        self.assertEqual(found.result(0)["status"], "approved")
+        with self.assertRaises(Exception):
+            missing.result(0)
+        with self.assertRaisesRegex(RuntimeError, "database down"):
+            failed.result(0)
+
+    def test_full_batch_flushes_before_the_window(self):
+        """Reaching max_batch writes the batch straight away."""
+        buffer = UpdateBuffer(window_seconds=60, max_batch=2)
+        self.addCleanup(buffer.close)
+        store = RecordingStore(["a", "b"])
+        futures = [buffer.submit(store.apply, row_id, {"status": "approved"}) for row_id in ("a", "b")]
+
+        self.assertEqual([future.result(2)["id"] for future in futures], ["a", "b"])
+        self.assertEqual(len(store.calls), 1)
+
+    def test_window_expiry_flushes(self):
+        """Pending updates are written once the window passes."""
+        buffer = UpdateBuffer(window_seconds=0.01)
+        self.addCleanup(buffer.close)
+        store = RecordingStore(["a"])
+        self.assertEqual(buffer.update(store.apply, "a", {"status": "approved"})["status"], "approved")
+
+
+class TestBufferedReviews(unittest.TestCase):
+    def setUp(self):
+        self.backend = local_backend.LocalBackend()
+        self.addCleanup(self.backend.close)
+        local_backend.seed(self.backend, users=1, transcripts_per_user=1, files_per_transcript=6,
+                           videos_per_transcript=1)
+        self.buffer = UpdateBuffer(window_seconds=0.05)
+        self.addCleanup(self.buffer.close)
+        for target, value in (
+            ("deliverables_dashboard.services.supabase_service.get_supabase_client", lambda: self.backend),
+            ("deliverables_dashboard.services.supabase_service.status_updates", self.buffer)
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        supabase_service.user_file_cache.clear()
+
+    def test_concurrent_approvals_share_one_update(self):
+        """A burst of approvals from many requests becomes a single bulk update."""
+        ids = [f"t00000-00000-f{index:04d}" for index in range(6)]
+        results = {}
+        with patch.object(supabase_service, "_apply_file_updates",
+                          wraps=supabase_service._apply_file_updates) as apply:
+            threads = [
+                threading.Thread(target=lambda file_id=file_id: results.update(
+                    {file_id: supabase_service.approve_file(file_id)}
+                ))
+                for file_id in ids
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(sorted(results), ids)
+        self.assertTrue(all(row["status"] == "approved" for row in results.values()))
+        self.assertLess(apply.call_count, len(ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the video schedule service and its retry routes.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import app as dashboard_app
+from deliverables_dashboard.services import video_schedule
+
+
+class TestSchedulePagination(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("deliverables_dashboard.services.video_schedule.supabase")
+        self.mock_supabase = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.query = MagicMock()
+        for method in ("select", "eq", "not_", "is_", "or_", "order", "limit"):
+            getattr(self.query, method).return_value = self.query
+        self.query.not_ = self.query
+        self.mock_supabase.table.return_value = self.query
+
+    def rows(self, *ids):
+        return [{"id": video_id, "scheduled_at": f"2025-04-1{video_id}T10:00:00Z"} for video_id in ids]
+
+    def test_page_returns_cursor_when_more_rows_exist(self):
+        """One extra row is requested to detect a following page."""
+        self.query.execute.return_value = MagicMock(data=self.rows("1", "2", "3"))
+
+        records, cursor = video_schedule.fetch_video_schedule_page("t1", platform="YouTube", status="failed", limit=2)
+
+        self.assertEqual([r["id"] for r in records], ["1", "2"])
+        self.assertEqual(video_schedule.decode_cursor(cursor), ("2025-04-12T10:00:00Z", "2"))
+        self.query.limit.assert_called_once_with(3)
+        self.query.eq.assert_any_call("platform", "YouTube")
+        self.query.eq.assert_any_call("published", False)
+        self.query.is_.assert_called_once_with("publish_error", "null")
+
+    def test_cursor_becomes_keyset_filter(self):
+        """Later pages continue strictly after the (scheduled_at, id) of the cursor."""
+        self.query.execute.return_value = MagicMock(data=self.rows("3"))
+        cursor = video_schedule.encode_cursor({"id": "2", "scheduled_at": "2025-04-12T10:00:00Z"})
+
+        records, next_cursor = video_schedule.fetch_video_schedule_page("t1", cursor=cursor, limit=2)
+
+        self.assertIsNone(next_cursor)
+        self.query.or_.assert_called_once_with(
+            'scheduled_at.gt."2025-04-12T10:00:00Z",'
+            'and(scheduled_at.eq."2025-04-12T10:00:00Z",id.gt."2")'
+        )
+
+    def test_fetch_all_pages_through_results(self):
+        """fetch_video_schedule follows cursors until the last page."""
+        self.query.execute.side_effect = [
+            MagicMock(data=self.rows(*[str(i) for i in range(video_schedule.DEFAULT_PAGE_SIZE + 1)])),
+            MagicMock(data=self.rows("x"))
+        ]
+        records = video_schedule.fetch_video_schedule("t1")
+        self.assertEqual(len(records), video_schedule.DEFAULT_PAGE_SIZE + 1)
+
+    def test_invalid_filters_are_rejected(self):
+        """Unknown statuses and malformed cursors raise ValueError."""
+        with self.assertRaises(ValueError):
+            video_schedule.fetch_video_schedule_page("t1", status="deleted")
+        with self.assertRaises(ValueError):
+            video_schedule.fetch_video_schedule_page("t1", cursor="not-a-cursor")
+
+
+class TestBulkRetry(unittest.TestCase):
+    @patch("deliverables_dashboard.services.video_schedule.supabase")
+    def test_transcript_retry_filters_failed_records(self, mock_supabase):
+        """A transcript-wide retry issues one update filtered on failed records."""
+        update = mock_supabase.table.return_value.update.return_value
+        failed = update.eq.return_value.not_.is_.return_value
+        failed.eq.return_value.execute.return_value = MagicMock(count=7, data=[])
+
+        retried = video_schedule.retry_failed_videos(transcript_id="t1")
+
+        self.assertEqual(retried, 7)
+        mock_supabase.table.assert_called_once_with("video_schedule")
+        mock_supabase.table().update.assert_called_once_with(
+            video_schedule.RETRY_RESET, count="exact", returning="minimal"
+        )
+        update.eq.assert_called_once_with("published", False)
+        update.eq.return_value.not_.is_.assert_called_once_with("publish_error", "null")
+        failed.eq.assert_called_once_with("transcript_id", "t1")
+
+    @patch("deliverables_dashboard.services.video_schedule.supabase")
+    def test_explicit_ids_use_in_filter(self, mock_supabase):
+        """Explicit IDs are reset with a single in_ filter."""
+        update = mock_supabase.table.return_value.update.return_value
+        update.in_.return_value.execute.return_value = MagicMock(count=None, data=[{}, {}])
+
+        self.assertEqual(video_schedule.retry_failed_videos(video_ids=["a", "b", ""]), 2)
+        update.in_.assert_called_once_with("id", ["a", "b"])
+
+    def test_scope_is_required(self):
+        """Refuse to reset the whole table."""
+        with self.assertRaises(ValueError):
+            video_schedule.retry_failed_videos()
+
+
+class TestBulkRetryRoute(unittest.TestCase):
+    def setUp(self):
+        self.client = dashboard_app.app.test_client()
+        dashboard_app.page_cache.clear()
+
+    @patch("app.retry_failed_videos", return_value=3)
+    def test_json_request_returns_count(self, mock_retry):
+        """JSON callers get the number of reset records."""
+        dashboard_app.page_cache.set("t1", [], "<html>")
+        response = self.client.post("/retry/bulk", json={"transcript_id": "t1", "platform": "YouTube"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"retried": 3})
+        mock_retry.assert_called_once_with(transcript_id="t1", platform="YouTube", video_ids=[])
+        self.assertIsNone(dashboard_app.page_cache.get("t1"))
+
+    @patch("app.retry_failed_videos", return_value=1)
+    def test_form_post_redirects(self, mock_retry):
+        """The dashboard's retry-all form redirects back to the transcript."""
+        response = self.client.post("/retry/bulk", data={"transcript_id": "t1", "platform": "TikTok"})
+        self.assertEqual(response.status_code, 302)
+        mock_retry.assert_called_once_with(transcript_id="t1", platform="TikTok", video_ids=[])
+        self.assertTrue(response.headers["Location"].endswith("/transcript/t1"))
+
+    @patch("app.retry_failed_videos")
+    def test_malformed_video_ids_are_rejected(self, mock_retry):
+        """Only a bounded list of non-empty string IDs is accepted."""
+        for video_ids in ("abc", ["a", 1], ["a", ""], {"id": "a"}, ["v"] * (dashboard_app.MAX_PAGE_SIZE + 1)):
+            response = self.client.post("/retry/bulk", json={"video_ids": video_ids})
+            self.assertEqual(response.status_code, 400, video_ids)
+        mock_retry.assert_not_called()
+
+    def test_missing_scope_is_rejected(self):
+        """Requests without a scope are a client error."""
+        response = self.client.post("/retry/bulk", json={})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
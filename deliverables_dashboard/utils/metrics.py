@@ -0,0 +1,263 @@
+"""
+Small in-process metrics registry with Prometheus text exposition.
+
+Only counters and fixed-bucket histograms are supported, which is all the
+dashboard needs; there is no dependency on prometheus_client.
+"""
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Returns None when nothing has been observed; observations above the last
+        bucket are reported as infinity.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """Return (per-bucket counts, count, sum) as one consistent reading."""
+        with self._lock:
+            return list(self.counts), self.count, self.total
+
+
+class CounterValue:
+    """A single thread-safe monotonically increasing value."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _Metric:
+    """A named metric family holding one child per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Return the child for a label combination, creating it on first use."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+    def _format_labels(self, values: Tuple[str, ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterValue:
+        return CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self.labels().inc(amount)
+
+    def expose(self) -> List[str]:
+        return [
+            f"{self.name}{self._format_labels(values)} {_format_value(child.value)}"
+            for values, child in self.children()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> LatencyHistogram:
+        return LatencyHistogram(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        """Observe a value on an unlabelled histogram."""
+        self.labels().observe(seconds)
+
+    def expose(self) -> List[str]:
+        lines = []
+        for values, child in self.children():
+            counts, count, total = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{self._format_labels(values, (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(values)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """A collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset every metric's values, keeping the registrations."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# Registry exposed at /metrics
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "dashboard_http_requests_total", "HTTP requests handled, by route, method and status.",
+    ("route", "method", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "dashboard_http_request_duration_seconds", "Time to produce a response, by route.", ("route",)
+)
+SUPABASE_CALLS = REGISTRY.counter(
+    "dashboard_supabase_calls_total", "Supabase calls, by table, operation and outcome.",
+    ("table", "operation", "outcome")
+)
+SUPABASE_LATENCY = REGISTRY.histogram(
+    "dashboard_supabase_call_duration_seconds", "Supabase call latency, by table and operation.",
+    ("table", "operation")
+)
+MANIFEST_CACHE = REGISTRY.counter(
+    "dashboard_manifest_cache_total", "Manifest cache lookups, by cache and result.", ("cache", "result")
+)
+FRAGMENT_CACHE = REGISTRY.counter(
+    "dashboard_fragment_cache_total", "Rendered page fragment cache lookups, by result.", ("result",)
+)
+PIPELINE_LATENCY = REGISTRY.histogram(
+    "dashboard_pipeline_duration_seconds", "Content pipeline step duration, by operation.", ("operation",)
+)
+
+
+@contextmanager
+def observe_supabase(table: str, operation: str) -> Iterator[None]:
+    """Count and time a Supabase call against a table (or storage bucket)."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        SUPABASE_LATENCY.labels(table, operation).observe(time.perf_counter() - started)
+        SUPABASE_CALLS.labels(table, operation, outcome).inc()
+
+
+def timed(operation: str) -> Callable:
+    """Decorator recording a pipeline function's duration under the given operation."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PIPELINE_LATENCY.labels(operation).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
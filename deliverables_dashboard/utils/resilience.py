@@ -0,0 +1,314 @@
+"""
+Deadlines, hedged reads and circuit breakers for backend calls.
+
+``ResilientCaller.call`` runs a call on a worker thread and waits no longer than
+its deadline. Writes get no deadline: an abandoned write could still commit after
+its caller was told it failed. Instead they are bounded by the HTTP timeout
+(``SUPABASE_TIMEOUT``) that ``supabase_client.build_client`` gives every Supabase
+client the dashboard uses. Idempotent reads can be hedged: if a read is still
+running after the operation's observed p95 latency, a duplicate is started and the
+first to succeed wins. Each operation has a circuit breaker counting errors, timeouts and slow calls
+over a rolling window; when too many fail, calls are rejected immediately with
+CircuitOpenError until a probe call succeeds again.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .metrics import REGISTRY, LatencyHistogram
+
+BACKEND_CALL_EVENTS = REGISTRY.counter(
+    "dashboard_backend_call_events_total",
+    "Backend call outcomes under the deadline, hedging and circuit breaker policy, by operation and event.",
+    ("operation", "event")
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend operation whose circuit is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call did not finish within its deadline."""
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker.
+
+    Opens when at least ``min_calls`` of the last ``window`` calls were recorded and
+    ``failure_ratio`` of them failed or took longer than ``slow_call_seconds``.
+    After ``open_seconds`` a single probe call is let through; its outcome closes
+    the circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_ratio: float = 0.5,
+        open_seconds: float = 30.0,
+        slow_call_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go ahead now."""
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.open_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of a call that allow() let through."""
+        ok = error is None and (self.slow_call_seconds is None or seconds <= self.slow_call_seconds)
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_ratio * len(self._outcomes):
+                self._open()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._probing = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+
+class ResilientCaller:
+    """
+    Runs backend calls with deadlines, optional hedging and per-operation breakers.
+
+    Args:
+        max_workers: Threads available to run calls (and hedges) on
+        read_deadline: Default deadline in seconds for ``read``
+        hedge_reads: Whether ``read`` hedges slow calls
+        hedge_min_samples: Observed calls needed before an operation's p95 is trusted
+        hedge_min_delay: Lower bound in seconds on the hedging delay
+        breaker_factory: Builds the circuit breaker for each operation
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        read_deadline: Optional[float] = 5.0,
+        hedge_reads: bool = False,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 0.05,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker
+    ):
+        self.read_deadline = read_deadline
+        self.hedge_reads = hedge_reads
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self._max_workers = max_workers
+        self._breaker_factory = breaker_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def read(self, operation: str, fn: Callable[[], Any]) -> Any:
+        """Run an idempotent read with the read deadline, hedged if enabled."""
+        return self.call(operation, fn, deadline=self.read_deadline, hedge=self.hedge_reads)
+
+    def write(self, operation: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run a write under the breaker only. Writes are never hedged and get no
+        deadline, since a call that cannot be cancelled may still commit after it.
+        """
+        return self.call(operation, fn)
+
+    def call(
+        self,
+        operation: str,
+        fn: Callable[[], Any],
+        deadline: Optional[float] = None,
+        hedge: bool = False
+    ) -> Any:
+        """
+        Run ``fn`` under the operation's breaker, deadline and hedging policy.
+
+        Raises:
+            CircuitOpenError: If the operation's circuit is open
+            DeadlineExceeded: If no attempt finished within the deadline
+            Exception: Whatever the call raised
+        """
+        breaker = self.breaker(operation)
+        if not breaker.allow():
+            self._event(operation, "rejected")
+            raise CircuitOpenError(f"Circuit for {operation} is open; backend calls are paused")
+
+        started = time.perf_counter()
+        try:
+            result = self._run(operation, fn, started, deadline, hedge)
+        except Exception as e:
+            breaker.record(time.perf_counter() - started, e)
+            self._event(operation, "timeout" if isinstance(e, DeadlineExceeded) else "failure")
+            raise
+        seconds = time.perf_counter() - started
+        self._histogram(operation).observe(seconds)
+        breaker.record(seconds)
+        self._event(operation, "success")
+        return result
+
+    def record_fallback(self, operation: str) -> None:
+        """Count a call answered with stale data after the backend failed."""
+        self._event(operation, "stale")
+
+    def breaker(self, operation: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(operation)
+            if breaker is None:
+                breaker = self._breakers[operation] = self._breaker_factory()
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation breaker state, event counts and latency, for tuning."""
+        with self._lock:
+            operations = sorted(set(self._breakers) | set(self._latency))
+        events: Dict[str, Dict[str, int]] = {}
+        for (operation, event), counter in BACKEND_CALL_EVENTS.children():
+            events.setdefault(operation, {})[event] = int(counter.value)
+        summary = {}
+        for operation in operations:
+            histogram = self._histogram(operation)
+            p95 = histogram.quantile(0.95)
+            summary[operation] = {
+                "state": self.breaker(operation).state,
+                "events": events.get(operation, {}),
+                "p95_ms": None if p95 is None else round(p95 * 1000, 3),
+                "hedge_delay_ms": _to_ms(self._hedge_delay(operation))
+            }
+        return summary
+
+    def reset(self) -> None:
+        """Close every breaker and forget observed latencies."""
+        with self._lock:
+            self._breakers.clear()
+            self._latency.clear()
+
+    def _histogram(self, operation: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = LatencyHistogram()
+            return histogram
+
+    def _hedge_delay(self, operation: str) -> Optional[float]:
+        histogram = self._histogram(operation)
+        if histogram.count < self.hedge_min_samples:
+            return None
+        p95 = histogram.quantile(0.95)
+        if p95 is None or p95 == float("inf"):
+            return None
+        return max(p95, self.hedge_min_delay)
+
+    def _submit(self, fn: Callable[[], Any]) -> Future:
+        with self._lock:
+            # A forked child cannot use its parent's worker threads
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="backend-call")
+                self._executor_pid = os.getpid()
+            executor = self._executor
+        # Carry request context (timing spans) into the worker thread
+        return executor.submit(contextvars.copy_context().run, fn)
+
+    def _run(self, operation: str, fn: Callable[[], Any], started: float,
+             deadline: Optional[float], hedge: bool) -> Any:
+        deadline_at = None if deadline is None else started + deadline
+        first = self._submit(fn)
+        attempts: List[Future] = [first]
+
+        delay = self._hedge_delay(operation) if hedge else None
+        if delay is not None:
+            wait_for = delay if deadline_at is None else min(delay, max(deadline_at - time.perf_counter(), 0))
+            done, _ = wait(attempts, timeout=wait_for)
+            if not done and (deadline_at is None or time.perf_counter() < deadline_at):
+                attempts.append(self._submit(fn))
+                self._event(operation, "hedged")
+
+        last_error: Optional[BaseException] = None
+        while attempts:
+            remaining = None if deadline_at is None else max(deadline_at - time.perf_counter(), 0)
+            done, pending = wait(attempts, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"{operation} did not finish within {deadline}s")
+            for future in done:
+                if future.exception() is None:
+                    if future is not first:
+                        self._event(operation, "hedge_won")
+                    return future.result()
+                last_error = future.exception()
+            attempts = list(pending)
+        raise last_error
+
+    @staticmethod
+    def _event(operation: str, event: str) -> None:
+        BACKEND_CALL_EVENTS.labels(operation, event).inc()
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
+
+
+# Policy for every Supabase call made by the service modules
+supabase_calls = ResilientCaller(
+    max_workers=int(os.getenv("SUPABASE_CALL_WORKERS", "32")),
+    read_deadline=float(os.getenv("SUPABASE_READ_DEADLINE", "5")),
+    hedge_reads=_flag("SUPABASE_HEDGE_READS"),
+    breaker_factory=lambda: CircuitBreaker(
+        open_seconds=float(os.getenv("SUPABASE_BREAKER_OPEN_SECONDS", "30")),
+        slow_call_seconds=float(os.getenv("SUPABASE_SLOW_CALL_SECONDS", "2.5"))
+    )
+)
@@ -0,0 +1,107 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+While a call for a key is running, other callers asking for the same key wait for
+it and receive its result (or its exception) instead of starting their own. Once
+the call finishes the key is forgotten, so later callers run a fresh call; this is
+deduplication of in-flight work, not a cache.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .metrics import REGISTRY
+
+COALESCED_CALLS = REGISTRY.counter(
+    "dashboard_coalesced_calls_total", "Calls answered by another caller's in-flight call, by group.", ("group",)
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Args:
+        name: Label used in the coalescing metric
+        timeout: Default seconds a waiter waits for the in-flight call; None waits forever
+    """
+
+    def __init__(self, name: str, timeout: Optional[float] = None):
+        self.name = name
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        share: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Run ``fn`` for ``key``, or wait for the identical call already running.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: The call to run when nothing is in flight for the key
+            timeout: Seconds to wait for an in-flight call, overriding the default
+            share: Applied to the result before handing it to a waiter, e.g. a copy
+                so callers cannot mutate each other's data
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            TimeoutError: If the in-flight call did not finish within the timeout
+            Exception: Whatever the in-flight call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+
+        COALESCED_CALLS.labels(self.name).inc()
+        wait = self.timeout if timeout is None else timeout
+        if not call.done.wait(wait):
+            raise TimeoutError(f"Timed out after {wait}s waiting for in-flight call {key!r}")
+        if call.error is not None:
+            raise call.error
+        return share(call.result) if share else call.result
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+def copy_rows(rows: List[Dict]) -> List[Dict]:
+    """Shallow-copy a list of records so each caller can annotate its own."""
+    return [dict(row) for row in rows]
+
+
+# Shared by the Supabase read paths; keys start with the table name
+supabase_reads = SingleFlight("supabase", timeout=float(os.getenv("SUPABASE_COALESCE_TIMEOUT", "30")))
@@ -0,0 +1,89 @@
+"""
+Request-scoped timing spans and in-process latency histograms.
+
+Stages are timed with ``span``. Each measurement is added to a per-stage histogram
+in the metrics registry and, inside a request started with ``start_request``, kept
+so it can be reported in a ``Server-Timing`` response header.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .metrics import REGISTRY, LatencyHistogram
+
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_spans", default=None)
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "dashboard_stage_duration_seconds", "Request stage latency, by stage.", ("stage",)
+)
+
+
+def get_histogram(stage: str) -> LatencyHistogram:
+    """Return the histogram for a stage, creating it on first use."""
+    return STAGE_LATENCY.labels(stage)
+
+
+def record(stage: str, seconds: float) -> None:
+    """Record a stage duration in its histogram and the current request, if any."""
+    get_histogram(stage).observe(seconds)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as the given stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def start_request() -> None:
+    """Begin collecting spans for the current request."""
+    _request_spans.set([])
+
+
+def end_request() -> List[Tuple[str, float]]:
+    """Stop collecting spans for the current request and return them."""
+    spans = _request_spans.get() or []
+    _request_spans.set(None)
+    return spans
+
+
+def server_timing_header(spans: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """
+    Format spans as a Server-Timing header value, summing repeated stages.
+    """
+    durations: Dict[str, float] = {}
+    for stage, seconds in spans:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    if total is not None:
+        durations["total"] = total
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in durations.items())
+
+
+def stage_summary() -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Summarise every stage histogram as count, mean, p50 and p95 in milliseconds.
+    """
+    def to_ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 3)
+
+    return {
+        stage: {
+            "count": histogram.count,
+            "mean_ms": to_ms(histogram.total / histogram.count if histogram.count else None),
+            "p50_ms": to_ms(histogram.quantile(0.5)),
+            "p95_ms": to_ms(histogram.quantile(0.95))
+        }
+        for (stage,), histogram in STAGE_LATENCY.children()
+    }
+
+
+def reset() -> None:
+    """Drop all recorded histograms."""
+    STAGE_LATENCY.clear()